@@ -0,0 +1,171 @@
+import bisect
+from array import array
+from lexico import IndicePosicoes, Token, TokenPosicional, VisaoToken
+
+# Árvore sintática compacta. Os nós ficam em uma arena de colunas paralelas, indexadas
+# pelo número do nó: o tipo (array de bytes), o valor (lexema já internado, literal
+# numérico, operador ou tipo declarado) e a faixa dos filhos em um único array de
+# índices. Um nó custa algumas posições de array em vez de um objeto com __dict__ e
+# uma lista de filhos, e a arena inteira pode ser guardada, percorrida por análises
+# antes da geração de código ou cortada de volta a um tamanho anterior (truncar).
+#
+# Os filhos são criados antes do pai (a análise é descendente, mas o nó só é montado
+# quando todas as partes foram lidas), então cada nó guarda seus filhos em sequência; os
+# filhos do nó i vão de inicios[i] até inicios[i + 1].
+
+# Os nós de operador (BINARIA e ATRIBUICAO) guardam também a origem do token do operador,
+# usada nos diagnósticos de tipo: o offset do token e, em uma lista por trechos de nós
+# (um trecho por IndicePosicoes da análise léxica), o índice de posições em que ele vale.
+# A linha e a coluna só são calculadas quando um diagnóstico é exibido (-1 nos demais
+# nós).
+
+# Tipos de nó
+FUNCAO = 0  # valor: nome da função; filhos: bloco
+BLOCO = 1  # filhos: comandos
+VAZIO = 2  # ';' isolado, ou parte omitida do for
+PARE = 3  # break
+CONTINUE = 4  # continue
+DECLARACAO = 5  # valor: tipo; filhos: NOME de cada variável
+ATRIBUICAO = 6  # valor: operador ('=', '+=', ...); filhos: NOME, expressão
+SE = 7  # filhos: condição, comando [, comando do else]
+ENQUANTO = 8  # filhos: condição, comando
+PARA = 9  # filhos: inicialização, condição, incremento, comando
+LEITURA = 10  # valor: tipo; filhos: NOME
+ESCRITA = 11  # filhos: LITERAL de cada item
+BINARIA = 12  # valor: operador; filhos: esquerda, direita
+UNARIA = 13  # valor: operador; filhos: operando
+NOME = 14  # valor: nome da variável
+LITERAL = 15  # valor: número (já convertido) ou texto
+
+NOMES_TIPOS = ("function", "block", "empty", "break", "continue", "declaration", "assign_stmt", "if_stmt",
+               "while_stmt", "for_stmt", "scan", "print", "binary_op", "unary_op", "variable", "literal")
+
+def origem(token):
+    """(fonte, offset) da posição do token, sem calcular a linha e a coluna (ver resolver)."""
+    if isinstance(token, TokenPosicional):
+        return token.posicoes, token.inicio
+    if isinstance(token, VisaoToken):
+        return token.buffer.posicoes, token.buffer.inicio[token.indice]
+    return token, 0  # Token com a linha e a coluna já calculadas
+
+def resolver(fonte, offset):
+    """(linha, coluna) de uma origem retornada por origem()."""
+    if isinstance(fonte, IndicePosicoes):
+        return fonte.posicao(offset)
+    return fonte.line, fonte.column
+
+class Arvore:
+    __slots__ = ("tipos", "valores", "inicios", "filhos", "offsets", "primeiros", "fontes")
+
+    def __init__(self):
+        self.tipos = array('B')
+        self.valores = []
+        self.inicios = array('I')  # Posição do primeiro filho em self.filhos
+        self.filhos = array('I')
+        self.offsets = array('q')  # Offset do token do operador (-1: sem posição)
+        self.primeiros = array('I')  # Primeiro nó de cada trecho de self.fontes
+        self.fontes = []  # IndicePosicoes (ou Token) em que valem os offsets do trecho
+
+    def __len__(self):
+        return len(self.valores)
+
+    def novo(self, tipo, valor=None, filhos=(), token=None):
+        """Acrescenta um nó e retorna o seu índice (token: o do operador, para a posição)."""
+        valores = self.valores
+        indice = len(valores)
+        self.tipos.append(tipo)
+        valores.append(valor)
+        self.inicios.append(len(self.filhos))
+        if filhos:
+            self.filhos.extend(filhos)
+        if token is None:
+            self.offsets.append(-1)
+        else:
+            fonte, offset = origem(token)
+            self.offsets.append(offset)
+            if not self.fontes or self.fontes[-1] is not fonte:
+                self.primeiros.append(indice)
+                self.fontes.append(fonte)
+        return indice
+
+    def tipo(self, indice):
+        return self.tipos[indice]
+
+    def valor(self, indice):
+        return self.valores[indice]
+
+    def origem(self, indice):
+        """(fonte, offset) do operador do nó, ou None (ver resolver)."""
+        offset = self.offsets[indice]
+        if offset < 0:
+            return None
+        return self.fontes[bisect.bisect_right(self.primeiros, indice) - 1], offset
+
+    def posicao(self, indice):
+        """(linha, coluna) do operador do nó, ou None."""
+        origem = self.origem(indice)
+        return None if origem is None else resolver(*origem)
+
+    def filhos_de(self, indice):
+        inicios = self.inicios
+        if indice + 1 < len(inicios):
+            return self.filhos[inicios[indice]:inicios[indice + 1]]
+        return self.filhos[inicios[indice]:]
+
+    def truncar(self, tamanho):
+        """Descarta os nós a partir do índice `tamanho` (ex: um comando já convertido em código)."""
+        if tamanho >= len(self.valores):
+            return
+        del self.filhos[self.inicios[tamanho]:]
+        del self.tipos[tamanho:]
+        del self.valores[tamanho:]
+        del self.inicios[tamanho:]
+        del self.offsets[tamanho:]
+        trecho = bisect.bisect_left(self.primeiros, tamanho)
+        del self.primeiros[trecho:]
+        del self.fontes[trecho:]
+
+    def formatar(self, raiz):
+        """Texto indentado da subárvore (um nó por linha: 'tipo: valor')."""
+        linhas = []
+        pendentes = [(raiz, 0)]
+        while pendentes:
+            indice, nivel = pendentes.pop()
+            valor = self.valores[indice]
+            nome = NOMES_TIPOS[self.tipos[indice]]
+            linhas.append("\t" * nivel + (f"{nome}:" if valor is None else f"{nome}: {valor}"))
+            pendentes.extend((filho, nivel + 1) for filho in reversed(self.filhos_de(indice)))
+        return "\n".join(linhas)
+
+# Nó avulso: representa o operador unário dentro das instruções do código intermediário
+# (ex: ('=', 'a', Node('unary_op', ['b'], '-'), None)) e a árvore do analisador antigo
+class Node:
+    __slots__ = ("node_type", "children", "value")
+
+    def __init__(self, node_type, children=None, value=None):
+        self.node_type = node_type  # Define o tipo do nó (ex: 'binary_op', 'unary_op', 'literal')
+        self.children = children if children else []  # Lista de filhos
+        self.value = value  # Valor associado ao nó (ex: operadores, identificadores, números)
+
+    def __str__(self):
+        if self.node_type == "binary_op":
+            return f"({self.children[0]} {self.value} {self.children[1]})"
+        elif self.node_type == "unary_op":
+            return f"({self.value} {self.children[0]})"
+        return str(self.value)
+
+    def _str_recursive(self, level):
+        # Cria uma string com a indentação apropriada e o tipo e valor do nó
+        ret = "\t" * level + f"{self.node_type}: {self.value if self.value else ''}\n"
+        # Itera sobre os filhos do nó
+        for child in self.children:
+            if isinstance(child, Node):
+                # Se o filho for um Node, chama recursivamente _str_recursive
+                ret += child._str_recursive(level + 1)
+            elif isinstance(child, (Token, TokenPosicional)):
+                # Se o filho for um Token, exibe o token diretamente
+                ret += "\t" * (level + 1) + f"Token({child.type}, {child.lexeme})\n"
+            else:
+                # Se o filho for um objeto inesperado, exibe uma mensagem de erro
+                ret += "\t" * (level + 1) + f"Erro: Objeto inesperado {child}\n"
+        return ret
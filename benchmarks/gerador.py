@@ -0,0 +1,20 @@
+# Gera programas JavaMM sintéticos (e sintaticamente válidos) para os benchmarks
+import random
+
+def gerar_programa(blocos, semente=0):
+    """Retorna o código-fonte de um main() com `blocos` repetições de comandos variados."""
+    r = random.Random(semente)
+    linhas = ["int main(){", "    int a, b, c, i;", "    float f;", "    string s;"]
+    for k in range(blocos):
+        linhas += [
+            f"    a = {r.randint(0, 999)} + b * (c - {r.randint(1, 50)}); // comentario {k}",
+            f"    f = {r.randint(0, 99)}.{r.randint(0, 99)};",
+            "    /* bloco de comentario */",
+            f"    if (a >= {r.randint(0, 10)}) {{",
+            f"        s = \"texto {k}\";",
+            "        system.out.print(s, a);",
+            "    }",
+            f"    while (i < {r.randint(1, 9)}) {{ i += 1; c = 0x1F; b = 017; }}",
+        ]
+    linhas.append("}")
+    return "\n".join(linhas) + "\n"
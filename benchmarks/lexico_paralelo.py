@@ -0,0 +1,45 @@
+# Mede como a análise léxica paralela escala com o número de processos
+#
+# Uso: python benchmarks/lexico_paralelo.py [blocos] [máximo de processos]
+import os
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import lexico  # noqa: E402
+from gerador import gerar_programa  # noqa: E402
+
+def cronometrar(funcao, repeticoes=3):
+    """Retorna (resultado, menor tempo em segundos entre as repetições)."""
+    melhor = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        decorrido = time.perf_counter() - inicio
+        melhor = decorrido if melhor is None else min(melhor, decorrido)
+    return resultado, melhor
+
+def assinatura(tokens):
+    return [(t.type, t.lexeme, t.line, t.column) for t in tokens]
+
+def main(blocos, maximo):
+    operators, reserved_words, symbols = lexico.ler_tokens(os.path.join(RAIZ, "tokens.txt"))
+    codigo = gerar_programa(blocos)
+
+    sequencial, tempo_base = cronometrar(lambda: lexico.lexer(codigo, operators, reserved_words, symbols))
+    esperado = assinatura(sequencial)
+    print(f"Código-fonte: {len(codigo) / 1e6:.1f} MB, {len(sequencial)} tokens, {os.cpu_count()} CPUs")
+    print(f"sequencial    {tempo_base:7.2f} s")
+
+    processos = 1
+    while processos <= maximo:
+        tokens, tempo = cronometrar(lambda: lexico.lexer_paralelo(codigo, operators, reserved_words, symbols, processos))
+        igual = "ok" if assinatura(tokens) == esperado else "DIFERENTE"
+        print(f"{processos:3d} processos {tempo:7.2f} s  {tempo_base / tempo:5.2f}x  {igual}")
+        processos *= 2
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1))
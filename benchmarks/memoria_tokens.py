@@ -0,0 +1,39 @@
+# Compara a memória ocupada pela lista de objetos Token com a do BufferTokens compacto
+#
+# Uso: python benchmarks/memoria_tokens.py [blocos]
+import os
+import sys
+import tracemalloc
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import lexico  # noqa: E402
+from gerador import gerar_programa  # noqa: E402
+
+def medir(funcao):
+    """Retorna (resultado, bytes retidos pelo resultado) de funcao()."""
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    resultado = funcao()
+    depois = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return resultado, depois - antes
+
+def main(blocos):
+    operators, reserved_words, symbols = lexico.ler_tokens(os.path.join(RAIZ, "tokens.txt"))
+    codigo = gerar_programa(blocos)
+
+    lista, bytes_lista = medir(lambda: lexico.lexer(codigo, operators, reserved_words, symbols))
+    quantidade = len(lista)
+    del lista
+    buffer, bytes_buffer = medir(lambda: lexico.lexer_compacto(codigo, operators, reserved_words, symbols))
+
+    print(f"Código-fonte: {len(codigo) / 1e6:.1f} MB, {quantidade} tokens (não incluído nas medições)")
+    print(f"Lista de Token:  {bytes_lista / 1e6:8.1f} MB ({bytes_lista / quantidade:6.1f} bytes/token)")
+    print(f"BufferTokens:    {bytes_buffer / 1e6:8.1f} MB ({bytes_buffer / quantidade:6.1f} bytes/token, "
+          f"{len(buffer.posicoes)} pontos no índice)")
+    print(f"Redução: {bytes_lista / bytes_buffer:.1f}x")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,62 @@
+# Conta as instruções despachadas pelo interpretador por volta de um laço, sem otimização
+# e depois de cada passo de otimizador.PASSOS (acumulados), junto com o tamanho do
+# código e o tempo de execução (a tipagem não muda as instruções despachadas, só o custo
+# de cada uma). O for do JavaMM só confere a condição na entrada, então o laço roda até o
+# limite de iterações do interpretador; o que muda é quantas voltas cabem nele. O
+# contador de voltas é float para não ser tratado como variável de indução (ele só é
+# lido pelo próprio incremento, que o passo "inducao" removeria).
+#
+# Uso: python benchmarks/otimizacao.py [limite]
+import os
+import sys
+import time
+import contextlib
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import compilador  # noqa: E402
+import otimizador  # noqa: E402
+from interpretador import Interpretador  # noqa: E402
+
+PROGRAMA = """int main(){
+    int i, j, s, t;
+    float f, voltas;
+    s = 0;
+    t = 2 * 3;
+    for (i = 0; i < 10; i += 1) {
+        voltas += 1;
+        j = t * 2;
+        if (i + j > 4) {
+            s += i + j;
+        }
+        else {
+            s -= 1;
+        }
+        f = 1.5;
+    }
+}
+"""
+
+def executar(codigo, limite):
+    """(instruções despachadas, voltas completadas, segundos)"""
+    with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+        interpretador = Interpretador(codigo, limite)
+        inicio = time.perf_counter()
+        interpretador.rodar()
+        segundos = time.perf_counter() - inicio
+    return interpretador.despachadas, int(interpretador.variaveis["voltas"]), segundos
+
+def main(limite):
+    codigo = compilador.compile(PROGRAMA, levantar=True).codigo
+    print(f"{'passo':<16}{'instruções':>12}{'voltas':>10}{'por volta':>11}{'µs por volta':>14}")
+    passos = [("(nenhum)", codigo)]
+    for numero, (nome, _) in enumerate(otimizador.PASSOS):
+        passos.append(("+ " + nome, otimizador.otimizar(codigo, otimizador.PASSOS[:numero + 1])[0]))
+    for nome, otimizado in passos:
+        despachadas, voltas, segundos = executar(otimizado, limite)
+        print(f"{nome:<16}{len(otimizado):>12}{voltas:>10}{despachadas / voltas:>11.1f}"
+              f"{segundos / voltas * 1e6:>14.1f}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
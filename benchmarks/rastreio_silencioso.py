@@ -0,0 +1,46 @@
+# Compara o tempo do pipeline (léxico, sintático e execução) com o rastreamento
+# desligado e com todas as categorias ligadas em nível debug (gravando em /dev/null,
+# o que equivale às antigas mensagens de depuração sempre exibidas)
+#
+# Uso: python benchmarks/rastreio_silencioso.py [blocos]
+import os
+import sys
+import time
+import contextlib
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import lexico  # noqa: E402
+import rastreio  # noqa: E402
+import sintatico  # noqa: E402
+from interpretador import Interpretador  # noqa: E402
+from gerador import gerar_programa  # noqa: E402
+
+def pipeline(codigo, operators, reserved_words, symbols):
+    """Executa as três fases e retorna o tempo em segundos."""
+    inicio = time.perf_counter()
+    tokens = lexico.lexer(codigo, operators, reserved_words, symbols)
+    rastro = rastreio.rastreador("lex")
+    if rastro:
+        for token in tokens:
+            rastro("Token", token=token)
+    codigo_intermediario = sintatico.main(tokens)
+    Interpretador(codigo_intermediario).rodar()
+    return time.perf_counter() - inicio
+
+def main(blocos):
+    operators, reserved_words, symbols = lexico.ler_tokens(os.path.join(RAIZ, "tokens.txt"))
+    codigo = gerar_programa(blocos)
+    with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+        rastreio.desligar()
+        silencioso = min(pipeline(codigo, operators, reserved_words, symbols) for _ in range(3))
+        rastreio.configurar("debug", saida=nulo)
+        rastreado = min(pipeline(codigo, operators, reserved_words, symbols) for _ in range(3))
+        rastreio.desligar()
+    print(f"Código-fonte: {len(codigo) / 1e3:.0f} KB")
+    print(f"rastreamento ligado:    {rastreado:7.3f} s")
+    print(f"rastreamento desligado: {silencioso:7.3f} s  ({rastreado / silencioso:.1f}x mais rápido)")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
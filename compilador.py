@@ -0,0 +1,129 @@
+import sys
+import lexico
+import sintatico
+import tipos
+
+# API para usar o compilador dentro de outro programa: compile(codigo) analisa o código
+# em memória e devolve um ResultadoCompilacao com o código intermediário e a lista de
+# diagnósticos, sem exibir mensagens e sem encerrar o processo. Todos os erros léxicos
+# e os erros sintáticos recuperáveis (um por comando) são coletados em uma só passada,
+# então um único processo pode validar milhares de arquivos. Sem erros léxicos nem
+# sintáticos, o código intermediário passa pela inferência de tipos (tipos.tipar), e as
+# operações que sempre falhariam na execução também viram diagnósticos.
+
+# Um erro encontrado durante a compilação
+class Diagnostico:
+    def __init__(self, fase, mensagem, line=None, column=None):
+        self.fase = fase  # 'leitura', 'lexico', 'sintatico' ou 'tipos'
+        self.mensagem = mensagem
+        self.line = line
+        self.column = column
+
+    def __repr__(self):
+        return f"Diagnostico({self.fase}, '{self.mensagem}', Line: {self.line}, Column: {self.column})"
+
+    def __str__(self):
+        if self.line is None:
+            return f"[{self.fase}] {self.mensagem}"
+        return f"[{self.fase}] linha {self.line}, coluna {self.column}: {self.mensagem}"
+
+# Levantado por compile(..., levantar=True) quando há diagnósticos
+class ErroCompilacao(Exception):
+    def __init__(self, diagnosticos):
+        super().__init__("\n".join(str(d) for d in diagnosticos))
+        self.diagnosticos = diagnosticos
+
+# Resultado de compile(): tokens, código intermediário e diagnósticos.
+# codigo_tipado é o código com as operações tipadas de tipos.tipar, pronto para o
+# interpretador (None quando há erros léxicos ou sintáticos); codigo continua sem elas,
+# para os passos de otimizador.py
+class ResultadoCompilacao:
+    def __init__(self, tokens, codigo, diagnosticos, codigo_tipado=None):
+        self.tokens = tokens
+        self.codigo = codigo
+        self.diagnosticos = diagnosticos
+        self.codigo_tipado = codigo_tipado
+
+    @property
+    def ok(self):
+        return not self.diagnosticos
+
+def verificar_tipos(codigo, gerador):
+    """Tipa o código (tipos.tipar) e retorna (codigo_tipado, diagnósticos de tipo).
+
+    gerador é o GeradorCodigo que produziu o código, de onde saem a linha e a coluna do
+    operador de cada erro."""
+    codigo_tipado, _, erros_tipos = tipos.tipar(codigo)
+    diagnosticos = []
+    for posicao, mensagem in erros_tipos:
+        linha, coluna = gerador.posicao(posicao)
+        diagnosticos.append(Diagnostico("tipos", f"Erro de tipo: {mensagem}", linha, coluna))
+    return codigo_tipado, diagnosticos
+
+def compile(source_code, levantar=False):
+    """Compila source_code e retorna um ResultadoCompilacao (ou levanta ErroCompilacao, se levantar=True)."""
+    operators, reserved_words, symbols = lexico.carregar_tabelas()
+    diagnosticos = []
+    tokens = []
+    erros_lexicos = []
+    try:
+        # extend mantém os tokens gerados antes de uma falha inesperada
+        tokens.extend(lexico.obter_motor(operators, reserved_words, symbols).varrer(source_code, erros=erros_lexicos))
+    except Exception as e:
+        diagnosticos.append(Diagnostico("lexico", f"Erro inesperado: {e}"))
+    for erro in erros_lexicos:
+        diagnosticos.append(Diagnostico("lexico", erro.mensagem, erro.line, erro.column))
+
+    erros_sintaticos = []
+    parser = sintatico.Parser(tokens, erros=erros_sintaticos)
+    try:
+        parser.parse_function()
+    except SyntaxError as e:
+        # Erro fora de uma lista de comandos (cabeçalho da função, '}' final): não há
+        # ponto seguro para continuar
+        erros_sintaticos.append((e, parser.current_token))
+    except Exception as e:
+        if parser.current_token is None:
+            # O analisador não confere o fim dos tokens em todos os pontos
+            e = SyntaxError("❌ Erro de sintaxe: Token inesperado (EOF encontrado).")
+        else:
+            e = SyntaxError(f"Erro inesperado: {e}")
+        erros_sintaticos.append((e, parser.current_token))
+    codigo = parser.code
+    for erro, token in erros_sintaticos:
+        if token is None:
+            diagnosticos.append(Diagnostico("sintatico", str(erro)))
+        else:
+            diagnosticos.append(Diagnostico("sintatico", str(erro), token.line, token.column))
+    codigo_tipado = None
+    if not diagnosticos:
+        codigo_tipado, diagnosticos = verificar_tipos(codigo, parser.gerador)
+
+    if levantar and diagnosticos:
+        raise ErroCompilacao(diagnosticos)
+    return ResultadoCompilacao(tokens, codigo, diagnosticos, codigo_tipado)
+
+def compilar_arquivo(nome_arquivo):
+    """Lê e compila um arquivo; um erro de leitura também vira um diagnóstico."""
+    try:
+        with open(nome_arquivo, "r") as file:
+            source_code = file.read()
+    except (OSError, UnicodeDecodeError) as e:
+        return ResultadoCompilacao([], [], [Diagnostico("leitura", f"Erro ao ler o arquivo: {e}")])
+    return compile(source_code)
+
+# Valida vários arquivos no mesmo processo e exibe os diagnósticos de cada um
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python compilador.py <arquivo.java> [arquivo.java ...]")
+        sys.exit(1)
+    com_erros = 0
+    for nome in sys.argv[1:]:
+        resultado = compilar_arquivo(nome)
+        if resultado.ok:
+            print(f"{nome}: ok")
+        else:
+            com_erros += 1
+            for diagnostico in resultado.diagnosticos:
+                print(f"{nome}: {diagnostico}")
+    sys.exit(1 if com_erros else 0)
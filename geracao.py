@@ -0,0 +1,212 @@
+import arvore
+from arvore import Node
+
+# Geração do código intermediário a partir da árvore sintática (arvore.Arvore). A
+# análise sintática só monta a árvore; esta etapa a percorre e produz as instruções
+# (op, destino, fonte1, fonte2). Temporários e labels são criados na mesma ordem em que
+# o analisador os criava quando gerava o código durante a análise, então o código
+# resultante é o mesmo.
+
+# Valor inicial de cada tipo declarado
+VALORES_INICIAIS = {'int': "0", 'float': "0.0", 'string': '""'}
+
+class GeradorCodigo:
+    def __init__(self, arvore_sintatica, code=None):
+        self.arvore = arvore_sintatica
+        self.code = code if code is not None else []  # Instruções geradas
+        self.temp_counter = 0  # Contador para variáveis temporárias
+        self.label_counter = 0  # Contador para labels
+        # Posição em self.code -> origem do operador no fonte (arvore.origem), para as
+        # operações aritméticas e comparações; a linha e a coluna só são calculadas por
+        # self.posicao, quando um diagnóstico de tipo é exibido
+        self.posicoes = {}
+
+    def generate_temp(self):
+        temp_var = f"__temp{self.temp_counter}"
+        self.temp_counter += 1
+        return temp_var
+
+    def generate_label(self):
+        label = f"__label{self.label_counter}"
+        self.label_counter += 1
+        return label
+
+    def gerar_operacao(self, op, destino, fonte1, fonte2=None):
+        """Gera operações básicas: '+', '-', '*', '/', '%', '='"""
+        if op not in ('+', '-', '*', '/', '%', '=', '<', '>', '==', '!=', '<=', '>='):
+            raise ValueError(f"Operador '{op}' não suportado")
+        self.code.append((op, destino, fonte1, fonte2))
+
+    def marcar_posicao(self, indice):
+        """Associa a última instrução gerada à posição do operador do nó."""
+        origem = self.arvore.origem(indice)
+        if origem is not None:
+            self.posicoes[len(self.code) - 1] = origem
+
+    def marcar_token(self, token):
+        """Associa a última instrução gerada à posição do token (análise sem a árvore)."""
+        self.posicoes[len(self.code) - 1] = arvore.origem(token)
+
+    def posicao(self, indice):
+        """(linha, coluna) do operador da instrução self.code[indice], ou (None, None)."""
+        origem = self.posicoes.get(indice)
+        return (None, None) if origem is None else arvore.resolver(*origem)
+
+    def funcao(self, indice):
+        """Gera o código do corpo da função."""
+        self.comando(self.arvore.filhos_de(indice)[0])
+        return self.code
+
+    def comando(self, indice):
+        """Gera o código de um comando (e dos comandos aninhados nele)."""
+        self.COMANDOS[self.arvore.tipos[indice]](self, indice)
+
+    def gerar_nada(self, indice):
+        pass
+
+    def gerar_bloco(self, indice):
+        for filho in self.arvore.filhos_de(indice):
+            self.comando(filho)
+
+    def gerar_declaracao(self, indice):
+        valor_inicial = VALORES_INICIAIS.get(self.arvore.valores[indice])
+        if valor_inicial is None:
+            return
+        valores = self.arvore.valores
+        for filho in self.arvore.filhos_de(indice):
+            self.code.append(("=", valores[filho], valor_inicial, None))
+
+    def gerar_atribuicao(self, indice):
+        nome, expressao = self.arvore.filhos_de(indice)
+        ident = self.arvore.valores[nome]
+        operador = self.arvore.valores[indice]
+        expr_node = self.expressao(expressao)
+        if operador != '=':
+            temp_var = self.generate_temp()
+            self.gerar_operacao(operador[0], temp_var, ident, expr_node)  # operador[0] é '+', '-', etc.
+            self.marcar_posicao(indice)
+            self.gerar_operacao('=', ident, temp_var, None)
+        else:
+            if isinstance(expr_node, (int, float, str)):
+                temp_var = self.generate_temp()
+                self.gerar_operacao("=", temp_var, expr_node, None)
+                expr_node = temp_var
+            self.gerar_operacao(operador, ident, expr_node, None)
+
+    def gerar_se(self, indice):
+        filhos = self.arvore.filhos_de(indice)
+        temp_cond = self.condicao(filhos[0])
+        label_else = self.generate_label()
+        label_end = self.generate_label()
+        self.code.append(("IF", temp_cond, label_else, label_end))
+        self.comando(filhos[1])
+        self.code.append(("JUMP", label_end, None, None))
+        if len(filhos) > 2:
+            self.comando(filhos[2])
+        self.code.append(("LABEL", label_end, None, None))
+
+    def gerar_enquanto(self, indice):
+        condicao, corpo = self.arvore.filhos_de(indice)
+        label_start = self.generate_label()
+        label_end = self.generate_label()
+        self.code.append(("LABEL", label_start, None, None))
+        temp_cond = self.condicao(condicao)
+        self.code.append(("IF", temp_cond, label_end, label_start))
+        self.comando(corpo)
+        self.code.append(("JUMP", label_start, None, None))
+        self.code.append(("LABEL", label_end, None, None))
+
+    def gerar_para(self, indice):
+        inicializacao, condicao, incremento, corpo = self.arvore.filhos_de(indice)
+        label_start = self.generate_label()
+        label_body = self.generate_label()
+        label_end = self.generate_label()
+        self.comando(inicializacao)
+        self.code.append(("LABEL", label_start, None, None))
+        # O temporário da condição do for é criado antes dos da expressão
+        temp_cond = self.generate_temp()
+        self.gerar_operacao('=', temp_cond, self.expressao(condicao), None)
+        self.code.append(("IF", temp_cond, label_end, label_body))
+        incremento_label = self.generate_label()
+        self.code.append(("LABEL", incremento_label, None, None))
+        self.comando(incremento)
+        self.code.append(("LABEL", label_body, None, None))
+        self.comando(corpo)
+        self.code.append(("JUMP", incremento_label, None, None))
+        self.code.append(("LABEL", label_end, None, None))
+
+    def gerar_leitura(self, indice):
+        nome = self.arvore.filhos_de(indice)[0]
+        self.code.append(("CALL", "SCAN", self.arvore.valores[indice], self.arvore.valores[nome]))
+
+    def gerar_escrita(self, indice):
+        valores = self.arvore.valores
+        for item in self.arvore.filhos_de(indice):
+            self.code.append(("CALL", "PRINT", valores[item], None))
+
+    def condicao(self, indice):
+        """Avalia a condição em um temporário próprio e o retorna."""
+        valor = self.expressao(indice)
+        temp_cond = self.generate_temp()
+        self.gerar_operacao('=', temp_cond, valor, None)
+        return temp_cond
+
+    def expressao(self, indice):
+        """Gera o código da expressão e retorna o operando com o seu valor."""
+        tipo = self.arvore.tipos[indice]
+        if tipo == arvore.BINARIA:
+            esquerda, direita = self.arvore.filhos_de(indice)
+            if self.arvore.tipos[esquerda] == arvore.BINARIA:
+                left = self.cadeia(esquerda)
+            else:
+                left = self.expressao(esquerda)
+            right = self.expressao(direita)
+            temp_var = self.generate_temp()
+            self.code.append((self.arvore.valores[indice], temp_var, left, right))
+            self.marcar_posicao(indice)
+            return temp_var
+        if tipo == arvore.UNARIA:
+            # O operador unário segue como nó dentro da instrução, como antes
+            operando = self.expressao(self.arvore.filhos_de(indice)[0])
+            return Node("unary_op", [operando], self.arvore.valores[indice])
+        return self.arvore.valores[indice]  # NOME ou LITERAL
+
+    def cadeia(self, indice):
+        """Como expressao(), para um operando esquerdo que também é uma operação binária."""
+        # Desce pelos operandos da esquerda sem recursão: uma soma longa (a + b + c + ...)
+        # é uma cadeia de nós tão funda quanto o número de termos. Só os operandos da
+        # direita (parênteses) recorrem, como na análise
+        tipos, valores, filhos_de = self.arvore.tipos, self.arvore.valores, self.arvore.filhos_de
+        cadeia = []  # Nó e operando da direita de cada operação, alternados
+        while tipos[indice] == arvore.BINARIA:
+            esquerda, direita = filhos_de(indice)
+            cadeia += indice, direita
+            indice = esquerda
+        left = self.expressao(indice)
+        while cadeia:
+            right = self.expressao(cadeia.pop())
+            no = cadeia.pop()
+            temp_var = self.generate_temp()
+            self.code.append((valores[no], temp_var, left, right))
+            self.marcar_posicao(no)
+            left = temp_var
+        return left
+
+# Comandos indexados pelo tipo do nó
+GeradorCodigo.COMANDOS = {
+    arvore.BLOCO: GeradorCodigo.gerar_bloco,
+    arvore.VAZIO: GeradorCodigo.gerar_nada,
+    arvore.PARE: GeradorCodigo.gerar_nada,
+    arvore.CONTINUE: GeradorCodigo.gerar_nada,
+    arvore.DECLARACAO: GeradorCodigo.gerar_declaracao,
+    arvore.ATRIBUICAO: GeradorCodigo.gerar_atribuicao,
+    arvore.SE: GeradorCodigo.gerar_se,
+    arvore.ENQUANTO: GeradorCodigo.gerar_enquanto,
+    arvore.PARA: GeradorCodigo.gerar_para,
+    arvore.LEITURA: GeradorCodigo.gerar_leitura,
+    arvore.ESCRITA: GeradorCodigo.gerar_escrita,
+}
+
+def gerar(arvore_sintatica, raiz):
+    """Gera o código intermediário da função na raiz da árvore."""
+    return GeradorCodigo(arvore_sintatica).funcao(raiz)
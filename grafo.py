@@ -0,0 +1,573 @@
+import sys
+from interpretador import OPERACOES_TIPADAS
+
+# Grafo de fluxo de controle do código intermediário. Um bloco básico é uma faixa de
+# instruções executadas sempre em sequência: começa na primeira instrução, em cada LABEL
+# e logo depois de um IF, de um JUMP ou de uma instrução que encerra a execução, e
+# termina antes do início do próximo bloco.
+#
+# As arestas seguem o que o interpretador faz de fato: um IF cujo label não existe só
+# avisa e segue para a instrução seguinte, um JUMP para um label inexistente encerra a
+# execução com erro, e com labels repetidos vale a última ocorrência.
+
+# Operadores que o interpretador executa (qualquer outro encerra a execução com erro)
+ARITMETICOS = ("+", "-", "*", "/", "%", "//")
+LOGICOS = ("||", "&&", "!", "==", "<>", ">", ">=", "<", "<=", "!=")
+TIPADOS = tuple(OPERACOES_TIPADAS)  # Gerados por tipos.tipar (IADD, FCMP_LT, ...)
+CONHECIDOS = ARITMETICOS + LOGICOS + TIPADOS + ("=", "CALL", "IF", "JUMP", "LABEL")
+
+def bem_formada(instrucao):
+    """Indica se o interpretador executa a instrução sem encerrar a execução por ela ser inválida."""
+    return isinstance(instrucao, (tuple, list)) and len(instrucao) >= 4 and instrucao[0] in CONHECIDOS
+
+def posicoes_labels(codigo):
+    """Label -> posição da instrução LABEL (a última, se o label se repete), como no interpretador."""
+    labels = {}
+    for indice, instrucao in enumerate(codigo):
+        if isinstance(instrucao, (list, tuple)) and instrucao[0] == "LABEL":
+            labels[instrucao[1]] = indice
+    return labels
+
+def definicao(instrucao):
+    """Nome que a instrução atribui, ou None."""
+    if not bem_formada(instrucao) or instrucao[0] in ("IF", "JUMP", "LABEL"):
+        return None
+    if instrucao[0] == "CALL":
+        return instrucao[3] if instrucao[1] == "SCAN" else None
+    return instrucao[1]
+
+def usos(instrucao):
+    """Nomes que a instrução lê (todo operando em texto é procurado entre as variáveis)."""
+    if not bem_formada(instrucao) or instrucao[0] in ("JUMP", "LABEL"):
+        return ()
+    if instrucao[0] == "IF":
+        operandos = (instrucao[1],)
+    elif instrucao[0] == "CALL":
+        operandos = (instrucao[2], instrucao[3]) if instrucao[1] == "PRINT" else ()
+    else:
+        operandos = (instrucao[2], instrucao[3])
+    return tuple(o for o in operandos if isinstance(o, str))
+
+# Bloco básico: instruções codigo[inicio:fim]
+class Bloco:
+    __slots__ = ("indice", "inicio", "fim", "sucessores", "predecessores")
+
+    def __init__(self, indice, inicio, fim):
+        self.indice = indice
+        self.inicio = inicio
+        self.fim = fim
+        self.sucessores = []
+        self.predecessores = []
+
+    def __repr__(self):
+        return f"Bloco({self.indice}, [{self.inicio}:{self.fim}], sucessores={self.sucessores})"
+
+class Grafo:
+    def __init__(self, codigo):
+        self.codigo = codigo
+        self.labels = posicoes_labels(codigo)
+        self.blocos = []
+        self.bloco_da_posicao = []  # Índice do bloco de cada instrução
+        self._dividir()
+        self._ligar()
+
+    def _dividir(self):
+        codigo = self.codigo
+        inicios = {0} if codigo else set()
+        for indice, instrucao in enumerate(codigo):
+            if not bem_formada(instrucao) or instrucao[0] in ("IF", "JUMP"):
+                inicios.add(indice + 1)
+            elif instrucao[0] == "LABEL":
+                inicios.add(indice)
+        inicios = sorted(i for i in inicios if i < len(codigo))
+        for numero, inicio in enumerate(inicios):
+            fim = inicios[numero + 1] if numero + 1 < len(inicios) else len(codigo)
+            self.blocos.append(Bloco(numero, inicio, fim))
+            self.bloco_da_posicao.extend([numero] * (fim - inicio))
+
+    def _ligar(self):
+        for bloco in self.blocos:
+            for sucessor in self.destinos(bloco):
+                if sucessor is not None and sucessor not in bloco.sucessores:
+                    bloco.sucessores.append(sucessor)
+                    self.blocos[sucessor].predecessores.append(bloco.indice)
+
+    def seguinte(self, bloco):
+        """Bloco que vem logo depois no código (None no fim do código)."""
+        return bloco.indice + 1 if bloco.indice + 1 < len(self.blocos) else None
+
+    def alvo(self, label, bloco):
+        """Bloco em que a execução continua quando o IF do fim de `bloco` desvia para `label`."""
+        if label in self.labels:
+            return self.bloco_da_posicao[self.labels[label]]
+        return self.seguinte(bloco)  # Label inexistente: o IF só avisa e segue
+
+    def destinos(self, bloco):
+        """Blocos que podem executar depois de `bloco`; para um IF, (se falso, se verdadeiro)."""
+        ultima = self.codigo[bloco.fim - 1]
+        if not bem_formada(ultima):
+            return ()
+        if ultima[0] == "JUMP":
+            if ultima[1] in self.labels:
+                return (self.bloco_da_posicao[self.labels[ultima[1]]],)
+            return ()  # Label inexistente: erro de execução
+        if ultima[0] == "IF":
+            if ultima[2] is None or ultima[3] is None:
+                return ()  # IF sem label: erro de execução
+            return (self.alvo(ultima[2], bloco), self.alvo(ultima[3], bloco))
+        return (self.seguinte(bloco),)
+
+    def instrucoes(self, bloco):
+        return self.codigo[bloco.inicio:bloco.fim]
+
+    def alcancaveis(self):
+        """Blocos alcançáveis a partir do início, ignorando as condições dos IFs."""
+        vistos = [False] * len(self.blocos)
+        pendentes = [0] if self.blocos else []
+        while pendentes:
+            indice = pendentes.pop()
+            if vistos[indice]:
+                continue
+            vistos[indice] = True
+            pendentes.extend(self.blocos[indice].sucessores)
+        return vistos
+
+    def vivas(self, filtro=None):
+        """Análise de vivacidade: (entrada, saida), os nomes vivos no início e no fim de cada bloco.
+
+        Um nome está vivo em um ponto se algum caminho a partir dali o lê antes de
+        atribuí-lo. `filtro(nome)` restringe a análise a alguns nomes (ex: temporários).
+        Só entram os nomes atribuídos em alguma instrução: um literal ou um nome nunca
+        atribuído tem sempre o mesmo valor, e estaria vivo em todo o programa."""
+        atribuidos = {definicao(instrucao) for instrucao in self.codigo}
+        geradas, mortas = [], []
+        for bloco in self.blocos:
+            lidas, atribuidas = set(), set()
+            for instrucao in self.instrucoes(bloco):
+                for nome in usos(instrucao):
+                    if nome not in atribuidas and nome in atribuidos and (filtro is None or filtro(nome)):
+                        lidas.add(nome)
+                nome = definicao(instrucao)
+                if nome is not None:
+                    atribuidas.add(nome)
+            geradas.append(lidas)
+            mortas.append(atribuidas)
+        entrada = [set(g) for g in geradas]
+        saida = [set() for _ in self.blocos]
+        # Iteração de trás para frente até estabilizar
+        mudou = True
+        while mudou:
+            mudou = False
+            for bloco in reversed(self.blocos):
+                indice = bloco.indice
+                novo = set()
+                for sucessor in bloco.sucessores:
+                    novo |= entrada[sucessor]
+                if novo != saida[indice]:
+                    saida[indice] = novo
+                    entrada[indice] = geradas[indice] | (novo - mortas[indice])
+                    mudou = True
+        return entrada, saida
+
+    def pos_ordem_reversa(self):
+        """Blocos alcançáveis em pós-ordem reversa (cada bloco antes dos seus sucessores, fora as voltas)."""
+        if not self.blocos:
+            return []
+        visitados = [False] * len(self.blocos)
+        visitados[0] = True
+        ordem = []
+        pilha = [(0, iter(self.blocos[0].sucessores))]
+        while pilha:
+            indice, sucessores = pilha[-1]
+            for sucessor in sucessores:
+                if not visitados[sucessor]:
+                    visitados[sucessor] = True
+                    pilha.append((sucessor, iter(self.blocos[sucessor].sucessores)))
+                    break
+            else:
+                pilha.pop()
+                ordem.append(indice)
+        ordem.reverse()
+        return ordem
+
+    def dominadores(self):
+        """Dominador imediato de cada bloco (None no bloco inicial e nos inalcançáveis).
+
+        A domina B quando todo caminho do início até B passa por A. Usa o algoritmo
+        iterativo de Cooper, Harvey e Kennedy sobre a pós-ordem reversa."""
+        ordem = self.pos_ordem_reversa()
+        numero = {bloco: posicao for posicao, bloco in enumerate(ordem)}
+        idom = [None] * len(self.blocos)
+        if not ordem:
+            return idom
+        idom[0] = 0
+
+        def intersecao(a, b):
+            while a != b:
+                while numero[a] > numero[b]:
+                    a = idom[a]
+                while numero[b] > numero[a]:
+                    b = idom[b]
+            return a
+
+        mudou = True
+        while mudou:
+            mudou = False
+            for indice in ordem[1:]:
+                novo = None
+                for predecessor in self.blocos[indice].predecessores:
+                    if idom[predecessor] is not None:
+                        novo = predecessor if novo is None else intersecao(predecessor, novo)
+                if novo != idom[indice]:
+                    idom[indice] = novo
+                    mudou = True
+        idom[0] = None
+        return idom
+
+    @staticmethod
+    def domina(idom, a, b):
+        """Indica se o bloco `a` domina o bloco `b` (idom: resultado de dominadores())."""
+        while b is not None:
+            if a == b:
+                return True
+            b = idom[b]
+        return False
+
+    def fronteiras(self, idom):
+        """Fronteira de dominância de cada bloco: os blocos em que a sua dominância termina."""
+        fronteira = [set() for _ in self.blocos]
+        for bloco in self.blocos:
+            if bloco.indice != 0 and idom[bloco.indice] is None:
+                continue  # Inalcançável
+            predecessores = [p for p in bloco.predecessores if p == 0 or idom[p] is not None]
+            if len(predecessores) < 2:
+                continue
+            for corredor in predecessores:
+                while corredor is not None and corredor != idom[bloco.indice]:
+                    fronteira[corredor].add(bloco.indice)
+                    corredor = idom[corredor]
+        return fronteira
+
+    def lacos(self, idom):
+        """Laços naturais: cabeçalho -> conjunto dos blocos do laço.
+
+        Uma aresta B -> H em que H domina B é uma volta; o laço de H reúne H e os blocos
+        que chegam a B sem passar por H. As voltas para o mesmo cabeçalho formam um só
+        laço."""
+        lacos = {}
+        for bloco in self.blocos:
+            if bloco.indice != 0 and idom[bloco.indice] is None:
+                continue  # Inalcançável
+            for cabecalho in bloco.sucessores:
+                if not self.domina(idom, cabecalho, bloco.indice):
+                    continue
+                corpo = lacos.setdefault(cabecalho, {cabecalho})
+                pendentes = [bloco.indice]
+                while pendentes:
+                    indice = pendentes.pop()
+                    if indice not in corpo:
+                        corpo.add(indice)
+                        pendentes.extend(p for p in self.blocos[indice].predecessores
+                                         if p == 0 or idom[p] is not None)
+        return lacos
+
+    def formatar(self, idom=None):
+        """Texto com as instruções de cada bloco e as suas arestas (e o dominador imediato, se dado)."""
+        linhas = []
+        for bloco in self.blocos:
+            cabecalho = f"B{bloco.indice} -> {', '.join(f'B{s}' for s in bloco.sucessores) or 'fim'}"
+            if idom is not None and idom[bloco.indice] is not None:
+                cabecalho += f"  (idom B{idom[bloco.indice]})"
+            linhas.append(cabecalho)
+            linhas.extend(f"\t{instrucao}" for instrucao in self.instrucoes(bloco))
+        return "\n".join(linhas)
+
+    def para_dot(self, instrucoes=None):
+        """Grafo no formato DOT do Graphviz (instrucoes: bloco -> lista de linhas de texto)."""
+        linhas = ["digraph cfg {", '\tnode [shape=box, fontname="monospace"];']
+        for bloco in self.blocos:
+            texto = instrucoes[bloco.indice] if instrucoes is not None else map(str, self.instrucoes(bloco))
+            rotulo = "\\l".join(_escapar_dot(linha) for linha in [f"B{bloco.indice}", *texto]) + "\\l"
+            linhas.append(f'\tB{bloco.indice} [label="{rotulo}"];')
+            for sucessor in bloco.sucessores:
+                linhas.append(f"\tB{bloco.indice} -> B{sucessor};")
+        linhas.append("}")
+        return "\n".join(linhas)
+
+def _escapar_dot(texto):
+    return texto.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+# Forma SSA (atribuição estática única): cada atribuição cria uma versão nova da
+# variável ('a#1', 'a#2', ...) e, onde caminhos com versões diferentes se juntam, uma
+# função φ no início do bloco escolhe a versão do predecessor de onde a execução veio.
+# As versões mantêm o prefixo do nome, então as de temporários continuam em temp_vars.
+#
+# Ficam fora da SSA, com o nome original, as variáveis que podem ser lidas antes de
+# serem atribuídas (o interpretador as cria com None por causa das suas atribuições
+# '=', e a leitura depende disso) e as lidas do teclado (o SCAN exibe o nome da
+# variável). Os blocos inalcançáveis ficam como estão, sem versões: uma atribuição
+# neles ainda faz o interpretador criar a variável.
+
+SEPARADOR_VERSAO = "#"
+
+# Uma função φ: destino = φ(operando de cada predecessor)
+class Phi:
+    __slots__ = ("variavel", "destino", "operandos")
+
+    def __init__(self, variavel):
+        self.variavel = variavel  # Nome original
+        self.destino = variavel
+        self.operandos = {}  # Bloco predecessor -> versão que vem dele
+
+    def __str__(self):
+        operandos = ", ".join(f"B{p}: {o}" for p, o in sorted(self.operandos.items()))
+        return f"{self.destino} = φ({operandos})"
+
+class FormaSSA:
+    def __init__(self, grafo, idom, blocos, phis, instrucoes, originais):
+        self.grafo = grafo
+        self.idom = idom
+        self.blocos = blocos  # Todos os blocos, na ordem do código
+        self.phis = phis  # Bloco -> lista de Phi
+        self.instrucoes = instrucoes  # Bloco -> instruções com as versões
+        self.originais = originais  # Versão -> nome original
+
+    def linhas(self, indice):
+        return [str(phi) for phi in self.phis[indice]] + [str(i) for i in self.instrucoes[indice]]
+
+    def formatar(self):
+        linhas = []
+        for indice in self.blocos:
+            bloco = self.grafo.blocos[indice]
+            cabecalho = f"B{indice} -> {', '.join(f'B{s}' for s in bloco.sucessores) or 'fim'}"
+            if self.idom[indice] is not None:
+                cabecalho += f"  (idom B{self.idom[indice]})"
+            elif indice != 0:
+                cabecalho += "  (inalcançável)"
+            linhas.append(cabecalho)
+            linhas.extend(f"\t{linha}" for linha in self.linhas(indice))
+        return "\n".join(linhas)
+
+    def para_dot(self):
+        return self.grafo.para_dot({indice: self.linhas(indice) for indice in self.blocos})
+
+def _renomear(instrucao, usar, definir):
+    """Cópia da instrução com os nomes lidos trocados por usar(nome) e o atribuído por definir(nome)."""
+    if not bem_formada(instrucao) or instrucao[0] in ("JUMP", "LABEL"):
+        return instrucao
+    partes = list(instrucao)
+    if partes[0] == "IF":
+        posicoes_lidas, posicao_atribuida = (1,), None
+    elif partes[0] == "CALL":
+        if partes[1] == "PRINT":
+            posicoes_lidas, posicao_atribuida = (2, 3), None
+        elif partes[1] == "SCAN":
+            posicoes_lidas, posicao_atribuida = (), 3
+        else:
+            return instrucao
+    else:
+        posicoes_lidas, posicao_atribuida = (2, 3), 1
+    for posicao in posicoes_lidas:
+        if isinstance(partes[posicao], str):
+            partes[posicao] = usar(partes[posicao])
+    if posicao_atribuida is not None:
+        partes[posicao_atribuida] = definir(partes[posicao_atribuida])
+    return tuple(partes)
+
+def para_ssa(codigo):
+    """Converte o código intermediário para a forma SSA (podada: só há φ onde a variável está viva)."""
+    grafo = Grafo(codigo)
+    idom = grafo.dominadores()
+    alcancaveis = [b.indice for b in grafo.blocos if b.indice == 0 or idom[b.indice] is not None]
+    entrada, _ = grafo.vivas()
+    fora = set(entrada[0]) if grafo.blocos else set()
+    fora.update(i[3] for i in codigo if bem_formada(i) and i[0] == "CALL" and i[1] == "SCAN")
+
+    # Blocos que atribuem cada variável, na ordem em que as variáveis aparecem
+    blocos_definicao = {}
+    for indice in alcancaveis:
+        for instrucao in grafo.instrucoes(grafo.blocos[indice]):
+            nome = definicao(instrucao)
+            if nome is not None and nome not in fora:
+                blocos_definicao.setdefault(nome, set()).add(indice)
+
+    # φ na fronteira de dominância iterada dos blocos que atribuem a variável
+    fronteira = grafo.fronteiras(idom)
+    phis = {bloco.indice: [] for bloco in grafo.blocos}
+    for variavel, blocos in blocos_definicao.items():
+        pendentes = list(blocos)
+        com_phi = set()
+        while pendentes:
+            for indice in fronteira[pendentes.pop()]:
+                if indice not in com_phi and variavel in entrada[indice]:
+                    com_phi.add(indice)
+                    phis[indice].append(Phi(variavel))
+                    pendentes.append(indice)
+
+    # Renomeação descendo a árvore de dominadores (sem recursão)
+    filhos = {indice: [] for indice in alcancaveis}
+    for indice in alcancaveis:
+        if idom[indice] is not None:
+            filhos[idom[indice]].append(indice)
+    atuais = {variavel: [variavel] for variavel in blocos_definicao}  # Pilha de versões
+    contadores = dict.fromkeys(blocos_definicao, 0)
+    originais = {}
+    instrucoes = {bloco.indice: grafo.instrucoes(bloco) for bloco in grafo.blocos}
+
+    def usar(nome):
+        return atuais[nome][-1] if nome in atuais else nome
+
+    pendentes = [(0, None)] if alcancaveis else []
+    while pendentes:
+        indice, criadas = pendentes.pop()
+        if criadas is not None:
+            for variavel in criadas:  # Saída do bloco: descarta as suas versões
+                atuais[variavel].pop()
+            continue
+        criadas = []
+
+        def definir(nome):
+            if nome not in atuais:
+                return nome
+            contadores[nome] += 1
+            versao = f"{nome}{SEPARADOR_VERSAO}{contadores[nome]}"
+            originais[versao] = nome
+            atuais[nome].append(versao)
+            criadas.append(nome)
+            return versao
+
+        for phi in phis[indice]:
+            phi.destino = definir(phi.variavel)
+        instrucoes[indice] = [_renomear(i, usar, definir) for i in grafo.instrucoes(grafo.blocos[indice])]
+        for sucessor in grafo.blocos[indice].sucessores:
+            for phi in phis[sucessor]:
+                phi.operandos[indice] = usar(phi.variavel)
+        pendentes.append((indice, criadas))
+        pendentes.extend((filho, None) for filho in reversed(filhos[indice]))
+    return FormaSSA(grafo, idom, [bloco.indice for bloco in grafo.blocos], phis, instrucoes, originais)
+
+def _sequenciar(copias, novo_temporario):
+    """Instruções '=' que fazem as cópias (destino, origem) como se fossem simultâneas."""
+    pendentes = [(d, o) for d, o in copias if d != o]
+    instrucoes = []
+    while pendentes:
+        lidos = {o for _, o in pendentes}
+        livre = next((c for c in pendentes if c[0] not in lidos), None)
+        if livre is not None:
+            pendentes.remove(livre)
+            instrucoes.append(("=", livre[0], livre[1], None))
+            continue
+        # Ciclo (ex: troca a <-> b): guarda um destino antes de sobrescrevê-lo
+        destino = pendentes[0][0]
+        temporario = novo_temporario()
+        instrucoes.append(("=", temporario, destino, None))
+        pendentes = [(d, temporario if o == destino else o) for d, o in pendentes]
+    return instrucoes
+
+def de_ssa(ssa):
+    """Volta da forma SSA para uma lista de instruções, trocando cada φ por cópias '='.
+
+    As cópias ficam no fim do predecessor; na saída de um IF elas vão para um bloco
+    novo entre o IF e o destino (a aresta é dividida), que termina com um JUMP."""
+    grafo = ssa.grafo
+    usados = set(grafo.labels)
+    contador = [0]
+
+    def novo_nome(prefixo):
+        while True:
+            contador[0] += 1
+            nome = f"{prefixo}{SEPARADOR_VERSAO}ssa{contador[0]}"
+            if nome not in usados:
+                usados.add(nome)
+                return nome
+
+    copias = {}  # (predecessor, bloco) -> [(destino, origem)]
+    for indice in ssa.blocos:
+        for phi in ssa.phis[indice]:
+            for predecessor, operando in phi.operandos.items():
+                copias.setdefault((predecessor, indice), []).append((phi.destino, operando))
+
+    def copiar(predecessor, destino):
+        return _sequenciar(copias.get((predecessor, destino), ()), lambda: novo_nome("__temp"))
+
+    # Label de cada bloco que recebe um JUMP novo (criado se o bloco não tem)
+    labels_blocos = {}
+    fim = []
+
+    def label_do_bloco(indice):
+        if indice is None:  # Fim do código
+            if not fim:
+                fim.append(novo_nome("__fim"))
+            return fim[0]
+        if indice not in labels_blocos:
+            primeira = ssa.instrucoes[indice][0]
+            if bem_formada(primeira) and primeira[0] == "LABEL" and grafo.labels[primeira[1]] == grafo.blocos[indice].inicio:
+                labels_blocos[indice] = primeira[1]
+            else:
+                labels_blocos[indice] = novo_nome("__label")
+        return labels_blocos[indice]
+
+    saida = {}  # Bloco -> (instruções, blocos novos que vêm logo depois)
+    for indice in ssa.blocos:
+        bloco = grafo.blocos[indice]
+        instrucoes = list(ssa.instrucoes[indice])
+        depois = []
+        ultima = instrucoes[-1]
+        if bem_formada(ultima) and ultima[0] == "IF" and ultima[2] is not None and ultima[3] is not None:
+            nova = list(ultima)
+            queda = None
+            cai = False
+            for posicao in (2, 3):
+                destino = grafo.alvo(ultima[posicao], bloco)
+                existe = ultima[posicao] in grafo.labels
+                cai = cai or not existe
+                if destino is None or (indice, destino) not in copias:
+                    continue
+                if existe:
+                    label = novo_nome("__label")
+                    nova[posicao] = label
+                    depois += [("LABEL", label, None, None)] + copiar(indice, destino)
+                    depois.append(("JUMP", label_do_bloco(destino), None, None))
+                elif queda is None:
+                    queda = copiar(indice, destino) + [("JUMP", label_do_bloco(destino), None, None)]
+            instrucoes[-1] = tuple(nova)
+            if depois and cai and queda is None:
+                # O IF segue para a instrução seguinte quando o label não existe: ela
+                # continua sendo o próximo bloco
+                queda = [("JUMP", label_do_bloco(grafo.seguinte(bloco)), None, None)]
+            depois = (queda or []) + depois
+        elif grafo.destinos(bloco) and grafo.destinos(bloco)[0] is not None:
+            sequencia = copiar(indice, grafo.destinos(bloco)[0])
+            if bem_formada(ultima) and ultima[0] == "JUMP":
+                instrucoes[-1:-1] = sequencia
+            else:
+                instrucoes += sequencia
+        saida[indice] = (instrucoes, depois)
+
+    codigo = []
+    for indice in ssa.blocos:
+        instrucoes, depois = saida[indice]
+        primeira = instrucoes[0]
+        if indice in labels_blocos and not (bem_formada(primeira) and primeira[0] == "LABEL" and primeira[1] == labels_blocos[indice]):
+            codigo.append(("LABEL", labels_blocos[indice], None, None))
+        codigo += instrucoes
+        codigo += depois
+    if fim:
+        codigo.append(("LABEL", fim[0], None, None))
+    return codigo
+
+if __name__ == "__main__":
+    import lexico
+    import sintatico
+    argumentos = sys.argv[1:]
+    if not argumentos:
+        print("Uso: python grafo.py <arquivo.java> [--dominadores] [--ssa] [--dot]")
+        sys.exit(1)
+    grafo = Grafo(sintatico.main(lexico.main(argumentos[0])))
+    if "--ssa" in argumentos[1:]:
+        ssa = para_ssa(grafo.codigo)
+        print(ssa.para_dot() if "--dot" in argumentos[1:] else ssa.formatar())
+    elif "--dot" in argumentos[1:]:
+        print(grafo.para_dot())
+    else:
+        print(grafo.formatar(grafo.dominadores() if "--dominadores" in argumentos[1:] else None))
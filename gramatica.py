@@ -0,0 +1,338 @@
+import os
+import re
+import sys
+import zlib
+import marshal
+from lexico import _caminho_cache, _gravar_cache
+
+# Gerador de analisador LL(1) a partir de uma gramática no formato de javaMM.gmr:
+#   <naoTerminal> -> simbolo simbolo | alternativa ;
+# com terminais entre aspas simples, '&' para a produção vazia e '#' para comentários.
+#
+# O gerador calcula FIRST e FOLLOW, relata os conflitos LL(1), fatora à esquerda as
+# alternativas com prefixo comum e monta a tabela de análise (não terminal, terminal) ->
+# produção. A tabela fica em cache (__pycache__/<gramatica>.<crc32>.marshal), como as
+# tabelas de tokens do léxico.
+#
+# Ações semânticas entram na gramática como marcadores '@nome' (símbolos que não
+# consomem tokens). Elas vêm de um esquema de tradução separado, que repete as
+# alternativas do arquivo com os marcadores nas posições desejadas; assim o arquivo da
+# gramática continua igual ao da especificação da linguagem.
+
+ARQUIVO_GRAMATICA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'javaMM.gmr')
+VAZIO = '&'  # Produção vazia no arquivo da gramática
+FIM = '$'  # Terminal de fim da entrada
+# Versão do formato do cache da tabela; alterar sempre que o conteúdo gravado mudar
+VERSAO_CACHE = 1
+
+_SIMBOLO = re.compile(r"\s*('[^']*'|<[^<>\s]+>|->|\||;|&|@\w+|\S+)")
+
+def _ler_simbolos(texto, sinonimos):
+    """Quebra o texto em símbolos; terminais perdem as aspas e passam pelos sinônimos."""
+    simbolos = []
+    posicao = 0
+    texto = texto.rstrip()
+    while posicao < len(texto):
+        encontrado = _SIMBOLO.match(texto, posicao)
+        simbolo = encontrado.group(1)
+        posicao = encontrado.end()
+        if simbolo.startswith("'"):
+            terminal = simbolo[1:-1]
+            simbolos.append(("terminal", sinonimos.get(terminal, terminal)))
+        elif simbolo.startswith("<") and simbolo.endswith(">") and len(simbolo) > 2:
+            simbolos.append(("nao_terminal", simbolo))
+        elif simbolo.startswith("@"):
+            simbolos.append(("acao", simbolo))
+        elif simbolo in ("->", "|", ";", VAZIO):
+            simbolos.append((simbolo, simbolo))
+        else:
+            raise ValueError(f"Símbolo inválido na gramática: '{simbolo}'")
+    return simbolos
+
+def _ler_alternativas(simbolos, inicio, fim):
+    """Separa os símbolos [inicio, fim) em alternativas (tuplas; '&' vira a tupla vazia)."""
+    alternativas = [[]]
+    for tipo, simbolo in simbolos[inicio:fim]:
+        if tipo == "|":
+            alternativas.append([])
+        elif tipo in ("terminal", "nao_terminal", "acao"):
+            alternativas[-1].append(simbolo)
+        elif tipo != VAZIO:
+            raise ValueError(f"Símbolo '{simbolo}' fora de lugar na gramática")
+    return [tuple(alternativa) for alternativa in alternativas]
+
+def ler_gramatica(texto, sinonimos=None):
+    """Retorna (inicial, producoes), com producoes = [(nao_terminal, corpo), ...] na ordem do arquivo."""
+    sinonimos = sinonimos or {}
+    linhas = [linha.split("#", 1)[0] for linha in texto.split("\n")]
+    simbolos = _ler_simbolos(" ".join(linhas), sinonimos)
+    producoes = []
+    indice = 0
+    while indice < len(simbolos):
+        if indice + 1 >= len(simbolos) or simbolos[indice][0] != "nao_terminal" or simbolos[indice + 1][0] != "->":
+            raise ValueError(f"Produção inválida na gramática perto de '{simbolos[indice][1]}'")
+        fim = indice + 2
+        while fim < len(simbolos) and simbolos[fim][0] != ";":
+            fim += 1
+        if fim == len(simbolos):
+            raise ValueError(f"Produção de {simbolos[indice][1]} sem ';' final")
+        for corpo in _ler_alternativas(simbolos, indice + 2, fim):
+            producoes.append((simbolos[indice][1], corpo))
+        indice = fim + 1
+    if not producoes:
+        raise ValueError("Gramática vazia")
+
+    definidos = {cabeca for cabeca, _ in producoes}
+    for cabeca, corpo in producoes:
+        for simbolo in corpo:
+            if simbolo.startswith("<") and simbolo.endswith(">") and len(simbolo) > 2 and simbolo not in definidos:
+                raise ValueError(f"Não terminal {simbolo} usado em {cabeca} não tem produções")
+    return producoes[0][0], producoes
+
+def _sem_acoes(corpo):
+    return tuple(simbolo for simbolo in corpo if not simbolo.startswith("@"))
+
+# Substitui as produções pelas versões anotadas do esquema de tradução. Cada alternativa
+# anotada, sem os marcadores, precisa ser idêntica a uma alternativa da gramática
+def anotar(producoes, esquema, sinonimos=None):
+    sinonimos = sinonimos or {}
+    anotadas = {}
+    for cabeca, textos in esquema.items():
+        for texto in textos:
+            simbolos = _ler_simbolos(texto, sinonimos)
+            if any(tipo == "|" or tipo == ";" for tipo, _ in simbolos):
+                raise ValueError(f"Alternativa anotada de {cabeca} deve ser uma única alternativa: '{texto}'")
+            corpo = _ler_alternativas(simbolos, 0, len(simbolos))[0]
+            anotadas[(cabeca, _sem_acoes(corpo))] = corpo
+    resultado = []
+    for cabeca, corpo in producoes:
+        resultado.append((cabeca, anotadas.pop((cabeca, corpo), corpo)))
+    if anotadas:
+        cabeca, corpo = next(iter(anotadas))
+        raise ValueError(f"Alternativa anotada não existe na gramática: {cabeca} -> {' '.join(corpo) or VAZIO}")
+    return resultado
+
+# Fatora à esquerda as alternativas de um mesmo não terminal que começam pelo mesmo
+# símbolo: A -> x y | x z vira A -> x A' ; A' -> y | z
+def fatorar(producoes):
+    ordem = []
+    alternativas = {}
+    for cabeca, corpo in producoes:
+        if cabeca not in alternativas:
+            ordem.append(cabeca)
+            alternativas[cabeca] = []
+        alternativas[cabeca].append(corpo)
+
+    pendentes = list(ordem)
+    while pendentes:
+        cabeca = pendentes.pop(0)
+        grupos = {}
+        for corpo in alternativas[cabeca]:
+            grupos.setdefault(corpo[:1], []).append(corpo)
+        novas = []
+        for corpo in alternativas[cabeca]:
+            grupo = grupos[corpo[:1]]
+            if len(grupo) == 1 or not corpo:
+                novas.append(corpo)
+                continue
+            if corpo is not grupo[0]:
+                continue  # O grupo já foi fatorado na primeira alternativa
+            tamanho = 0
+            while all(len(c) > tamanho and c[tamanho] == grupo[0][tamanho] for c in grupo):
+                tamanho += 1
+            nome = cabeca[:-1] + "'>"
+            while nome in alternativas:
+                nome = nome[:-1] + "'>"
+            ordem.insert(ordem.index(cabeca) + 1, nome)
+            alternativas[nome] = [c[tamanho:] for c in grupo]
+            novas.append(grupo[0][:tamanho] + (nome,))
+            pendentes.append(nome)
+        alternativas[cabeca] = novas
+
+    return [(cabeca, corpo) for cabeca in ordem for corpo in alternativas[cabeca]]
+
+# Conjuntos FIRST (com VAZIO para os não terminais que derivam a cadeia vazia) e FOLLOW
+def calcular_first(producoes):
+    nao_terminais = {cabeca for cabeca, _ in producoes}
+    first = {cabeca: set() for cabeca in nao_terminais}
+    mudou = True
+    while mudou:
+        mudou = False
+        for cabeca, corpo in producoes:
+            novos = first_da_sequencia(corpo, first)
+            if not novos <= first[cabeca]:
+                first[cabeca] |= novos
+                mudou = True
+    return first
+
+def first_da_sequencia(sequencia, first):
+    """FIRST de uma sequência de símbolos (marcadores de ação são ignorados)."""
+    resultado = set()
+    for simbolo in sequencia:
+        if simbolo.startswith("@"):
+            continue
+        if simbolo not in first:
+            resultado.add(simbolo)
+            return resultado
+        resultado |= first[simbolo] - {VAZIO}
+        if VAZIO not in first[simbolo]:
+            return resultado
+    resultado.add(VAZIO)
+    return resultado
+
+def calcular_follow(producoes, inicial, first):
+    follow = {cabeca: set() for cabeca, _ in producoes}
+    follow[inicial].add(FIM)
+    mudou = True
+    while mudou:
+        mudou = False
+        for cabeca, corpo in producoes:
+            for posicao, simbolo in enumerate(corpo):
+                if simbolo not in follow:
+                    continue
+                seguinte = first_da_sequencia(corpo[posicao + 1:], first)
+                novos = seguinte - {VAZIO}
+                if VAZIO in seguinte:
+                    novos |= follow[cabeca]
+                if not novos <= follow[simbolo]:
+                    follow[simbolo] |= novos
+                    mudou = True
+    return follow
+
+def _previsoes(producoes, first, follow):
+    """Para cada produção, o conjunto de terminais que a seleciona e os que vêm só do FOLLOW."""
+    previsoes = []
+    for cabeca, corpo in producoes:
+        inicio = first_da_sequencia(corpo, first)
+        pelo_follow = follow[cabeca] - inicio if VAZIO in inicio else set()
+        previsoes.append((inicio - {VAZIO}, pelo_follow))
+    return previsoes
+
+def conflitos(producoes, inicial):
+    """Lista (nao_terminal, terminal, [alternativas]) para cada entrada da tabela com mais de uma produção."""
+    first = calcular_first(producoes)
+    follow = calcular_follow(producoes, inicial, first)
+    entradas = {}
+    for indice, (inicio, pelo_follow) in enumerate(_previsoes(producoes, first, follow)):
+        for terminal in inicio | pelo_follow:
+            entradas.setdefault((producoes[indice][0], terminal), []).append(indice)
+    return [(cabeca, terminal, [_sem_acoes(producoes[i][1]) for i in indices])
+            for (cabeca, terminal), indices in sorted(entradas.items()) if len(indices) > 1]
+
+def _descrever(cabeca, terminal, corpos):
+    alternativas = " | ".join(" ".join(corpo) or VAZIO for corpo in corpos)
+    return f"{cabeca} com '{terminal}': {alternativas}"
+
+# Monta a tabela LL(1). Um conflito entre uma alternativa que começa pelo terminal e uma
+# que só o tem no FOLLOW (caso do else pendente) é resolvido a favor da primeira, que
+# consome o token; qualquer outro conflito é um erro da gramática
+def construir_tabela(producoes, inicial):
+    first = calcular_first(producoes)
+    follow = calcular_follow(producoes, inicial, first)
+    candidatas = {}
+    for indice, (inicio, pelo_follow) in enumerate(_previsoes(producoes, first, follow)):
+        for terminal in inicio:
+            candidatas.setdefault((producoes[indice][0], terminal), []).append((indice, False))
+        for terminal in pelo_follow:
+            candidatas.setdefault((producoes[indice][0], terminal), []).append((indice, True))
+
+    tabela = {}
+    resolvidos = []
+    for (cabeca, terminal), indices in sorted(candidatas.items()):
+        consomem = [indice for indice, pelo_follow in indices if not pelo_follow]
+        if len(indices) > 1 and len(consomem) != 1:
+            raise ValueError("Conflito LL(1) em " + _descrever(cabeca, terminal,
+                             [_sem_acoes(producoes[indice][1]) for indice, _ in indices]))
+        escolhida = consomem[0] if consomem else indices[0][0]
+        for descartada, _ in indices:
+            if descartada != escolhida:
+                resolvidos.append((cabeca, terminal, descartada, escolhida))
+        tabela.setdefault(cabeca, {})[terminal] = escolhida
+
+    relatorio = [f"{cabeca} com '{terminal}': escolhida '{' '.join(_sem_acoes(producoes[usada][1]))}'"
+                 f" em vez de '{' '.join(_sem_acoes(producoes[descartada][1])) or VAZIO}'"
+                 for cabeca, terminal, descartada, usada in resolvidos]
+    return tabela, relatorio
+
+# Tabela LL(1) pronta para o analisador: produção inicial, corpos das produções (já
+# invertidos, na ordem em que vão para a pilha), tabela e os terminais da gramática
+class TabelaLL1:
+    def __init__(self, inicial, producoes, tabela, resolvidos):
+        self.inicial = inicial
+        self.producoes = producoes
+        self.corpos_invertidos = [tuple(reversed(corpo)) for _, corpo in producoes]
+        self.tabela = tabela
+        self.resolvidos = resolvidos
+        self.terminais = {simbolo for _, corpo in producoes for simbolo in corpo
+                          if simbolo not in tabela and not simbolo.startswith("@")}
+
+def gerar_tabela(texto, esquema=None, sinonimos=None):
+    """Lê, anota, fatora e gera a TabelaLL1 da gramática em texto."""
+    inicial, producoes = ler_gramatica(texto, sinonimos)
+    if esquema:
+        producoes = anotar(producoes, esquema, sinonimos)
+    producoes = fatorar(producoes)
+    tabela, resolvidos = construir_tabela(producoes, inicial)
+    return TabelaLL1(inicial, producoes, tabela, resolvidos)
+
+def _ler_arquivo(nome_arquivo):
+    try:
+        with open(nome_arquivo, "r") as file:
+            return file.read()
+    except FileNotFoundError:
+        print(f"Erro: Arquivo da gramática '{nome_arquivo}' não encontrado.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Erro ao carregar a gramática: {str(e)}")
+        sys.exit(1)
+
+# Carrega a tabela LL(1) da gramática usando o cache em __pycache__. A chave é o crc32
+# da gramática junto com o esquema de tradução e os sinônimos; qualquer alteração em
+# um deles gera a tabela de novo
+def carregar_tabela(esquema=None, sinonimos=None, nome_arquivo=ARQUIVO_GRAMATICA):
+    texto = _ler_arquivo(nome_arquivo)
+    conteudo = repr((texto, sorted((esquema or {}).items()), sorted((sinonimos or {}).items())))
+    chave = f"{zlib.crc32(conteudo.encode('utf-8')):08x}"
+    try:
+        with open(_caminho_cache(nome_arquivo, chave)[2], "rb") as file:
+            dados = marshal.loads(file.read())
+        if isinstance(dados, tuple) and len(dados) == 6 and dados[:2] == (VERSAO_CACHE, conteudo):
+            inicial, producoes, tabela, resolvidos = dados[2:]
+            return TabelaLL1(inicial, [tuple(producao) for producao in producoes], tabela, list(resolvidos))
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    tabela = gerar_tabela(texto, esquema, sinonimos)
+    _gravar_cache(nome_arquivo, chave, (VERSAO_CACHE, conteudo, tabela.inicial, tuple(tabela.producoes),
+                                        tabela.tabela, tuple(tabela.resolvidos)))
+    return tabela
+
+# Relata FIRST, FOLLOW e os conflitos LL(1) da gramática como está escrita, e como
+# ficam depois da fatoração
+if __name__ == "__main__":
+    nome = sys.argv[1] if len(sys.argv) > 1 else ARQUIVO_GRAMATICA
+    inicial, producoes = ler_gramatica(_ler_arquivo(nome))
+    first = calcular_first(producoes)
+    follow = calcular_follow(producoes, inicial, first)
+    for cabeca in dict.fromkeys(cabeca for cabeca, _ in producoes):
+        print(f"{cabeca}")
+        print(f"    FIRST:  {' '.join(sorted(first[cabeca]))}")
+        print(f"    FOLLOW: {' '.join(sorted(follow[cabeca]))}")
+
+    encontrados = conflitos(producoes, inicial)
+    print(f"\nConflitos LL(1) na gramática: {len(encontrados)}")
+    for cabeca, terminal, corpos in encontrados:
+        print(f"    {_descrever(cabeca, terminal, corpos)}")
+
+    fatoradas = fatorar(producoes)
+    restantes = conflitos(fatoradas, inicial)
+    print(f"\nConflitos LL(1) após a fatoração à esquerda: {len(restantes)}")
+    for cabeca, terminal, corpos in restantes:
+        print(f"    {_descrever(cabeca, terminal, corpos)}")
+    try:
+        _, resolvidos = construir_tabela(fatoradas, inicial)
+        for descricao in resolvidos:
+            print(f"    resolvido: {descricao}")
+    except ValueError as e:
+        print(f"    {e}")
+        sys.exit(1)
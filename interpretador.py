@@ -1,13 +1,85 @@
 import sys
 import ast
+from operator import add, sub, mul, eq, ne, lt, le, gt, ge
+import rastreio  # Rastreamento da execução (desligado por padrão, sem custo)
+
+# Marca "variável inexistente" nas buscas (None é um valor válido de variável)
+_AUSENTE = object()
+
+def calcular_aritmetica(operator, val1, val2):
+    """Resultado de uma operação aritmética sobre valores já convertidos (pode levantar exceção).
+
+    Usada pelo interpretador e pelo otimizador, que dobra as operações entre constantes
+    com exatamente o mesmo resultado."""
+    return {
+        "+": val1 + val2,
+        "-": val1 - val2,
+        "*": val1 * val2,
+        "/": val1 / val2 if val2 != 0 else float('inf'),
+        "%": val1 % val2 if val2 != 0 else 0,
+        "//": val1 // val2 if val2 != 0 else 0,
+    }.get(operator, 0)
+
+def _dividir(val1, val2):
+    return val1 / val2 if val2 != 0 else float('inf')
+
+def _resto(val1, val2):
+    return val1 % val2 if val2 != 0 else 0
+
+def _dividir_inteiro(val1, val2):
+    return val1 // val2 if val2 != 0 else 0
+
+# Operações tipadas, geradas por tipos.tipar quando os tipos dos operandos são conhecidos
+# em tempo de compilação. O prefixo diz o tipo dos operandos (I: int ou bool, F: float
+# com int ou float, S: string) e as constantes já vêm convertidas, então o cálculo não
+# confere nem converte nada. As divisões mantêm o tratamento da divisão por zero.
+OPERACOES_TIPADAS = {
+    "IADD": add, "ISUB": sub, "IMUL": mul, "IDIV": _dividir, "IMOD": _resto, "IDIVINT": _dividir_inteiro,
+    "FADD": add, "FSUB": sub, "FMUL": mul, "FDIV": _dividir,
+}
+for _prefixo in ("I", "F", "S"):
+    OPERACOES_TIPADAS.update({_prefixo + "CMP_EQ": eq, _prefixo + "CMP_NE": ne, _prefixo + "CMP_LT": lt,
+                              _prefixo + "CMP_LE": le, _prefixo + "CMP_GT": gt, _prefixo + "CMP_GE": ge})
+del _prefixo
+
+def comparar(operator, val1, val2):
+    """Resultado de uma comparação sobre valores já resolvidos (TypeError ou KeyError se inválida)."""
+    # Verificar se os tipos são comparáveis
+    if (isinstance(val1, (int, float)) and isinstance(val2, str)) or \
+    (isinstance(val2, (int, float)) and isinstance(val1, str)):
+        raise TypeError("Comparação entre número e string não permitida")
+
+    # Permite comparação entre booleanos e inteiros (True=1, False=0)
+    if isinstance(val1, bool) and isinstance(val2, (int, float)):
+        val1 = int(val1)
+    elif isinstance(val2, bool) and isinstance(val1, (int, float)):
+        val2 = int(val2)
+
+    # Type checking
+    if type(val1) != type(val2):
+        raise TypeError(f"Comparação inválida: {val1} ({type(val1)}) e {val2} ({type(val2)})")
+
+    # Logical operators
+    return {
+        "==": lambda a, b: a == b,
+        "!=": lambda a, b: a != b,
+        ">": lambda a, b: a > b,
+        ">=": lambda a, b: a >= b,
+        "<": lambda a, b: a < b,
+        "<=": lambda a, b: a <= b,
+    }[operator](val1, val2)
 
 class Interpretador:
-    def __init__(self, instrucoes):
+    def __init__(self, instrucoes, max_iteracoes=2000):
         self.instrucoes = instrucoes  # Lista de instruções carregadas
+        self.max_iteracoes = max_iteracoes  # Limite de iterações para evitar loops infinitos
         self.variaveis = {}  # Armazena variáveis e seus valores
         self.temp_vars = {}  # Armazena variáveis temporárias (usadas para cálculos)
         self.labels = {}  # Dicionário para armazenar rótulos (LABEL)
         self.current_instrucao = 0  # Índice da instrução atual
+        self.despachadas = 0  # Instruções executadas pela última chamada de rodar()
+        # Emissor de rastreamento da execução (None quando desligado)
+        self.rastro = rastreio.rastreador("exec")
         self.preprocess_labels()  # Pré-processa os rótulos antes da execução
 
     def preprocess_labels(self):
@@ -15,32 +87,38 @@ class Interpretador:
             if isinstance(instrucao, (list, tuple)) and instrucao[0] == "LABEL":
                 label_name = instrucao[1]
                 self.labels[label_name] = idx
-                print(f"✅ DEBUG: Label '{label_name}' registrada na posição {idx}")
+                if self.rastro:
+                    self.rastro(f"Label '{label_name}' registrada na posição {idx}")
                       
     def armazenar_variaveis(self):
         """ Armazena todas as variáveis declaradas antes da execução """
         for instrucao in self.instrucoes:
             if isinstance(instrucao, tuple) and instrucao[0] == "=":
                 var = instrucao[1]
-                if var not in self.variaveis:
+                # Temporários só existem depois de atribuídos (ficam em temp_vars)
+                if var not in self.variaveis and not var.startswith("__temp"):
                     self.variaveis[var] = None  # Inicializa variável sem valor
                     
     def rodar(self):
         """Executa as instruções interpretadas até atingir um limite de iterações."""
         self.armazenar_variaveis()
-        max_iteracoes = 2000     # Limite de iterações para evitar loops infinitos
+        max_iteracoes = self.max_iteracoes
         contarInteracao = 0
-        print("🔍 Labels registradas:", self.labels)  # Antes de executar
+        if self.rastro:
+            self.rastro("Labels registradas", labels=self.labels)  # Antes de executar
         while self.current_instrucao < len(self.instrucoes) and contarInteracao < max_iteracoes:
             contarInteracao += 1
             instrucao = self.instrucoes[self.current_instrucao]
             self.operator = instrucao[0]  # Identifica a operação da instrução
 
             try:
-                print(f"🔍 DEBUG: Processando instrução: {instrucao}")
+                if self.rastro:
+                    self.rastro("Processando instrução", indice=self.current_instrucao, instrucao=instrucao)
                 if not isinstance(instrucao, (tuple, list)) or len(instrucao) < 4:
                     raise ValueError(f"❌ ERRO: Instrução mal formada! Recebido: {instrucao}")
-                if self.operator == "=":
+                if self.operator in OPERACOES_TIPADAS:
+                    self.operar_tipada(instrucao)
+                elif self.operator == "=":
                     self.atribuir(instrucao)
                 elif self.operator == "CALL":
                     self.system_call(instrucao)
@@ -62,6 +140,7 @@ class Interpretador:
                 print(f"Erro na instrução {self.current_instrucao}: {instrucao} - {e}")
                 break
 
+        self.despachadas = contarInteracao
         if contarInteracao >= max_iteracoes:
             print("Número máximo de iterações atingido.")
 
@@ -100,9 +179,13 @@ class Interpretador:
         if operand is None:
             return 0
         
-        # Verifica se é uma variável
-        if isinstance(operand, str) and (operand in self.variaveis or operand in self.temp_vars):
-            valor = self.variaveis.get(operand, self.temp_vars.get(operand))
+        # Verifica se é uma variável (uma busca em cada dicionário, no máximo)
+        valor = _AUSENTE
+        if isinstance(operand, str):
+            valor = self.variaveis.get(operand, _AUSENTE)
+            if valor is _AUSENTE:
+                valor = self.temp_vars.get(operand, _AUSENTE)
+        if valor is not _AUSENTE:
             # Converte strings numéricas para int/float
             if isinstance(valor, str):
                 if valor.startswith('"') and valor.endswith('"'):  # string literal
@@ -159,14 +242,7 @@ class Interpretador:
             val2 = converter(op2) if op2 is not None else None
 
             # Operações aritméticas
-            result = {
-                "+": val1 + val2,
-                "-": val1 - val2,
-                "*": val1 * val2,
-                "/": val1 / val2 if val2 != 0 else float('inf'),
-                "%": val1 % val2 if val2 != 0 else 0,
-                "//": val1 // val2 if val2 != 0 else 0,
-            }.get(operator, 0)
+            result = calcular_aritmetica(operator, val1, val2)
 
         except ZeroDivisionError:
             print(f"Erro: Divisão por zero em {instrucao}")
@@ -183,34 +259,7 @@ class Interpretador:
             val1 = self.obt_valor(op1)
             val2 = self.obt_valor(op2) if op2 is not None else None
 
-            # Verificar se os tipos são comparáveis
-            if (isinstance(val1, (int, float)) and isinstance(val2, str)) or \
-            (isinstance(val2, (int, float)) and isinstance(val1, str)):
-                raise TypeError("Comparação entre número e string não permitida")
-
-            # Permite comparação entre booleanos e inteiros (True=1, False=0)
-            if isinstance(val1, bool) and isinstance(val2, (int, float)):
-                val1 = int(val1)
-            elif isinstance(val2, bool) and isinstance(val1, (int, float)):
-                val2 = int(val2)
-                
-            # Remover a verificação redundante
-            # if isinstance(val1, str) or isinstance(val2, str):
-            #    raise TypeError("Comparação entre string e número não permitida")   
-
-            # Type checking
-            if type(val1) != type(val2):
-                raise TypeError(f"Comparação inválida: {val1} ({type(val1)}) e {val2} ({type(val2)})")
-
-            # Logical operators
-            result = {
-                "==": lambda a, b: a == b,
-                "!=": lambda a, b: a != b,
-                ">": lambda a, b: a > b,
-                ">=": lambda a, b: a >= b,
-                "<": lambda a, b: a < b,
-                "<=": lambda a, b: a <= b,
-            }[operator](val1, val2)
+            result = comparar(operator, val1, val2)
 
         except KeyError:
             print(f"Operador lógico inválido: {operator}")
@@ -221,6 +270,19 @@ class Interpretador:
 
         self.armazen_restado(destino, result)
 
+    def operar_tipada(self, instrucao):
+        """Executa uma operação tipada: os operandos são lidos sem conversão."""
+        operador, destino, op1, op2 = instrucao
+        variaveis, temp_vars = self.variaveis, self.temp_vars
+        # Uma constante não está em nenhum dos dicionários e é lida como está
+        val1 = variaveis.get(op1, _AUSENTE)
+        if val1 is _AUSENTE:
+            val1 = temp_vars.get(op1, op1)
+        val2 = variaveis.get(op2, _AUSENTE)
+        if val2 is _AUSENTE:
+            val2 = temp_vars.get(op2, op2)
+        self.armazen_restado(destino, OPERACOES_TIPADAS[operador](val1, val2))
+
     def armazen_restado(self, destino, valor):
         """Armazena o resultado de uma operação em uma variável."""
         if destino.startswith("__temp"):
@@ -236,24 +298,25 @@ class Interpretador:
         # 🔴 Debug para verificar se a variável está sendo armazenada corretamente
         #print(f"📌 Atribuindo: {destino} = {valor} (resolvido: {valor_resolvido})")
 
+        # Temporários vão para temp_vars, como os resultados das operações: um mesmo
+        # temporário pode ser reutilizado por instruções de qualquer tipo
         if valor_resolvido is not None:
-            self.variaveis[destino] = valor_resolvido
+            self.armazen_restado(destino, valor_resolvido)
         else:
             #print(f"⚠️ Erro: Tentativa de atribuir 'None' a {destino}, definindo como 0.")
-            self.variaveis[destino] = 0  # 🔴 Agora inicializa a variável corretamente
+            self.armazen_restado(destino, 0)  # 🔴 Agora inicializa a variável corretamente
 
 
 
 
     def conditional_jump(self, instrucao):
         _, condition,label2, label1 = instrucao
-        print(f"🔍 DEBUG: Valor de {condition} = {self.obt_valor(condition)}")
-
         condition_valor = self.obt_valor(condition)
         if condition_valor is None:
             raise ValueError(f"❌ ERRO: Condição {condition} retornou None! O IF não pode ser avaliado.")
 
-        print(f"🔍 DEBUG: Executando IF: condition={condition} ({condition_valor}), label1={label1}, label2={label2}")
+        if self.rastro:
+            self.rastro(f"Executando IF: condition={condition} ({condition_valor}), label1={label1}, label2={label2}")
 
         if label1 is None or label2 is None:
             raise ValueError(f"❌ ERRO CRÍTICO: IF gerado com label inválida! Condição={condition}, Label1={label1}, Label2={label2}")
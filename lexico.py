@@ -1,5 +1,16 @@
 
+import bisect  # Busca binária nas posições dos tokens (re-análise incremental)
+import contextlib  # Silencia as mensagens de erro dos trechos analisados em paralelo
+import io
+import marshal  # Serialização rápida do cache de tabelas
+import mmap  # Leitura de arquivos grandes mapeados em memória
+import os
+import rastreio  # Rastreamento das fases (desligado por padrão, sem custo)
+import re  # Expressões regulares usadas pelo motor léxico rápido
 import sys  # Importa o módulo sys para utilizar sys.exit() e encerrar a execução em caso de erro
+import zlib  # crc32 do conteúdo de tokens.txt, usado como chave do cache de tabelas
+from array import array  # Colunas compactas do BufferTokens
+from concurrent.futures import ProcessPoolExecutor  # Análise léxica paralela
 
 # Função para ler o conteúdo de um arquivo
 def ler_arquivo(nome_arquivo):
@@ -16,45 +27,50 @@ def ler_arquivo(nome_arquivo):
         print(f"Erro ao ler o arquivo: {str(e)}")
         sys.exit(1)
 
+# Interpreta as linhas de um arquivo de tokens e retorna os dicionários de
+# operadores, palavras reservadas e símbolos
+def interpretar_tokens(content):
+    # Inicializa dicionários para operadores, palavras reservadas e símbolos
+    operators, reserved_words, symbols = {}, {}, {}
+
+    current_section = None  # Variável para rastrear a seção atual no arquivo (operadores, palavras reservadas ou símbolos)
+    for line in content:
+        line = line.strip()  # Remove espaços em branco ao redor da linha
+        if not line:
+            continue  # Ignora linhas vazias
+
+        # Define a seção atual dependendo do cabeçalho encontrado
+        if line.startswith("OPERATORS:"):
+            current_section = "operators"
+            continue
+        elif line.startswith("RESERVED WORDS:"):
+            current_section = "reserved_words"
+            continue
+        elif line.startswith("SYMBOLS:"):
+            current_section = "symbols"
+            continue
+        
+        # Divide a linha em símbolo/lexema e seu token correspondente
+        parts = line.split(" -> ")
+        if len(parts) == 2:
+            symbol, token = parts
+            # Adiciona o token ao dicionário apropriado de acordo com a seção atual
+            if current_section == "operators":
+                operators[symbol] = token
+            elif current_section == "reserved_words":
+                reserved_words[symbol] = token
+            elif current_section == "symbols":
+                symbols[symbol] = token
+    # Retorna os dicionários preenchidos com operadores, palavras reservadas e símbolos
+    return operators, reserved_words, symbols
+
 # Função para carregar os tokens do arquivo tokens.txt
 def ler_tokens(nome_arquivo_tokens):
     try:
-        # Inicializa dicionários para operadores, palavras reservadas e símbolos
-        operators, reserved_words, symbols = {}, {}, {}
         # Lê o conteúdo do arquivo de tokens linha por linha
         with open(nome_arquivo_tokens, "r") as file:
             content = file.readlines()
-        
-        current_section = None  # Variável para rastrear a seção atual no arquivo (operadores, palavras reservadas ou símbolos)
-        for line in content:
-            line = line.strip()  # Remove espaços em branco ao redor da linha
-            if not line:
-                continue  # Ignora linhas vazias
-
-            # Define a seção atual dependendo do cabeçalho encontrado
-            if line.startswith("OPERATORS:"):
-                current_section = "operators"
-                continue
-            elif line.startswith("RESERVED WORDS:"):
-                current_section = "reserved_words"
-                continue
-            elif line.startswith("SYMBOLS:"):
-                current_section = "symbols"
-                continue
-            
-            # Divide a linha em símbolo/lexema e seu token correspondente
-            parts = line.split(" -> ")
-            if len(parts) == 2:
-                symbol, token = parts
-                # Adiciona o token ao dicionário apropriado de acordo com a seção atual
-                if current_section == "operators":
-                    operators[symbol] = token
-                elif current_section == "reserved_words":
-                    reserved_words[symbol] = token
-                elif current_section == "symbols":
-                    symbols[symbol] = token
-        # Retorna os dicionários preenchidos com operadores, palavras reservadas e símbolos
-        return operators, reserved_words, symbols
+        return interpretar_tokens(content)
     except FileNotFoundError:
         # Exibe uma mensagem de erro e interrompe a execução se o arquivo de tokens não for encontrado
         print(f"Erro: Arquivo de tokens '{nome_arquivo_tokens}' não encontrado.")
@@ -77,25 +93,213 @@ class Token:
         # Retorna uma representação em string do token para facilitar a leitura
         return f"Token({self.type}, '{self.lexeme}', Line: {self.line}, Column: {self.column})"
 
+# Token gerado por MotorLexico.varrer: guarda só o offset no código-fonte, e a linha e a
+# coluna são calculadas pelo IndicePosicoes da varredura apenas quando pedidas
+# (mensagens de erro, depuração)
+class TokenPosicional:
+    __slots__ = ("type", "lexeme", "inicio", "posicoes")
+
+    def __init__(self, type, lexeme, inicio, posicoes):
+        self.type = type
+        self.lexeme = lexeme
+        self.inicio = inicio
+        self.posicoes = posicoes
+
+    @property
+    def line(self):
+        return self.posicoes.posicao(self.inicio)[0]
+
+    @property
+    def column(self):
+        return self.posicoes.posicao(self.inicio)[1]
+
+    __repr__ = Token.__repr__
+
+# Erro léxico com a posição em que ocorreu. As funções de análise levantam este erro e
+# a varredura decide: sem coleta de erros, exibe a mensagem e encerra o programa
+class ErroLexico(Exception):
+    def __init__(self, mensagem, line, column):
+        super().__init__(mensagem)
+        self.mensagem = mensagem
+        self.line = line
+        self.column = column
+
+# Armazenamento compacto de tokens: em vez de um objeto Token por token, guarda colunas
+# paralelas (array) com o id do tipo, a posição e o tamanho (9 bytes por token). O
+# lexema é recortado do código-fonte e a linha e a coluna são calculadas pelo
+# IndicePosicoes da varredura apenas quando pedidos.
+class BufferTokens:
+    def __init__(self, source_code):
+        self.source_code = source_code
+        self.tipos = []  # Nomes dos tipos de token, indexados pelo id
+        self.ids_tipos = {}  # Nome do tipo -> id
+        self.tipo = array('B')  # Id do tipo de cada token
+        self.inicio = array('I')  # Posição do token no código-fonte
+        self.tamanho = array('I')  # Quantidade de caracteres do token no código-fonte
+        self.posicoes = IndicePosicoes()  # Preenchido pela varredura (ver lexer_compacto)
+        self.linha = _PosicaoCalculada(self, 0)
+        self.coluna = _PosicaoCalculada(self, 1)
+        # Lexemas que não são um trecho literal do código (ex: '0X1F' -> '0x1F', '1.' -> '1.0')
+        self.lexemas_especiais = {}
+
+    def adicionar(self, type, lexeme, inicio, fim, posicoes):
+        """Registra um token; tem a assinatura de criar_token usada por MotorLexico.varrer."""
+        especial = len(lexeme) != fim - inicio or not self.source_code.startswith(lexeme, inicio)
+        self.registrar(type, lexeme if especial else None, inicio, fim)
+
+    def registrar(self, type, especial, inicio, fim):
+        """Registra um token cujo lexema é source_code[inicio:fim], ou `especial` se informado."""
+        id_tipo = self.ids_tipos.get(type)
+        if id_tipo is None:
+            id_tipo = self.ids_tipos[type] = len(self.tipos)
+            self.tipos.append(type)
+        if especial is not None:
+            self.lexemas_especiais[len(self.tipo)] = especial
+        self.tipo.append(id_tipo)
+        self.inicio.append(inicio)
+        self.tamanho.append(fim - inicio)
+
+    def remover_ultimo(self):
+        indice = len(self.tipo) - 1
+        for coluna in (self.tipo, self.inicio, self.tamanho):
+            coluna.pop()
+        self.lexemas_especiais.pop(indice, None)
+
+    def lexema(self, indice):
+        especial = self.lexemas_especiais.get(indice)
+        if especial is not None:
+            return especial
+        inicio = self.inicio[indice]
+        return self.source_code[inicio:inicio + self.tamanho[indice]]
+
+    def __len__(self):
+        return len(self.tipo)
+
+    def __getitem__(self, indice):
+        if indice < 0:
+            indice += len(self.tipo)
+        if not 0 <= indice < len(self.tipo):
+            raise IndexError("índice de token fora do intervalo")
+        return VisaoToken(self, indice)
+
+    def __iter__(self):
+        for indice in range(len(self.tipo)):
+            yield VisaoToken(self, indice)
+
+    def __repr__(self):
+        return repr(list(self))
+
+# BufferTokens sobre um arquivo mapeado em memória (mmap): inicio e tamanho são posições
+# em bytes no arquivo, assim como os pontos do IndicePosicoes, e o lexema só é
+# decodificado (UTF-8) quando pedido
+class BufferTokensMapeado(BufferTokens):
+    def registrar_posicao(self, inicio, line, column):
+        """Garante que o índice (em bytes) dê (line, column) para o token em inicio."""
+        posicoes = self.posicoes
+        if not len(posicoes) or posicoes.linhas[-1] != line or posicoes.deslocamentos[-1] != column - inicio:
+            posicoes.registrar(inicio, line, column)
+
+    def lexema(self, indice):
+        especial = self.lexemas_especiais.get(indice)
+        if especial is not None:
+            return especial
+        inicio = self.inicio[indice]
+        texto = self.source_code[inicio:inicio + self.tamanho[indice]].decode("utf-8")
+        if "\r" in texto:
+            # Mesma conversão de quebras de linha feita pela leitura em modo texto
+            texto = texto.replace("\r\n", "\n").replace("\r", "\n")
+        return texto
+
+# Índice de posições: em vez de guardar linha e coluna em cada token, guarda apenas os
+# pontos em que a posição deixa de avançar junto com o offset (as quebras de linha
+# vistas pelo analisador e os poucos casos em que a coluna anda diferente do texto,
+# como o '0' acrescentado a "1."). Entre dois pontos, a linha é a mesma e a coluna é
+# o offset mais um deslocamento constante; a busca binária encontra o ponto certo.
+# MotorLexico.varrer monta o índice durante a varredura, no lugar dos contadores de
+# linha e coluna
+class IndicePosicoes:
+    def __init__(self):
+        self.inicios = array('I')  # Offset de cada ponto, em ordem crescente
+        self.linhas = array('I')  # Linha a partir do ponto
+        self.deslocamentos = array('q')  # Coluna - offset a partir do ponto
+
+    def registrar(self, inicio, line, column):
+        self.inicios.append(inicio)
+        self.linhas.append(line)
+        self.deslocamentos.append(column - inicio)
+
+    def posicao(self, inicio):
+        """Retorna (linha, coluna) do token que começa no offset informado."""
+        k = bisect.bisect_right(self.inicios, inicio) - 1
+        return self.linhas[k], self.deslocamentos[k] + inicio
+
+    def atual(self, inicio):
+        """Como posicao, para um offset a partir do último ponto (sem busca; usado durante a varredura)."""
+        return self.linhas[-1], self.deslocamentos[-1] + inicio
+
+    def anexar(self, outro, offset=0, linhas=0, primeiro=0, ultimo=None):
+        """Acrescenta os pontos [primeiro:ultimo] de outro índice, deslocados em offset caracteres e `linhas` linhas."""
+        self.inicios.extend([inicio + offset for inicio in outro.inicios[primeiro:ultimo]])
+        self.linhas.extend([linha + linhas for linha in outro.linhas[primeiro:ultimo]])
+        self.deslocamentos.extend([deslocamento - offset for deslocamento in outro.deslocamentos[primeiro:ultimo]])
+
+    def __len__(self):
+        return len(self.inicios)
+
+# Linha ou coluna de um BufferTokens: se comporta como um array indexado pelo número do
+# token, mas calcula cada valor pelo IndicePosicoes
+class _PosicaoCalculada:
+    def __init__(self, buffer, campo):
+        self.buffer = buffer
+        self.campo = campo  # 0 = linha, 1 = coluna
+
+    def __getitem__(self, indice):
+        return self.buffer.posicoes.posicao(self.buffer.inicio[indice])[self.campo]
+
+    def __len__(self):
+        return len(self.buffer.inicio)
+
+# Visão de um token guardado em um BufferTokens; se comporta como um Token (type, lexeme,
+# line, column), então Parser.match e Node._str_recursive funcionam sem mudanças
+class VisaoToken(Token):
+    __slots__ = ("buffer", "indice")
+
+    def __init__(self, buffer, indice):
+        self.buffer = buffer
+        self.indice = indice
+
+    @property
+    def type(self):
+        return self.buffer.tipos[self.buffer.tipo[self.indice]]
+
+    @property
+    def lexeme(self):
+        return self.buffer.lexema(self.indice)
+
+    @property
+    def line(self):
+        return self.buffer.linha[self.indice]
+
+    @property
+    def column(self):
+        return self.buffer.coluna[self.indice]
+
 def verificar_notacao_cientifica(numero,line,columm):
     """Verifica se o número está em notação científica válida."""
     if 'e' in numero or 'E' in numero:
         partes = numero.split('e' if 'e' in numero else 'E')
         if len(partes) != 2:
-            print(f"Erro: Notação científica incorreta '{numero}' na linha{line} ,coluna{columm}")
-            sys.exit(1)
+            raise ErroLexico(f"Erro: Notação científica incorreta '{numero}' na linha{line} ,coluna{columm}", line, columm)
         
         base, expoente = partes[0], partes[1]
         
         if not base.replace('.', '', 1).isdigit() or base.count('.') > 1:
-            print(f"Erro: Base inválida na notação científica '{numero}' na linha{line}, coluna{columm}")
-            sys.exit(1)
+            raise ErroLexico(f"Erro: Base inválida na notação científica '{numero}' na linha{line}, coluna{columm}", line, columm)
 
-        if expoente[0] in '+-' and expoente[1:].isdigit() or expoente.isdigit():
+        if expoente and (expoente[0] in '+-' and expoente[1:].isdigit() or expoente.isdigit()):
             return True
         else:
-            print(f"Erro: Expoente inválido na notação científica '{numero}'na linha {line} ,coluna {columm}")
-            sys.exit(1)
+            raise ErroLexico(f"Erro: Expoente inválido na notação científica '{numero}'na linha {line} ,coluna {columm}", line, columm)
     else:
         return numero.replace('.', '', 1).isdigit()
 
@@ -104,14 +308,103 @@ def verificar_overflow(numero,line, columm):
     try:
         valor = int(float(numero))  # Converte para float, depois para int, em caso de ponto flutuante
         if valor < -2_147_483_648 or valor > 2_147_483_647:
-            print(f"Erro: Overflow do número '{numero}' na linha:{line},coluna: {columm}")
-            sys.exit(1)
+            raise ErroLexico(f"Erro: Overflow do número '{numero}' na linha:{line},coluna: {columm}", line, columm)
         return True
     except ValueError:
-        print(f"Erro: Número inválido '{numero}' na linha: {line},coluna: {columm}")
-        sys.exit(1)
-# Função principal do analisador léxico
-def lexer(source_code, operators, reserved_words, symbols):
+        raise ErroLexico(f"Erro: Número inválido '{numero}' na linha: {line},coluna: {columm}", line, columm)
+
+# Analisa um literal numérico (decimal, float, científico, octal ou hexadecimal) a partir de
+# source_code[index], adicionando o token em tokens. Retorna o índice e a coluna atualizados.
+def _lexar_numero(source_code, index, line_number, column_number, tokens):
+    char = source_code[index]  # Caractere atual
+    start_index = index  # Marca o início do número
+    lexeme = ""  # Inicializa a string para acumular o lexema do número
+
+    # Hexadecimal
+    if char == '0' and index + 1 < len(source_code) and source_code[index + 1].lower() == 'x':
+        lexeme += "0x"
+        index += 2  # Avança o índice após "0x"
+        
+        # Loop para acumular os dígitos e letras válidas em hexadecimal (0-9 e a-f)
+        while index < len(source_code) and (source_code[index].isdigit() or source_code[index] in "ABCDEFG.") and not(source_code[index] in "-+={}(),!@#$%¨&*:;/<>|"):
+            if source_code[index] == '.':
+                # Erro: ponto decimal encontrado em hexadecimal
+                raise ErroLexico(f"Erro: Ponto decimal não permitido em número hexadecimal '{lexeme + source_code[index]}' na linha {line_number}, coluna {column_number}", line_number, column_number)
+            if source_code[index].isalpha() and source_code[index] not in "ABCDEFG":
+                # Erro: letra inválida fora do intervalo a-f
+                raise ErroLexico(f"Erro: Número hexadecimal inválido '{lexeme + source_code[index]}' na linha {line_number}, coluna {column_number}", line_number, column_number)
+            lexeme += source_code[index]  # Adiciona o caractere ao lexema
+            index += 1
+        
+        # Verificação final para garantir que haja conteúdo válido após "0x"
+        if len(lexeme) > 2:
+            tokens.append(Token("HEXADECIMAL_INT", lexeme, line_number, column_number))
+        else:
+            raise ErroLexico(f"Erro: Número hexadecimal inválido '{lexeme}' na linha {line_number}, coluna {column_number}", line_number, column_number)
+        
+        column_number += len(lexeme)
+        if index < len(source_code) and source_code[index].isalnum():
+            raise ErroLexico(f"Erro: Caractere inválido '{source_code[index]}' em número hexadecimal na linha {line_number}, coluna {column_number}", line_number, column_number)
+        return index, column_number
+
+    # Octal
+    elif char == '0' and index + 1 < len(source_code) and source_code[index + 1] in "01234567":
+        lexeme += "0"
+        index += 1
+        
+        # Loop para acumular os dígitos válidos em octal (0-7)
+        while index < len(source_code) and source_code[index] in "01234567." and not(source_code[index] in "-+={}(),!@#$%¨&*:;/<>|"):
+            if source_code[index] == '.':
+                # Erro: ponto decimal encontrado em octal
+                raise ErroLexico(f"Erro: Ponto decimal não permitido em número octal '{lexeme + source_code[index]}' na linha {line_number}, coluna {column_number}", line_number, column_number)
+            lexeme += source_code[index]  # Adiciona o dígito ao lexema
+            index += 1
+        
+        tokens.append(Token("OCTAL_INT", lexeme, line_number, column_number))
+        column_number += len(lexeme)
+        # Verificação de caracteres fora do conjunto octal (0-7)
+        if index < len(source_code) and source_code[index].isdigit():
+            raise ErroLexico(f"Erro: Caractere inválido '{source_code[index]}' em número octal na linha {line_number}, coluna {column_number}", line_number, column_number)
+        return index, column_number
+
+    # Float e Decimal (com verificação de `..`)
+    else:
+        has_decimal_point = False  
+        is_scientific = False
+        # Loop para acumular os dígitos e ponto decimal
+        while index < len(source_code)and (source_code[index].isdigit() or source_code[index] in '.eE+-') and not(source_code[index] in "-+={}(),!@#$%¨&*:;/<>|") :
+            """if source_code[index] == '.':
+            if has_decimal_point:
+                raise ErroLexico(f"Erro: Número inválido com múltiplos pontos decimais '{lexeme}' na linha {line_number}, coluna {column_number}", line_number, column_number)
+            has_decimal_point = True"""
+            if source_code[index] in 'eE':
+                if is_scientific:
+                    raise ErroLexico(f"Erro: Notação científica inválida '{lexeme}' na linha {line_number}, coluna {column_number}", line_number, column_number)
+                is_scientific = True
+            lexeme += source_code[index]
+            index += 1
+        # Verifica se o número termina com um caractere inválido    
+        if lexeme.count('.') > 1:
+             raise ErroLexico(f"Erro: Número inválido com múltiplos pontos decimais '{lexeme}' na linha {line_number}, coluna {column_number}", line_number, column_number)
+        # Adiciona '0' após o ponto se necessário, conforme especificação
+        if lexeme.endswith('.'):
+            lexeme += '0'
+        
+        # Validação e classificação do número
+        if is_scientific:
+            verificar_notacao_cientifica(lexeme,line_number,column_number)
+            tokens.append(Token("SCIENTIFIC_FLOAT", lexeme, line_number, column_number))
+        elif '.' in lexeme:
+            tokens.append(Token("FLOAT", lexeme, line_number, column_number))
+        else:
+            verificar_overflow(lexeme,line_number,column_number)
+            tokens.append(Token("DECIMAL_INT", lexeme, line_number, column_number))
+        
+        column_number += len(lexeme)
+        return index, column_number
+
+# Motor clássico do analisador léxico (percorre o código caractere por caractere)
+def lexer_classico(source_code, operators, reserved_words, symbols):
     tokens = []  # Lista para armazenar os tokens encontrados
     line_number = 1  # Contador de linha
     column_number = 0  # Contador de coluna
@@ -225,100 +518,12 @@ def lexer(source_code, operators, reserved_words, symbols):
        
         # Caso inicie com um dígito ou com o prefixo "0x" indicando um número hexadecimal
         if  char.isdigit() or (char == '0' and index + 1 < len(source_code) and source_code[index + 1].lower() == 'x'):
-            start_index = index  # Marca o início do número
-            lexeme = ""  # Inicializa a string para acumular o lexema do número
-
-            # Hexadecimal
-            if char == '0' and index + 1 < len(source_code) and source_code[index + 1].lower() == 'x':
-                lexeme += "0x"
-                index += 2  # Avança o índice após "0x"
-                
-                # Loop para acumular os dígitos e letras válidas em hexadecimal (0-9 e a-f)
-                while index < len(source_code) and (source_code[index].isdigit() or source_code[index] in "ABCDEFG.") and not(source_code[index] in "-+={}(),!@#$%¨&*:;/<>|"):
-                    if source_code[index] == '.':
-                        # Erro: ponto decimal encontrado em hexadecimal
-                        print(f"Erro: Ponto decimal não permitido em número hexadecimal '{lexeme + source_code[index]}' na linha {line_number}, coluna {column_number}")
-                        sys.exit(1)
-                    if source_code[index].isalpha() and source_code[index] not in "ABCDEFG":
-                        # Erro: letra inválida fora do intervalo a-f
-                        print(f"Erro: Número hexadecimal inválido '{lexeme + source_code[index]}' na linha {line_number}, coluna {column_number}")
-                        sys.exit(1)
-                    lexeme += source_code[index]  # Adiciona o caractere ao lexema
-                    index += 1
-                
-                # Verificação final para garantir que haja conteúdo válido após "0x"
-                if len(lexeme) > 2:
-                    tokens.append(Token("HEXADECIMAL_INT", lexeme, line_number, column_number))
-                else:
-                    print(f"Erro: Número hexadecimal inválido '{lexeme}' na linha {line_number}, coluna {column_number}")
-                    sys.exit(1)
-                
-                column_number += len(lexeme)
-                if index < len(source_code) and source_code[index].isalnum():
-                    print(f"Erro: Caractere inválido '{source_code[index]}' em número hexadecimal na linha {line_number}, coluna {column_number}")
-                    sys.exit(1)
-                continue
-
-            # Octal
-            elif char == '0' and index + 1 < len(source_code) and source_code[index + 1] in "01234567":
-                lexeme += "0"
-                index += 1
-                
-                # Loop para acumular os dígitos válidos em octal (0-7)
-                while index < len(source_code) and source_code[index] in "01234567." and not(source_code[index] in "-+={}(),!@#$%¨&*:;/<>|"):
-                    if source_code[index] == '.':
-                        # Erro: ponto decimal encontrado em octal
-                        print(f"Erro: Ponto decimal não permitido em número octal '{lexeme + source_code[index]}' na linha {line_number}, coluna {column_number}")
-                        sys.exit(1)
-                    lexeme += source_code[index]  # Adiciona o dígito ao lexema
-                    index += 1
-                
-                tokens.append(Token("OCTAL_INT", lexeme, line_number, column_number))
-                column_number += len(lexeme)
-                # Verificação de caracteres fora do conjunto octal (0-7)
-                if index < len(source_code) and source_code[index].isdigit():
-                    print(f"Erro: Caractere inválido '{source_code[index]}' em número octal na linha {line_number}, coluna {column_number}")
-                    sys.exit(1)
-                continue
-
-            # Float e Decimal (com verificação de `..`)
-            else:
-                has_decimal_point = False  
-                is_scientific = False
-                # Loop para acumular os dígitos e ponto decimal
-                while index < len(source_code)and (source_code[index].isdigit() or source_code[index] in '.eE+-') and not(source_code[index] in "-+={}(),!@#$%¨&*:;/<>|") :
-                    """if source_code[index] == '.':
-                    if has_decimal_point:
-                        print(f"Erro: Número inválido com múltiplos pontos decimais '{lexeme}' na linha {line_number}, coluna {column_number}")
-                        sys.exit(1)
-                    has_decimal_point = True"""
-                    if source_code[index] in 'eE':
-                        if is_scientific:
-                            print(f"Erro: Notação científica inválida '{lexeme}' na linha {line_number}, coluna {column_number}")
-                            sys.exit(1)
-                        is_scientific = True
-                    lexeme += source_code[index]
-                    index += 1
-                # Verifica se o número termina com um caractere inválido    
-                if lexeme.count('.') > 1:
-                     print(f"Erro: Número inválido com múltiplos pontos decimais '{lexeme}' na linha {line_number}, coluna {column_number}")
-                     sys.exit(1)    
-                # Adiciona '0' após o ponto se necessário, conforme especificação
-                if lexeme.endswith('.'):
-                    lexeme += '0'
-                
-                # Validação e classificação do número
-                if is_scientific:
-                    verificar_notacao_cientifica(lexeme,line_number,column_number)
-                    tokens.append(Token("SCIENTIFIC_FLOAT", lexeme, line_number, column_number))
-                elif '.' in lexeme:
-                    tokens.append(Token("FLOAT", lexeme, line_number, column_number))
-                else:
-                    verificar_overflow(lexeme,line_number,column_number)
-                    tokens.append(Token("DECIMAL_INT", lexeme, line_number, column_number))
-                
-                column_number += len(lexeme)
-                continue
+            try:
+                index, column_number = _lexar_numero(source_code, index, line_number, column_number, tokens)
+            except ErroLexico as erro:
+                print(erro.mensagem)
+                sys.exit(1)
+            continue
 
         # Identificação de identificadores e palavras reservadas
         if char.isalpha():
@@ -356,20 +561,695 @@ def lexer(source_code, operators, reserved_words, symbols):
     # Retorna a lista de tokens encontrados
     return tokens
 
+# Padrão mestre do motor regex: reconhece em uma única passada os casos comuns
+# (espaços, identificadores ASCII, números simples e strings). Os lookaheads
+# recusam qualquer número que o motor clássico trataria de forma especial, que
+# então é delegado a _lexar_numero para manter as mesmas mensagens de erro.
+_PADRAO_MESTRE = re.compile(r"""
+    (?P<ESPACO>\s+)
+  | (?P<IDENT>[A-Za-z]\w*)
+  | (?P<HEX>0[xX][0-9A-G]+(?![.0-9A-Za-z]|[^\x00-\x7f]))
+  | (?P<OCTAL>0[0-7]+(?![.0-9]|[^\x00-\x7f]))
+  | (?P<FLOAT>(?!0[0-7xX])[0-9]+\.[0-9]*(?![0-9.eE]|[^\x00-\x7f]))
+  | (?P<DECIMAL>(?!0[0-7xX])[0-9]+(?![0-9.eE]|[^\x00-\x7f]))
+  | (?P<STRING>"(?:[^"]|(?<=\\)")*(?<!\\)"|'(?:[^']|(?<=\\)')*(?<!\\)')
+""", re.VERBOSE)
+
+# Constrói uma trie (dicionários aninhados) com os operadores; a chave "" marca o fim de um operador
+def construir_trie(operators):
+    trie = {}
+    for op, token in operators.items():
+        no = trie
+        for c in op:
+            no = no.setdefault(c, {})
+        no[""] = token
+    return trie
+
+def _criar_token(type, lexeme, inicio, fim, posicoes):
+    return TokenPosicional(type, lexeme, inicio, posicoes)
+
+# Motor léxico baseado no padrão mestre e na trie de operadores, construído uma vez por tabela
+class MotorLexico:
+    def __init__(self, operators, reserved_words, symbols, trie=None, simples=None):
+        self.operators = operators
+        self.reserved_words = reserved_words
+        self.symbols = symbols
+        # trie e simples podem vir prontos do cache de tabelas (ver carregar_tabelas)
+        self.trie = trie if trie is not None else construir_trie(operators)
+        if simples is not None:
+            self.simples = simples
+            return
+        # Caracteres que sempre formam um token de um único caractere (operador sem
+        # continuação na trie ou símbolo), resolvidos com uma só consulta ao dicionário
+        self.simples = {}
+        for c in set(self.trie) | set(symbols):
+            if len(c) != 1 or c in "\"'/" or c.isspace() or c.isdigit() or c.isalpha():
+                continue
+            if c in self.trie:
+                if len(self.trie[c]) == 1 and "" in self.trie[c]:
+                    self.simples[c] = self.trie[c][""]
+            else:
+                self.simples[c] = symbols[c]
+
+    def casar_operador(self, source_code, index):
+        """Retorna (operador, token) do maior operador que começa em index, ou None."""
+        no = self.trie
+        melhor = None
+        fim = index
+        n = len(source_code)
+        while fim < n:
+            no = no.get(source_code[fim])
+            if no is None:
+                break
+            fim += 1
+            if "" in no:
+                melhor = (source_code[index:fim], no[""])
+        return melhor
+
+    def tokenizar(self, source_code, erros=None):
+        """Gera a mesma lista de tokens (e os mesmos erros) que lexer_classico.
+
+        Com erros (uma lista), os erros léxicos são coletados em vez de encerrar o programa.
+        """
+        return list(self.varrer(source_code, erros=erros))
+
+    def varrer(self, source_code, index=0, line_number=1, column_number=0, final=True, criar_token=None, erros=None, posicoes=None):
+        """Gera os tokens de source_code a partir de index, com a linha e a coluna informadas.
+
+        Com final=False, source_code é apenas o início do que ainda será lido: a varredura
+        para antes de qualquer token que possa continuar além do texto disponível e
+        retorna (index, line_number, column_number) para ser retomada com mais texto.
+        A linha e a coluna não são contadas token a token: a varredura só registra em
+        posicoes (um IndicePosicoes, por padrão um novo) os pontos em que elas deixam de
+        acompanhar o offset, e as calcula por ele quando precisa (erros, retorno).
+        criar_token(type, lexeme, inicio, fim, posicoes) constrói cada valor gerado (por
+        padrão, um TokenPosicional); inicio e fim delimitam o token em source_code, e o
+        último ponto de posicoes já vale para inicio (posicoes.atual(inicio)).
+        Se erros (uma lista) for informado, cada ErroLexico é guardado nela e a varredura
+        continua após o trecho inválido; sem ela, o primeiro erro encerra o programa.
+        """
+        criar = criar_token or _criar_token
+        casar = _PADRAO_MESTRE.match
+        reserved_words = self.reserved_words
+        symbols = self.symbols
+        simples = self.simples
+        if posicoes is None:
+            posicoes = IndicePosicoes()
+        posicoes.registrar(index, line_number, column_number)
+        registrar = posicoes.registrar
+        atual = posicoes.atual
+        linhas = posicoes.linhas
+        n = len(source_code)
+        limite = n
+        if not final:
+            # Nenhum token além de strings e comentários contém espaços: tudo o que começa
+            # antes do último espaço termina (e é decidido) dentro do texto disponível
+            limite = max(source_code.rfind(' '), source_code.rfind('\n'), source_code.rfind('\t'), index)
+
+        while index < limite:
+            try:
+                m = casar(source_code, index)
+                if m is not None:
+                    tipo = m.lastgroup
+                    fim = m.end()
+                    if tipo == "ESPACO":
+                        quebras = source_code.count('\n', index, fim)
+                        if quebras:
+                            # Após uma quebra de linha a coluna recomeça em 1, como no motor clássico
+                            registrar(fim, linhas[-1] + quebras, fim - source_code.rfind('\n', index, fim))
+                        index = fim
+                        continue
+                    elif tipo == "IDENT":
+                        lexeme = m.group()
+                        token = criar(reserved_words.get(lexeme, "VARIABLE"), lexeme, index, fim, posicoes)
+                    elif tipo == "DECIMAL":
+                        lexeme = m.group()
+                        if len(lexeme) > 9:  # Com até 9 dígitos o valor sempre cabe em um int32
+                            verificar_overflow(lexeme, *atual(index))
+                        token = criar("DECIMAL_INT", lexeme, index, fim, posicoes)
+                    elif tipo == "FLOAT":
+                        lexeme = m.group()
+                        if lexeme.endswith('.'):
+                            token = criar("FLOAT", lexeme + '0', index, fim, posicoes)
+                            # A coluna avança pelo lexema, um caractere além do texto
+                            line, column = atual(fim)
+                            registrar(fim, line, column + 1)
+                        else:
+                            token = criar("FLOAT", lexeme, index, fim, posicoes)
+                    elif tipo == "HEX":
+                        # O motor clássico sempre grava o prefixo como "0x", mesmo quando escrito "0X"
+                        token = criar("HEXADECIMAL_INT", "0x" + source_code[index + 2:fim], index, fim, posicoes)
+                    else:
+                        # STRING e OCTAL usam o lexema exatamente como casado
+                        token = criar("OCTAL_INT" if tipo == "OCTAL" else tipo, m.group(), index, fim, posicoes)
+                    index = fim
+                    yield token
+                    continue
+
+                char = source_code[index]
+                tipo_simples = simples.get(char)
+                if tipo_simples is not None:
+                    yield criar(tipo_simples, char, index, index + 1, posicoes)
+                    index += 1
+                    continue
+
+                if char == '"' or char == "'":
+                    if not final:
+                        break  # A aspa de fechamento pode estar no próximo bloco
+                    # O padrão só falha em uma aspa quando a string não é fechada
+                    line, column = atual(index)
+                    raise ErroLexico(f"Erro: String não fechada na linha {line}, coluna {column}", line, column)
+
+                if char == '/':
+                    # Comentários avançam a coluna junto com o offset (mesmo os que atravessam
+                    # linhas, como no motor clássico): nenhum ponto novo no índice
+                    start_index = index
+                    index += 1
+                    if index < n and source_code[index] == '/':
+                        index += 1
+                        fim = source_code.find('\n', index, n - 1)
+                        if fim == -1:
+                            if not final:
+                                index = start_index
+                                break
+                            fim = max(index, n - 1)
+                        index = fim + 2  # Avança após o '\n' (e o caractere seguinte, como no motor clássico)
+                    elif index < n and source_code[index] == '*':
+                        index += 1
+                        fim = source_code.find('*/', index)
+                        if not final and (fim == -1 or fim + 2 >= n):
+                            index = start_index
+                            break
+                        if fim == -1:
+                            fim = max(index, n - 1)
+                        index = fim + 2  # Avança após o fechamento '*/'
+                        if index >= n:
+                            line, column = atual(start_index)
+                            registrar(n, line, column)  # A coluna para no início do comentário
+                            raise ErroLexico(f"Erro: Comentário não fechado na linha {line}, coluna {column}", line, column)
+                    else:
+                        # Uma '/' que não abre comentário é descartada sem avançar a coluna,
+                        # como no motor clássico
+                        line, column = atual(start_index)
+                        registrar(index, line, column)
+                    continue
+
+                if char.isdigit():
+                    encontrados = []
+                    start_index = index
+                    line, column = atual(index)
+                    index, coluna_final = _lexar_numero(source_code, index, line, column, encontrados)
+                    tokens = [criar(t.type, t.lexeme, start_index, index, posicoes) for t in encontrados]
+                    if coluna_final - column != index - start_index:
+                        registrar(index, line, coluna_final)
+                    yield from tokens
+                    continue
+
+                if char.isalpha():
+                    # Identificadores iniciados por letras não ASCII
+                    start_index = index
+                    while index < n and (source_code[index].isalnum() or source_code[index] == '_'):
+                        index += 1
+                    lexeme = source_code[start_index:index]
+                    yield criar(reserved_words.get(lexeme, "VARIABLE"), lexeme, start_index, index, posicoes)
+                    continue
+
+                operador = self.casar_operador(source_code, index)
+                if operador is not None:
+                    op, token = operador
+                    yield criar(token, op, index, index + len(op), posicoes)
+                    index += len(op)
+                elif char in symbols:
+                    yield criar(symbols[char], char, index, index + 1, posicoes)
+                    index += 1
+                else:
+                    line, column = atual(index)
+                    raise ErroLexico(f"Erro: Token não reconhecido '{char}' na linha {line}, coluna {column}", line, column)
+
+            except ErroLexico as erro:
+                if erros is None:
+                    print(erro.mensagem)
+                    sys.exit(1)
+                erros.append(erro)
+                # O erro é levantado antes de index avançar (exceto no comentário não fechado,
+                # que já passou do fim): o trecho inválido começa em index
+                if index >= n or source_code[index] in "\"'":
+                    break  # String ou comentário não fechado: o restante do código pertence a ele
+                fim = index + 1
+                if source_code[index].isdigit():
+                    while fim < n and (source_code[fim].isalnum() or source_code[fim] in "._"):
+                        fim += 1
+                    # O número inválido vira 0, para que a análise sintática possa continuar
+                    yield criar("DECIMAL_INT", "0", index, fim, posicoes)
+                index = fim
+
+        # Um comentário de linha no fim do código avança index além de n
+        return (index, *atual(min(index, n)))
+
+# Motores disponíveis; MOTOR_PADRAO define qual deles lexer() usa quando nenhum é informado
+MOTORES = ("regex", "classico")
+MOTOR_PADRAO = "regex"
+_motores_construidos = {}
+
+def _chave_motor(operators, reserved_words, symbols):
+    return (tuple(operators.items()), tuple(reserved_words.items()), tuple(symbols.items()))
+
+def obter_motor(operators, reserved_words, symbols):
+    """Retorna o MotorLexico das tabelas informadas, construindo-o apenas na primeira vez."""
+    chave = _chave_motor(operators, reserved_words, symbols)
+    motor = _motores_construidos.get(chave)
+    if motor is None:
+        motor = MotorLexico(operators, reserved_words, symbols)
+        _motores_construidos[chave] = motor
+    return motor
+
+# Arquivo de tokens padrão, localizado ao lado deste módulo (e não no diretório de trabalho)
+ARQUIVO_TOKENS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tokens.txt')
+# Versão do formato do cache de tabelas; alterar sempre que o conteúdo gravado mudar
+VERSAO_CACHE = 2
+
+def _caminho_cache(nome_arquivo_tokens, chave):
+    pasta = os.path.join(os.path.dirname(os.path.abspath(nome_arquivo_tokens)), '__pycache__')
+    nome = os.path.splitext(os.path.basename(nome_arquivo_tokens))[0]
+    return pasta, nome, os.path.join(pasta, f"{nome}.{chave}.marshal")
+
+def _gravar_cache(nome_arquivo_tokens, chave, dados):
+    """Grava o cache de forma atômica e remove os caches de versões anteriores do arquivo."""
+    pasta, nome, caminho = _caminho_cache(nome_arquivo_tokens, chave)
+    try:
+        os.makedirs(pasta, exist_ok=True)
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        with open(temporario, "wb") as file:
+            marshal.dump(dados, file)
+        os.replace(temporario, caminho)
+        for antigo in os.listdir(pasta):
+            if antigo.startswith(nome + ".") and antigo.endswith(".marshal") and os.path.join(pasta, antigo) != caminho:
+                os.remove(os.path.join(pasta, antigo))
+    except OSError:
+        pass  # Sem permissão de escrita: as tabelas continuam válidas, apenas não ficam em cache
+
+# Carrega as tabelas de tokens usando um cache pré-compilado (operadores, palavras
+# reservadas, símbolos, trie de operadores e tabela de tokens de um caractere).
+# O cache é identificado pelo hash (crc32) do conteúdo do arquivo e guarda o próprio
+# conteúdo, conferido na leitura; qualquer alteração em tokens.txt o invalida
+# automaticamente. Retorna o mesmo que ler_tokens.
+def carregar_tabelas(nome_arquivo_tokens=ARQUIVO_TOKENS):
+    try:
+        with open(nome_arquivo_tokens, "r") as file:
+            texto = file.read()
+    except FileNotFoundError:
+        print(f"Erro: Arquivo de tokens '{nome_arquivo_tokens}' não encontrado.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Erro ao carregar os tokens: {str(e)}")
+        sys.exit(1)
+
+    chave = f"{zlib.crc32(texto.encode('utf-8')):08x}"
+    dados = None
+    try:
+        with open(_caminho_cache(nome_arquivo_tokens, chave)[2], "rb") as file:
+            dados = marshal.loads(file.read())
+        if not isinstance(dados, tuple) or len(dados) != 7 or dados[:2] != (VERSAO_CACHE, texto):
+            dados = None
+    except (OSError, EOFError, ValueError, TypeError):
+        dados = None
+
+    if dados is None:
+        operators, reserved_words, symbols = interpretar_tokens(texto.split("\n"))
+        motor = MotorLexico(operators, reserved_words, symbols)
+        dados = (VERSAO_CACHE, texto, operators, reserved_words, symbols, motor.trie, motor.simples)
+        _gravar_cache(nome_arquivo_tokens, chave, dados)
+
+    _, _, operators, reserved_words, symbols, trie, simples = dados
+    # Deixa o motor pronto para obter_motor, sem reconstruir a trie
+    chave_motor = _chave_motor(operators, reserved_words, symbols)
+    if chave_motor not in _motores_construidos:
+        _motores_construidos[chave_motor] = MotorLexico(operators, reserved_words, symbols, trie, simples)
+    return operators, reserved_words, symbols
+
+# Função principal do analisador léxico
+def lexer(source_code, operators, reserved_words, symbols, motor=None):
+    motor = motor or MOTOR_PADRAO
+    if motor == "classico":
+        return lexer_classico(source_code, operators, reserved_words, symbols)
+    if motor == "regex":
+        return obter_motor(operators, reserved_words, symbols).tokenizar(source_code)
+    raise ValueError(f"Motor léxico desconhecido: '{motor}'. Opções: {', '.join(MOTORES)}")
+
+# Executa o analisador léxico guardando os tokens em um BufferTokens compacto; a
+# varredura monta o IndicePosicoes do próprio buffer
+def lexer_compacto(source_code, operators, reserved_words, symbols):
+    buffer = BufferTokens(source_code)
+    varredura = obter_motor(operators, reserved_words, symbols).varrer(
+        source_code, criar_token=buffer.adicionar, posicoes=buffer.posicoes)
+    for _ in varredura:
+        pass
+    return buffer
+
+# Soma delta a todos os valores de coluna[inicio:]
+def _deslocar(coluna, inicio, delta):
+    if delta and inicio < len(coluna):
+        coluna[inicio:] = array(coluna.typecode, [valor + delta for valor in coluna[inicio:]])
+
+# Re-analisa apenas o trecho afetado por uma edição no código de um BufferTokens.
+# A edição remove `removidos` caracteres a partir de `offset` e insere `inseridos`
+# no lugar. A varredura recomeça no início do último token que termina antes da
+# edição (o início de um token nunca está dentro de uma string ou comentário, e a
+# linha e a coluna dele são exatamente o estado do analisador ali) e para assim que
+# um token novo, depois do trecho editado, coincide com um token antigo na mesma
+# posição e coluna. Os tokens seguintes são mantidos, apenas deslocados, e o
+# IndicePosicoes recebe os pontos da nova varredura no lugar dos antigos do trecho.
+# Atualiza o buffer e retorna (primeiro, fim_antigo, fim_novo): os tokens
+# antigos [primeiro, fim_antigo) foram substituídos pelos novos [primeiro, fim_novo).
+def relexar(buffer, offset, removidos, inseridos, operators, reserved_words, symbols):
+    antigo = buffer.source_code
+    if not 0 <= offset <= offset + removidos <= len(antigo):
+        raise ValueError(f"Edição fora do código-fonte: offset={offset}, removidos={removidos}")
+    novo = antigo[:offset] + inseridos + antigo[offset + removidos:]
+    delta = len(inseridos) - removidos
+    fim_edicao = offset + len(inseridos)  # Fim do trecho editado, já no código novo
+
+    inicio, tamanho = buffer.inicio, buffer.tamanho
+    total = len(buffer)
+    # Primeiro token que termina em offset ou depois (e pode ser afetado pela edição)
+    afetado = bisect.bisect_right(inicio, offset)
+    if afetado > 0 and inicio[afetado - 1] + tamanho[afetado - 1] >= offset:
+        afetado -= 1
+    primeiro = afetado - 1 if afetado > 0 else 0
+    posicoes = buffer.posicoes
+    if afetado > 0:
+        estado = (inicio[primeiro], *posicoes.posicao(inicio[primeiro]))
+    else:
+        estado = (0, 1, 0)
+
+    novos = BufferTokens(novo)
+    novos.tipos, novos.ids_tipos = buffer.tipos, buffer.ids_tipos  # Mesma numeração de tipos
+    fim_antigo = total
+    encontro = None  # Posição (no código novo) do primeiro token antigo mantido
+    delta_linha = 0
+    motor = obter_motor(operators, reserved_words, symbols)
+    for _ in motor.varrer(novo, *estado, criar_token=novos.adicionar, posicoes=novos.posicoes):
+        pos = novos.inicio[-1]
+        if pos < fim_edicao:
+            continue
+        # Depois da edição: procura o token antigo que começava na mesma posição do texto
+        m = bisect.bisect_left(inicio, pos - delta, afetado)
+        if m < total and inicio[m] == pos - delta:
+            linha_antiga, coluna_antiga = posicoes.posicao(pos - delta)
+            linha_nova, coluna_nova = novos.posicoes.posicao(pos)
+            if coluna_antiga == coluna_nova:
+                fim_antigo = m
+                encontro = pos
+                delta_linha = linha_nova - linha_antiga
+                novos.remover_ultimo()
+                break
+
+    # Índice: pontos antigos antes do trecho, os da nova varredura até o encontro e os
+    # antigos depois dele, deslocados
+    indice = IndicePosicoes()
+    indice.anexar(posicoes, ultimo=bisect.bisect_left(posicoes.inicios, estado[0]))
+    if encontro is None:
+        indice.anexar(novos.posicoes)
+    else:
+        indice.anexar(novos.posicoes, ultimo=bisect.bisect_right(novos.posicoes.inicios, encontro))
+        indice.anexar(posicoes, delta, delta_linha, bisect.bisect_right(posicoes.inicios, encontro - delta))
+    buffer.posicoes = indice
+
+    fim_novo = primeiro + len(novos)
+    deslocamento = fim_novo - fim_antigo
+    for nome in ("tipo", "inicio", "tamanho"):
+        getattr(buffer, nome)[primeiro:fim_antigo] = getattr(novos, nome)
+    _deslocar(buffer.inicio, fim_novo, delta)
+
+    especiais = {}
+    for indice, lexeme in buffer.lexemas_especiais.items():
+        if indice < primeiro:
+            especiais[indice] = lexeme
+        elif indice >= fim_antigo:
+            especiais[indice + deslocamento] = lexeme
+    for indice, lexeme in novos.lexemas_especiais.items():
+        especiais[primeiro + indice] = lexeme
+    buffer.lexemas_especiais = especiais
+    buffer.source_code = novo
+    return primeiro, fim_antigo, fim_novo
+
+def _esgotar(gerador):
+    """Consome o gerador e retorna o valor que ele retorna ao terminar."""
+    while True:
+        try:
+            next(gerador)
+        except StopIteration as fim:
+            return fim.value
+
+# Converte posições de um trecho decodificado (já com as quebras de linha convertidas)
+# em posições em bytes no arquivo
+class _MapaPosicoes:
+    def __init__(self, bruto, base):
+        self.base = base
+        # Posições (no texto convertido) de cada '\n' que veio de um '\r\n'
+        self.quebras_duplas = []
+        if "\r\n" in bruto:
+            removidos = 0
+            for m in re.finditer("\r\n", bruto):
+                self.quebras_duplas.append(m.start() - removidos)
+                removidos += 1
+        # Posições (no texto bruto) dos caracteres não ASCII e os bytes extras acumulados até eles
+        self.nao_ascii = []
+        self.extras = []
+        if not bruto.isascii():
+            extras = 0
+            for m in re.finditer(r"[^\x00-\x7f]", bruto):
+                extras += len(m.group().encode("utf-8")) - 1
+                self.nao_ascii.append(m.start())
+                self.extras.append(extras)
+        # Trecho ASCII sem '\r\n': a posição em bytes é só base + posição
+        self.direto = not self.quebras_duplas and not self.nao_ascii
+
+    def __call__(self, posicao):
+        bruto = posicao + bisect.bisect_left(self.quebras_duplas, posicao)
+        i = bisect.bisect_left(self.nao_ascii, bruto)
+        return self.base + bruto + (self.extras[i - 1] if i else 0)
+
+# Tamanho (em bytes) de cada trecho do arquivo mapeado decodificado por vez
+TAMANHO_BLOCO_MAPA = 1024 * 1024
+
+# Analisador léxico sobre o arquivo mapeado em memória: decodifica um trecho por vez (o
+# arquivo inteiro nunca é copiado para uma str) e guarda os tokens em um
+# BufferTokensMapeado. Produz os mesmos tokens que main() para arquivos UTF-8.
+def lexer_mapeado(nome_arquivo, operators, reserved_words, symbols, tamanho_bloco=TAMANHO_BLOCO_MAPA):
+    with open(nome_arquivo, "rb") as file:
+        try:
+            mapa = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            mapa = b""  # Arquivo vazio não pode ser mapeado
+    buffer = BufferTokensMapeado(mapa)
+    motor = obter_motor(operators, reserved_words, symbols)
+    total = len(mapa)
+    inicio_bloco = 0
+    line_number, column_number = 1, 0
+    tamanho = tamanho_bloco
+    while True:
+        fim_bloco = min(inicio_bloco + tamanho, total)
+        if fim_bloco < total:
+            # Não corta um caractere UTF-8 nem um '\r\n' ao meio
+            while fim_bloco > inicio_bloco and (mapa[fim_bloco] & 0xC0) == 0x80:
+                fim_bloco -= 1
+            if fim_bloco > inicio_bloco and mapa[fim_bloco - 1] == 0x0D:
+                fim_bloco -= 1
+        final = fim_bloco >= total
+        bruto = mapa[inicio_bloco:fim_bloco].decode("utf-8")
+        texto = bruto.replace("\r\n", "\n").replace("\r", "\n") if "\r" in bruto else bruto
+        posicao = _MapaPosicoes(bruto, inicio_bloco)
+        indice = IndicePosicoes()  # Pontos do trecho, em offsets do texto decodificado
+
+        if posicao.direto:
+            # Byte = inicio_bloco + offset: os pontos do trecho valem para o buffer deslocados
+            def criar_token(type, lexeme, inicio, fim, posicoes):
+                especial = len(lexeme) != fim - inicio or not texto.startswith(lexeme, inicio)
+                buffer.registrar(type, lexeme if especial else None, inicio_bloco + inicio, inicio_bloco + fim)
+        else:
+            # '\r\n' e caracteres não ASCII afastam o byte do offset: cada token confere o seu ponto
+            def criar_token(type, lexeme, inicio, fim, posicoes):
+                especial = len(lexeme) != fim - inicio or not texto.startswith(lexeme, inicio)
+                byte = posicao(inicio)
+                buffer.registrar(type, lexeme if especial else None, byte, posicao(fim))
+                buffer.registrar_posicao(byte, *posicoes.posicao(inicio))
+
+        varredura = motor.varrer(texto, 0, line_number, column_number, final, criar_token, posicoes=indice)
+        index, line_number, column_number = _esgotar(varredura)
+        if posicao.direto:
+            buffer.posicoes.anexar(indice, inicio_bloco)
+        if final:
+            return buffer
+        if index == 0:
+            tamanho *= 2  # Nenhum token coube no trecho (ex: comentário longo): lê um trecho maior
+        else:
+            inicio_bloco = posicao(index)
+            tamanho = tamanho_bloco
+
+# Análise léxica paralela: o código é dividido em trechos que começam logo após uma
+# quebra de linha seguida de um caractere que não é espaço. Quando a varredura passa
+# por um desses pontos fora de strings e comentários, o estado do analisador ali é
+# sempre o mesmo (coluna 1, só a linha muda), então cada trecho pode ser analisado
+# em outro processo a partir da linha 1 e ter as linhas deslocadas na junção. A
+# suposição é conferida na junção: o trecho anterior precisa terminar exatamente no
+# seu fim com a coluna em 1. Quando isso não acontece (uma string ou um comentário
+# atravessa a divisão), os trechos seguintes são unidos a ele e re-analisados no
+# processo principal até voltar a um ponto seguro.
+TAMANHO_MINIMO_TRECHO = 256 * 1024  # Abaixo disso não compensa dividir o código
+_INICIO_SEGURO = re.compile(r"\n(?=\S)")
+
+def _pontos_divisao(source_code, partes):
+    """Retorna as posições onde cada trecho começa, mais o fim do código."""
+    pontos = [0]
+    passo = len(source_code) // partes
+    for k in range(1, partes):
+        m = _INICIO_SEGURO.search(source_code, max(passo * k, pontos[-1]))
+        if m is None:
+            break
+        pontos.append(m.end())
+    pontos.append(len(source_code))
+    return pontos
+
+def _lexar_trecho(tabelas, texto, line_number, column_number, silencioso=True):
+    """Analisa um trecho e retorna (tokens, posicoes, (index, line, column)).
+
+    Os tokens vêm como tuplas (type, lexeme, inicio), e posicoes é o IndicePosicoes do trecho.
+
+    Com silencioso=True, um erro léxico não é exibido e o retorno é None: o erro pode
+    ser só consequência da divisão (uma string que continua no próximo trecho).
+    """
+    tokens = []
+    guardar = tokens.append
+    posicoes = IndicePosicoes()
+    varredura = obter_motor(*tabelas).varrer(
+        texto, 0, line_number, column_number, posicoes=posicoes,
+        criar_token=lambda type, lexeme, inicio, fim, posicoes: guardar((type, lexeme, inicio)))
+    if not silencioso:
+        return tokens, posicoes, _esgotar(varredura)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return tokens, posicoes, _esgotar(varredura)
+    except (SystemExit, Exception):
+        return None
+
+def _trecho_valido(resultado, tamanho, ultimo):
+    """Indica se o trecho foi analisado sem erro e, se não é o último, terminou em um ponto seguro."""
+    if resultado is None:
+        return False
+    index, _, column_number = resultado[2]
+    return ultimo or (index == tamanho and column_number == 1)
+
+# Executa o analisador léxico dividindo o código entre `processos` processos. O
+# resultado é sempre igual ao de lexer() (inclusive as mensagens de erro)
+def lexer_paralelo(source_code, operators, reserved_words, symbols, processos=None):
+    processos = processos or os.cpu_count() or 1
+    partes = min(processos, len(source_code) // TAMANHO_MINIMO_TRECHO)
+    if partes <= 1:
+        return lexer(source_code, operators, reserved_words, symbols)
+    pontos = _pontos_divisao(source_code, partes)
+    total = len(pontos) - 1
+    tabelas = (operators, reserved_words, symbols)
+    tokens = []
+    posicoes = IndicePosicoes()  # Índice do código inteiro, montado com os índices dos trechos
+    with ProcessPoolExecutor(processos - 1) as pool:
+        futuros = [pool.submit(_lexar_trecho, tabelas, source_code[a:b], 1, 1)
+                   for a, b in zip(pontos[1:], pontos[2:])]
+        # O primeiro trecho é analisado aqui mesmo, enquanto o pool cuida dos demais
+        primeiro = _lexar_trecho(tabelas, source_code[:pontos[1]], 1, 0)
+        base = 0  # Linhas antes do trecho atual
+        i = 0
+        while i < total:
+            coluna = 0 if i == 0 else 1
+            resultado = primeiro if i == 0 else futuros[i - 1].result()
+            deslocamento = base
+            j = i + 1
+            while not _trecho_valido(resultado, pontos[j] - pontos[i], j == total):
+                # Re-analisa aqui, já com a linha correta, unindo o próximo trecho. No último,
+                # os erros são exibidos exatamente como na análise sequencial
+                if j < total:
+                    j += 1
+                resultado = _lexar_trecho(tabelas, source_code[pontos[i]:pontos[j]], base + 1, coluna, silencioso=j < total)
+                deslocamento = 0
+            parte, trecho, (_, linha, _) = resultado
+            offset = pontos[i]
+            posicoes.anexar(trecho, offset, deslocamento)
+            tokens.extend([TokenPosicional(type, lexeme, inicio + offset, posicoes) for type, lexeme, inicio in parte])
+            base = linha - 1 + deslocamento
+            i = j
+    return tokens
+
+# Tamanho (em caracteres) de cada bloco lido do arquivo no modo em fluxo
+TAMANHO_BLOCO = 64 * 1024
+
+# Analisador léxico em fluxo: lê o código-fonte em blocos e gera os tokens sob demanda,
+# sem manter o arquivo inteiro nem a lista completa de tokens em memória
+def lexer_em_fluxo(arquivo, operators, reserved_words, symbols, tamanho_bloco=TAMANHO_BLOCO):
+    motor = obter_motor(operators, reserved_words, symbols)
+    buffer = ""
+    index, line_number, column_number = 0, 1, 0
+    while True:
+        bloco = arquivo.read(tamanho_bloco)
+        final = not bloco
+        # Mantém apenas o trecho ainda não consumido (ex: uma string aberta no fim do bloco)
+        buffer = buffer[index:] + bloco
+        index, line_number, column_number = yield from motor.varrer(buffer, 0, line_number, column_number, final)
+        if final:
+            return
+
+# Versão em fluxo de main(): retorna um gerador de tokens do arquivo informado
+def main_em_fluxo(nome_arquivo, tamanho_bloco=TAMANHO_BLOCO):
+    operators, reserved_words, symbols = carregar_tabelas()
+    try:
+        arquivo = open(nome_arquivo, "r")
+    except FileNotFoundError:
+        print(f"Erro: Arquivo '{nome_arquivo}' não encontrado.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Erro ao ler o arquivo: {str(e)}")
+        sys.exit(1)
+
+    def gerar():
+        with arquivo:
+            yield from lexer_em_fluxo(arquivo, operators, reserved_words, symbols, tamanho_bloco)
+    return gerar()
+
 # Função principal que executa o analisador léxico
-def main(nome_arquivo):
-    nome_arquivo_tokens = 'tokens.txt'  # Nome do arquivo com os tokens
+def main(nome_arquivo, motor=None, compacto=False, mapeado=False, processos=None):
+    nome_arquivo_tokens = ARQUIVO_TOKENS  # Nome do arquivo com os tokens
     lista_lexica = []
+    if mapeado:
+        # Com mapeado=True, o arquivo é mapeado em memória em vez de lido para uma str
+        operators, reserved_words, symbols = carregar_tabelas(nome_arquivo_tokens)
+        try:
+            return lexer_mapeado(nome_arquivo, operators, reserved_words, symbols)
+        except FileNotFoundError:
+            print(f"Erro: Arquivo '{nome_arquivo}' não encontrado.")
+            sys.exit(1)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Erro ao ler o arquivo: {str(e)}")
+            sys.exit(1)
     try:
         # Lê o conteúdo do arquivo de código-fonte
         arquivo = ler_arquivo(nome_arquivo)
         # Carrega operadores, palavras reservadas e símbolos do arquivo tokens.txt
-        operators, reserved_words, symbols = ler_tokens(nome_arquivo_tokens)
+        operators, reserved_words, symbols = carregar_tabelas(nome_arquivo_tokens)
+        # Com compacto=True, retorna diretamente o BufferTokens (que também é iterável)
+        if compacto:
+            return lexer_compacto(arquivo, operators, reserved_words, symbols)
         # Executa o analisador léxico e armazena os tokens encontrados
-        tokens_encontrados = lexer(arquivo, operators, reserved_words, symbols)
+        if processos:
+            # Com processos informado, arquivos grandes são divididos entre vários processos
+            tokens_encontrados = lexer_paralelo(arquivo, operators, reserved_words, symbols, processos)
+        else:
+            tokens_encontrados = lexer(arquivo, operators, reserved_words, symbols, motor)
         # Exibe cada token encontrado
         for token in tokens_encontrados:
              lista_lexica.append(token)
+        rastro = rastreio.rastreador("lex")
+        if rastro:
+            for token in lista_lexica:
+                rastro("Token", token=token)
            
     except Exception as e:
         # Exibe erro genérico e interrompe a execução em caso de erro inesperado
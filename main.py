@@ -1,24 +1,40 @@
 import sys
+import compilador
 import lexico
+import rastreio
+import otimizador
 import sintatico
 from interpretador import Interpretador
 
-def main(arquivo):
+def main(arquivo, analisador="descendente", otimizar=False):
     # Análise léxica
     tokens = lexico.main(arquivo)
-    #print("\n--- Lista de Tokens Gerados ---")
-    print(f"🔍 DEBUG: Tokens antes da análise: {tokens}")
-    # Análise sintática
-    codigo_intermediario = sintatico.main(tokens)
-    print("\n🔎 Código Intermediário Gerado:")
-    for instrucao in codigo_intermediario:
-        print(instrucao)
+    # Análise sintática (os tokens e o código intermediário aparecem no rastreamento,
+    # categorias lex e codegen)
+    parser = sintatico.analisar(tokens, analisador)
+    codigo_intermediario = parser.code if parser is not None else []
+    # Verificação de tipos, no código ainda sem otimização (as instruções guardam a
+    # posição do operador no fonte): um erro de tipo encerra a compilação
+    codigo_tipado, erros_tipos = compilador.verificar_tipos(
+        codigo_intermediario, parser.gerador if parser is not None else None)
+    if erros_tipos:
+        for erro in erros_tipos:
+            print(erro)
+        sys.exit(1)
+    # Otimização (o relatório de cada passo aparece no rastreamento, categoria otim)
+    # (o último passo troca as operações de tipos conhecidos pelas operações tipadas;
+    # sem otimização, só essa troca é feita)
+    if otimizar:
+        codigo_intermediario, _ = otimizador.otimizar(codigo_intermediario)
+    else:
+        codigo_intermediario = codigo_tipado
     # Execução
     interpretador = Interpretador(codigo_intermediario)
     interpretador.rodar()
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Uso: python main.py <arquivo.java>")
+    argumentos = rastreio.configurar_de_argumentos(sys.argv[1:])
+    if len(argumentos) < 1:
+        print("Uso: python main.py <arquivo.java> [--ll1] [--otimizar] [--rastreio[=lex,parse,codegen,otim,exec]] [--nivel=debug|info|aviso|erro]")
         sys.exit(1)
-    main(sys.argv[1])
\ No newline at end of file
+    main(argumentos[0], "ll1" if "--ll1" in argumentos[1:] else "descendente", "--otimizar" in argumentos[1:])
\ No newline at end of file
@@ -0,0 +1,1118 @@
+import sys
+import math
+import rastreio
+import tipos
+from grafo import ARITMETICOS, LOGICOS, Grafo, bem_formada, definicao, posicoes_labels, usos
+from interpretador import calcular_aritmetica, comparar
+from tipos import COMPARACOES
+
+# Otimizações sobre o código intermediário (lista de instruções (op, destino, fonte1,
+# fonte2)). Cada passo recebe o código e retorna (código novo, estatísticas), sem alterar
+# a lista recebida. O código otimizado produz a mesma saída no interpretador, inclusive
+# as mensagens de erro das operações inválidas: uma operação só é calculada em tempo de
+# compilação quando o interpretador a executaria sem erro.
+
+# Marca "valor desconhecido em tempo de compilação"
+_DESCONHECIDO = object()
+
+def destinos(codigo):
+    """Nomes que recebem valor em alguma instrução (os demais nunca são variáveis na execução)."""
+    nomes = set()
+    for instrucao in codigo:
+        if not bem_formada(instrucao):
+            continue
+        if instrucao[0] == "CALL":
+            if instrucao[1] == "SCAN":
+                nomes.add(instrucao[3])
+        elif instrucao[0] not in ("IF", "JUMP", "LABEL"):
+            nomes.add(instrucao[1])
+    return nomes
+
+def _constante_valida(valor):
+    # Só números: strings mudam de tipo ao serem lidas de volta, e inf/nan não podem
+    # ser escritos no código intermediário em texto
+    return isinstance(valor, (int, float)) and (not isinstance(valor, float) or math.isfinite(valor))
+
+def _mesma_constante(a, b):
+    # 1, 1.0 e True são valores diferentes para o interpretador, assim como 0.0 e -0.0
+    return type(a) is type(b) and repr(a) == repr(b)
+
+def _valor(operando, valores, variaveis):
+    """Valor do operando como o interpretador o lê (obt_valor), ou _DESCONHECIDO."""
+    if isinstance(operando, (int, float)):
+        return operando if _constante_valida(operando) else _DESCONHECIDO
+    if not isinstance(operando, str):
+        return _DESCONHECIDO  # None ou nó do operador unário
+    if operando in variaveis:
+        return valores.get(operando, _DESCONHECIDO)
+    if operando.startswith('"') and operando.endswith('"'):
+        return _DESCONHECIDO  # String literal
+    try:
+        valor = int(operando)
+    except ValueError:
+        try:
+            valor = float(operando)
+        except ValueError:
+            return _DESCONHECIDO
+    return valor if _constante_valida(valor) else _DESCONHECIDO
+
+def _convertido(operando, valores, variaveis):
+    """Valor de um operando aritmético (converter do interpretador), ou _DESCONHECIDO."""
+    if isinstance(operando, str):
+        try:
+            valor = float(operando) if '.' in operando else int(operando)
+            return valor if _constante_valida(valor) else _DESCONHECIDO
+        except ValueError:
+            pass
+    return _valor(operando, valores, variaveis)
+
+def _calcular(instrucao, valores, variaveis):
+    """Resultado da operação com operandos constantes, ou _DESCONHECIDO (inclusive se daria erro)."""
+    operador, _, op1, op2 = instrucao[:4]
+    if op2 is None:
+        return _DESCONHECIDO
+    if operador in ARITMETICOS:
+        val1 = _convertido(op1, valores, variaveis)
+        val2 = _convertido(op2, valores, variaveis)
+        calcular = calcular_aritmetica
+    elif operador in COMPARACOES:
+        val1 = _valor(op1, valores, variaveis)
+        val2 = _valor(op2, valores, variaveis)
+        calcular = comparar
+    else:
+        return _DESCONHECIDO
+    if val1 is _DESCONHECIDO or val2 is _DESCONHECIDO:
+        return _DESCONHECIDO
+    try:
+        resultado = calcular(operador, val1, val2)
+    except Exception:
+        return _DESCONHECIDO  # O interpretador exibe o erro; a instrução fica como está
+    return resultado if _constante_valida(resultado) else _DESCONHECIDO
+
+def _transferir(instrucao, valores, variaveis):
+    """Atualiza `valores` (variável -> constante) com o efeito da instrução."""
+    operador = instrucao[0]
+    if operador == "=":
+        valor = _valor(instrucao[2], valores, variaveis)
+    elif operador == "CALL":
+        if instrucao[1] == "SCAN":
+            valores.pop(instrucao[3], None)
+        return
+    elif operador in ("IF", "JUMP", "LABEL"):
+        return
+    else:
+        valor = _calcular(instrucao, valores, variaveis)
+    if valor is _DESCONHECIDO:
+        valores.pop(instrucao[1], None)
+    else:
+        valores[instrucao[1]] = valor
+
+def _encontro(entrada, valores):
+    """Mantém em `entrada` só as constantes que também valem em `valores`; indica se mudou."""
+    removidas = [nome for nome, valor in entrada.items()
+                 if nome not in valores or not _mesma_constante(valor, valores[nome])]
+    for nome in removidas:
+        del entrada[nome]
+    return bool(removidas)
+
+def propagar_constantes(codigo):
+    """Propagação de constantes condicional (SCCP) sobre o grafo de fluxo de controle.
+
+    Substitui as leituras de variáveis com valor constante, calcula as operações entre
+    constantes e troca por JUMP os IFs de condição constante. Um bloco só é considerado
+    quando alguma aresta executável chega a ele, então um desvio nunca tomado não
+    estraga as constantes de quem vem depois."""
+    grafo = Grafo(codigo)
+    variaveis = destinos(codigo)
+
+    # Na entrada nenhuma variável tem valor conhecido: ler uma variável ainda não
+    # atribuída tem resultado próprio no interpretador
+    entradas = [None] * len(grafo.blocos)  # None: bloco ainda não alcançado
+    if grafo.blocos:
+        entradas[0] = {}
+    pendentes = [0] if grafo.blocos else []
+    while pendentes:
+        bloco = grafo.blocos[pendentes.pop()]
+        valores = dict(entradas[bloco.indice])
+        for instrucao in grafo.instrucoes(bloco):
+            if bem_formada(instrucao):
+                _transferir(instrucao, valores, variaveis)
+        for sucessor in _executaveis(grafo, bloco, valores, variaveis):
+            if entradas[sucessor] is None:
+                entradas[sucessor] = dict(valores)
+            elif not _encontro(entradas[sucessor], valores):
+                continue
+            if sucessor not in pendentes:
+                pendentes.append(sucessor)
+
+    # Reescrita das instruções dos blocos alcançados
+    estatisticas = {"substituicoes": 0, "dobradas": 0, "desvios": 0}
+    novo = list(codigo)
+    for bloco in grafo.blocos:
+        if entradas[bloco.indice] is None:
+            continue  # Código inalcançável fica para a eliminação de código morto
+        valores = dict(entradas[bloco.indice])
+        for posicao in range(bloco.inicio, bloco.fim):
+            instrucao = codigo[posicao]
+            if not bem_formada(instrucao):
+                continue
+            novo[posicao] = _reescrever(instrucao, valores, variaveis, grafo, estatisticas)
+            _transferir(instrucao, valores, variaveis)
+    return novo, estatisticas
+
+def _executaveis(grafo, bloco, valores, variaveis):
+    """Sucessores de `bloco` que podem executar, considerando a condição do IF final."""
+    ultima = grafo.codigo[bloco.fim - 1]
+    destinos_bloco = grafo.destinos(bloco)
+    if bem_formada(ultima) and ultima[0] == "IF" and destinos_bloco:
+        condicao = _valor(ultima[1], valores, variaveis)
+        if condicao is not _DESCONHECIDO:
+            destinos_bloco = (destinos_bloco[1] if condicao else destinos_bloco[0],)
+    return [d for d in destinos_bloco if d is not None]
+
+def _reescrever(instrucao, valores, variaveis, grafo, estatisticas):
+    operador, destino, op1, op2 = instrucao[:4]
+
+    def substituir(operando):
+        if isinstance(operando, str) and operando in variaveis and operando in valores:
+            estatisticas["substituicoes"] += 1
+            return valores[operando]
+        return operando
+
+    if operador == "=":
+        return ("=", destino, substituir(op1), op2)
+    if operador == "CALL":
+        if destino == "PRINT":
+            return ("CALL", destino, substituir(op1), op2)
+        return instrucao
+    if operador == "IF":
+        condicao = _valor(destino, valores, variaveis)
+        if condicao is _DESCONHECIDO or op1 is None or op2 is None:
+            return instrucao
+        label = op2 if condicao else op1
+        if label not in grafo.labels:
+            return instrucao  # O IF avisa que o label não existe; fica como está
+        estatisticas["desvios"] += 1
+        return ("JUMP", label, None, None)
+    if operador in ("JUMP", "LABEL"):
+        return instrucao
+    resultado = _calcular(instrucao, valores, variaveis)
+    if resultado is not _DESCONHECIDO:
+        estatisticas["dobradas"] += 1
+        return ("=", destino, resultado, None)
+    if operador in ARITMETICOS or operador in COMPARACOES:
+        return (operador, destino, substituir(op1), substituir(op2))
+    return instrucao
+
+def numerar_valores(codigo):
+    """Elimina subexpressões comuns com numeração de valores em cada bloco básico.
+
+    Cada valor do bloco recebe um número. Uma operação já calculada com o mesmo operador
+    sobre os mesmos números, cujo resultado ainda está guardado em alguma variável, vira
+    uma cópia dessa variável. Atribuir a uma variável (inclusive pelo SCAN) lhe dá um
+    número novo, então as expressões com o valor antigo deixam de valer. Um bloco com um
+    único predecessor continua a numeração dele (ex: a condição de um if e o corpo).
+    Só são reaproveitadas as operações que não podem falhar pelos tipos inferidos: uma
+    operação inválida exibiria o erro de novo."""
+    grafo = Grafo(codigo)
+    variaveis = destinos(codigo)
+    entradas = tipos.inferir(grafo, variaveis)
+    novo = list(codigo)
+    contador = iter(range(sys.maxsize))
+    constantes = {}  # (tipo, repr) do operando constante -> número
+    saidas = {}  # Bloco -> (variável -> número, expressão -> número, número -> variáveis)
+    reaproveitadas = 0
+
+    def numero(operando, numeros):
+        if isinstance(operando, str) and operando in variaveis:
+            if operando not in numeros:
+                numeros[operando] = next(contador)
+            return numeros[operando]
+        if operando is None or isinstance(operando, (int, float, str)):
+            return constantes.setdefault((type(operando), repr(operando)), next(contador))
+        return next(contador)  # Nó do operador unário
+
+    for indice in grafo.pos_ordem_reversa():
+        bloco = grafo.blocos[indice]
+        anterior = bloco.predecessores[0] if len(bloco.predecessores) == 1 else None
+        if anterior in saidas:
+            numeros, expressoes, guardados = (dict(tabela) for tabela in saidas[anterior])
+        else:
+            numeros, expressoes, guardados = {}, {}, {}
+        tipos_bloco = dict(entradas[indice])
+
+        def guardar(nome, valor):
+            numeros[nome] = valor
+            guardados[valor] = guardados.get(valor, ()) + (nome,)
+
+        for posicao in range(bloco.inicio, bloco.fim):
+            instrucao = codigo[posicao]
+            if not bem_formada(instrucao):
+                continue
+            operador, destino, op1, op2 = instrucao[:4]
+            if operador == "=":
+                # A cópia só tem o valor da fonte se a leitura de volta não o muda (uma
+                # variável ainda sem valor, None, vira 0; um texto numérico vira número)
+                if (isinstance(op1, str) and op1 in variaveis and tipos_bloco.get(op1) is not None) \
+                        or isinstance(op1, (int, float)) \
+                        or (isinstance(op1, str) and op1 not in variaveis and not op1.startswith('"')):
+                    guardar(destino, numero(op1, numeros))
+                else:
+                    guardar(destino, next(contador))
+            elif operador == "CALL":
+                if destino == "SCAN":
+                    guardar(op2, next(contador))
+            elif operador not in ("IF", "JUMP", "LABEL"):
+                _, falha = tipos.resultado(instrucao, tipos_bloco, variaveis)
+                if falha:
+                    guardar(destino, next(contador))
+                else:
+                    operandos = (numero(op1, numeros), numero(op2, numeros))
+                    if operador in ("+", "*", "==", "!="):
+                        operandos = tuple(sorted(operandos))
+                    chave = (operador,) + operandos
+                    valor = expressoes.get(chave)
+                    guardado = next((nome for nome in guardados.get(valor, ())
+                                     if numeros.get(nome) == valor), None)
+                    if guardado is not None:
+                        novo[posicao] = ("=", destino, guardado, None)
+                        reaproveitadas += 1
+                    else:
+                        valor = expressoes[chave] = next(contador)
+                    guardar(destino, valor)
+            tipos.transferir(instrucao, tipos_bloco, variaveis)
+        saidas[indice] = (numeros, expressoes, guardados)
+    return novo, {"reaproveitadas": reaproveitadas}
+
+class _Edicoes:
+    """Alterações de uma volta de um passo, feitas de uma vez sobre as posições do código."""
+
+    def __init__(self, codigo):
+        self.codigo = codigo
+        self.labels = posicoes_labels(codigo)
+        self.antes = {}  # Posição -> instruções a inserir antes dela
+        self.separados = {}  # Posição (depois de um JUMP) -> pré-cabeçalhos terminados em JUMP
+        self.depois = {}  # Posição -> instruções a inserir depois dela
+        self.trocar = {}  # Posição -> instrução nova
+        self.remover = set()
+        self.redirecionar = {}  # Posição do desvio -> (label antigo, label novo)
+        self._usados = None
+
+    def novo_nome(self, prefixo):
+        """Gera um nome prefixoN (ex: __label3) que nenhuma instrução usa."""
+        if self._usados is None:
+            self._usados = {operando for instrucao in self.codigo if isinstance(instrucao, (tuple, list))
+                            for operando in instrucao[1:4] if isinstance(operando, str)}
+        numero = 0
+        while f"{prefixo}{numero}" in self._usados:
+            numero += 1
+        self._usados.add(f"{prefixo}{numero}")
+        return f"{prefixo}{numero}"
+
+    def pre_cabecalho(self, grafo, cabecalho, corpo, instrucoes):
+        """Põe `instrucoes` em um pré-cabeçalho do laço, executado uma vez antes dele.
+
+        O pré-cabeçalho fica logo antes do cabeçalho quando o bloco anterior está fora
+        do laço; senão (ex: o for, em que o incremento vem antes do corpo) ele vai para
+        depois de um JUMP e termina com um JUMP para o cabeçalho. Os desvios de fora do
+        laço para o cabeçalho passam a ir para o pré-cabeçalho. Retorna False (sem alterar
+        nada) quando não há onde pô-lo."""
+        codigo = self.codigo
+        inicio = grafo.blocos[cabecalho].inicio
+        label = codigo[inicio][1] if _e_label(codigo[inicio]) and self.labels[codigo[inicio][1]] == inicio else None
+        desvios = []  # Desvios de fora do laço para o cabeçalho
+        for predecessor in grafo.blocos[cabecalho].predecessores:
+            posicao = grafo.blocos[predecessor].fim - 1
+            instrucao = codigo[posicao]
+            if predecessor in corpo or label is None or not bem_formada(instrucao):
+                continue
+            if (instrucao[0] == "JUMP" and instrucao[1] == label) \
+                    or (instrucao[0] == "IF" and label in instrucao[2:4]):
+                desvios.append(posicao)
+        anterior = grafo.bloco_da_posicao[inicio - 1] if inicio > 0 else None
+        cai = anterior is not None and not (bem_formada(codigo[inicio - 1]) and codigo[inicio - 1][0] == "JUMP")
+        if cai and anterior in corpo:
+            onde = next((posicao for posicao in range(1, len(codigo) + 1)
+                         if bem_formada(codigo[posicao - 1]) and codigo[posicao - 1][0] == "JUMP"), None)
+            if onde is None or not desvios:
+                return False
+            destino, final = self.separados, [("JUMP", label, None, None)]
+        elif cai or desvios or inicio == 0:
+            onde, destino, final = inicio, self.antes, []
+        else:
+            return False
+        inicial = []
+        if desvios:
+            novo_label = self.novo_nome("__label")
+            inicial = [("LABEL", novo_label, None, None)]
+            for posicao in desvios:
+                self.redirecionar[posicao] = (label, novo_label)
+        destino.setdefault(onde, []).extend(inicial + list(instrucoes) + final)
+        return True
+
+    def aplicar(self):
+        """Código com as alterações."""
+        novo = []
+        for posicao, instrucao in enumerate(self.codigo):
+            novo.extend(self.separados.get(posicao, ()))
+            novo.extend(self.antes.get(posicao, ()))
+            if posicao not in self.remover:
+                instrucao = self.trocar.get(posicao, instrucao)
+                if posicao in self.redirecionar:
+                    antigo, label = self.redirecionar[posicao]
+                    if instrucao[0] == "JUMP":
+                        instrucao = ("JUMP", label) + tuple(instrucao[2:])
+                    else:
+                        instrucao = instrucao[:2] + tuple(label if o == antigo else o for o in instrucao[2:4]) \
+                            + tuple(instrucao[4:])
+                novo.append(instrucao)
+            novo.extend(self.depois.get(posicao, ()))
+        novo.extend(self.separados.get(len(self.codigo), ()))
+        return novo
+
+def mover_invariantes(codigo):
+    """Move as computações invariantes dos laços para um pré-cabeçalho.
+
+    Os laços naturais vêm das voltas do grafo (Grafo.lacos). Uma atribuição ou operação
+    do laço é invariante quando nenhum operando é atribuído dentro do laço (nem por um
+    SCAN), fora por outra instrução invariante já movida. Ela é movida quando é a única
+    atribuição do seu destino no laço, o destino não chega vivo ao cabeçalho (nenhuma
+    leitura do laço vê o valor de antes) e, se o destino é lido depois do laço, o bloco
+    dela domina todas as saídas. As operações que podem falhar pelos tipos inferidos
+    ficam, porque exibiriam o erro outra vez (ou nenhuma). Laços aninhados são tratados
+    de dentro para fora, repetindo até não haver o que mover."""
+    estatisticas = {"lacos": 0, "movidas": 0}
+    while True:
+        grafo = Grafo(codigo)
+        idom = grafo.dominadores()
+        lacos = grafo.lacos(idom)
+        if not estatisticas["lacos"]:
+            estatisticas["lacos"] = len(lacos)
+        variaveis = destinos(codigo)
+        entrada, _ = grafo.vivas()
+        entradas_tipos = tipos.inferir(grafo, variaveis, entrada)
+        ordem = {indice: posicao for posicao, indice in enumerate(grafo.pos_ordem_reversa())}
+        edicoes = _Edicoes(codigo)
+        ocupados = set()  # Blocos dos laços já tratados nesta volta
+        for cabecalho, corpo in sorted(lacos.items(), key=lambda laco: len(laco[1])):
+            if corpo & ocupados:
+                continue  # Laço externo a um já alterado: fica para a próxima volta
+            movidas = _invariantes(grafo, codigo, cabecalho, corpo, idom, entrada, entradas_tipos,
+                                   variaveis, ordem)
+            if movidas and edicoes.pre_cabecalho(grafo, cabecalho, corpo, [codigo[p] for p in movidas]):
+                edicoes.remover.update(movidas)
+                estatisticas["movidas"] += len(movidas)
+                ocupados |= corpo
+        if not edicoes.remover:
+            return codigo, estatisticas
+        codigo = edicoes.aplicar()
+
+def _invariantes(grafo, codigo, cabecalho, corpo, idom, entrada, entradas_tipos, variaveis, ordem):
+    """Posições das instruções do laço que podem ir para o pré-cabeçalho, na ordem em que executam."""
+    atribuicoes = {}
+    for indice in corpo:
+        for instrucao in grafo.instrucoes(grafo.blocos[indice]):
+            nome = definicao(instrucao)
+            if nome is not None:
+                atribuicoes[nome] = atribuicoes.get(nome, 0) + 1
+    saidas = [indice for indice in corpo if any(s not in corpo for s in grafo.blocos[indice].sucessores)]
+    vivas_depois = set()
+    for indice in saidas:
+        for sucessor in grafo.blocos[indice].sucessores:
+            if sucessor not in corpo:
+                vivas_depois |= entrada[sucessor]
+
+    # Tipos antes de cada instrução do laço
+    tipos_antes = {}
+    for indice in corpo:
+        bloco = grafo.blocos[indice]
+        atuais = dict(entradas_tipos[indice])
+        for posicao in range(bloco.inicio, bloco.fim):
+            tipos_antes[posicao] = dict(atuais)
+            if bem_formada(codigo[posicao]):
+                tipos.transferir(codigo[posicao], atuais, variaveis)
+
+    movidas = []
+    invariantes = set()
+    mudou = True
+    while mudou:
+        mudou = False
+        for indice in sorted(corpo, key=ordem.get):
+            bloco = grafo.blocos[indice]
+            for posicao in range(bloco.inicio, bloco.fim):
+                instrucao = codigo[posicao]
+                if posicao in movidas or not bem_formada(instrucao) or len(instrucao) != 4:
+                    continue
+                operador, destino = instrucao[0], instrucao[1]
+                if operador in ("CALL", "IF", "JUMP", "LABEL") or not isinstance(destino, str):
+                    continue
+                if operador != "=" and tipos.resultado(instrucao, tipos_antes[posicao], variaveis)[1]:
+                    continue
+                if atribuicoes[destino] != 1 or destino in entrada[cabecalho]:
+                    continue
+                if any(o in atribuicoes and o not in invariantes for o in usos(instrucao)):
+                    continue
+                if destino in vivas_depois and not all(grafo.domina(idom, indice, s) for s in saidas):
+                    continue
+                movidas.append(posicao)
+                invariantes.add(destino)
+                mudou = True
+    return sorted(movidas, key=lambda posicao: (ordem[grafo.bloco_da_posicao[posicao]], posicao))
+
+def _inteiro(valor):
+    return isinstance(valor, int) and not isinstance(valor, bool)
+
+def reduzir_inducao(codigo):
+    """Variáveis de indução e redução de força nos laços.
+
+    Uma variável de indução básica é uma variável int cuja única atribuição no laço soma
+    ou subtrai uma constante inteira dela mesma (ex: o i += 1 do for, gerado como
+    ('+', t, 'i', 1) seguido de ('=', 'i', t)). Nessa forma, a cópia pelo temporário é
+    desfeita quando ele não é lido depois: a operação passa a atribuir direto à variável.
+    Uma variável de indução derivada é o produto de uma básica por uma constante inteira
+    ou por uma variável int que o laço não altera (ex: i * k): ela passa a ser mantida em
+    um temporário novo, calculado uma vez no pré-cabeçalho e somado do passo (k vezes o
+    incremento de i) logo depois de cada incremento de i, e a multiplicação vira uma
+    cópia dele. Só entram inteiros, cuja soma repetida dá exatamente o produto.
+
+    Uma multiplicação custa no interpretador o mesmo que uma soma; o ganho vem depois:
+    uma variável de indução que só o próprio incremento lê (o contador do for costuma
+    ficar assim, porque a condição só é testada na entrada) e que não é lida depois do
+    laço tem o incremento removido."""
+    estatisticas = {"basicas": 0, "copias": 0, "reduzidas": 0, "eliminadas": 0}
+    primeira = True
+    while True:
+        grafo = Grafo(codigo)
+        idom = grafo.dominadores()
+        lacos = grafo.lacos(idom)
+        variaveis = destinos(codigo)
+        entrada, saida = grafo.vivas()
+        entradas_tipos = tipos.inferir(grafo, variaveis, entrada)
+        if primeira:
+            estatisticas["basicas"] = sum(len(_inducoes_basicas(grafo, codigo, corpo, entradas_tipos[cabecalho]))
+                                          for cabecalho, corpo in lacos.items())
+            primeira = False
+        # Variáveis que podem ser lidas antes de atribuídas precisam de alguma atribuição
+        # '=' no código (ver eliminar_codigo_morto)
+        copias_de = {}
+        for instrucao in codigo:
+            if bem_formada(instrucao) and instrucao[0] == "=":
+                copias_de[instrucao[1]] = copias_de.get(instrucao[1], 0) + 1
+        lidas_antes = entrada[0] if grafo.blocos else set()
+
+        def vivas_depois(posicao):
+            bloco = grafo.blocos[grafo.bloco_da_posicao[posicao]]
+            vivas = set(saida[bloco.indice])
+            for seguinte in range(bloco.fim - 1, posicao, -1):
+                vivas.discard(definicao(codigo[seguinte]))
+                vivas.update(usos(codigo[seguinte]))
+            return vivas
+
+        edicoes = _Edicoes(codigo)
+        ocupados = set()
+        for cabecalho, corpo in sorted(lacos.items(), key=lambda laco: len(laco[1])):
+            if corpo & ocupados:
+                continue  # Laço externo a um já alterado: fica para a próxima volta
+            alteracoes = len(edicoes.trocar) + len(edicoes.remover)
+            basicas = _inducoes_basicas(grafo, codigo, corpo, entradas_tipos[cabecalho])
+            posicoes = [p for indice in sorted(corpo) for p in range(grafo.blocos[indice].inicio, grafo.blocos[indice].fim)]
+            depois_do_laco = set()
+            for indice in corpo:
+                for sucessor in grafo.blocos[indice].sucessores:
+                    if sucessor not in corpo:
+                        depois_do_laco |= entrada[sucessor]
+
+            for nome, (posicao, operacao, passo) in list(basicas.items()):
+                temporario = codigo[posicao][2] if posicao != operacao else None
+                copia_removivel = posicao == operacao or not (nome in lidas_antes and copias_de.get(nome, 0) < 2)
+                # Variável de indução que só o próprio incremento lê (ex: o contador do for
+                # depois da redução das multiplicações): o incremento sai do laço
+                lida = any(nome in usos(codigo[p]) or (temporario is not None and temporario in usos(codigo[p]))
+                           for p in posicoes if p not in (posicao, operacao))
+                if not lida and nome not in depois_do_laco and copia_removivel \
+                        and (temporario is None or temporario not in vivas_depois(posicao)):
+                    edicoes.remover.update((posicao, operacao))
+                    if posicao != operacao:
+                        copias_de[nome] -= 1
+                    del basicas[nome]
+                    estatisticas["eliminadas"] += 1
+                    continue
+                # Cópia do incremento: ('+', t, i, c), ('=', i, t) -> ('+', i, i, c)
+                if posicao == operacao or temporario in vivas_depois(posicao) or not copia_removivel:
+                    continue
+                copias_de[nome] -= 1
+                edicoes.trocar[operacao] = (codigo[operacao][0], nome) + tuple(codigo[operacao][2:4])
+                edicoes.remover.add(posicao)
+                estatisticas["copias"] += 1
+
+            # Multiplicações por variáveis de indução básicas
+            derivadas = {}  # (variável básica, fator) -> temporário que mantém o produto
+            reducoes = []  # (posição do incremento, soma do passo ao produto)
+            multiplicacoes = []  # (posição, cópia do produto)
+            pre_cabecalho = []
+            for indice in sorted(corpo):
+                atuais = dict(entradas_tipos[indice])
+                for posicao in range(grafo.blocos[indice].inicio, grafo.blocos[indice].fim):
+                    instrucao = codigo[posicao]
+                    if not bem_formada(instrucao):
+                        continue
+                    fator = _fator_derivado(instrucao, basicas, corpo, grafo, codigo, atuais, variaveis)
+                    tipos.transferir(instrucao, atuais, variaveis)
+                    if fator is None:
+                        continue
+                    nome, fator = fator
+                    chave = (nome, fator)
+                    if chave not in derivadas:
+                        produto = derivadas[chave] = edicoes.novo_nome("__temp")
+                        pre_cabecalho.append(("*", produto, nome, fator))
+                        incremento = basicas[nome][2]
+                        if _inteiro(fator):
+                            passo = fator * incremento
+                        else:
+                            passo = edicoes.novo_nome("__temp")
+                            pre_cabecalho.append(("*", passo, fator, incremento))
+                        reducoes.append((basicas[nome][0], ("+", produto, produto, passo)))
+                    multiplicacoes.append((posicao, ("=", instrucao[1], derivadas[chave], None)))
+            if derivadas and edicoes.pre_cabecalho(grafo, cabecalho, corpo, pre_cabecalho):
+                for posicao, soma in reducoes:
+                    edicoes.depois.setdefault(posicao, []).append(soma)
+                edicoes.trocar.update(multiplicacoes)
+                estatisticas["reduzidas"] += len(multiplicacoes)
+            if len(edicoes.trocar) + len(edicoes.remover) > alteracoes:
+                ocupados |= corpo
+        if not edicoes.trocar and not edicoes.remover:
+            return codigo, estatisticas
+        codigo = edicoes.aplicar()
+
+def _inducoes_basicas(grafo, codigo, corpo, tipos_cabecalho):
+    """Variável -> (posição da atribuição, posição da soma, incremento com sinal)."""
+    atribuicoes = {}
+    for indice in corpo:
+        for posicao in range(grafo.blocos[indice].inicio, grafo.blocos[indice].fim):
+            nome = definicao(codigo[posicao])
+            if nome is not None:
+                atribuicoes.setdefault(nome, []).append(posicao)
+    basicas = {}
+    for nome, posicoes in atribuicoes.items():
+        if len(posicoes) != 1 or tipos_cabecalho.get(nome) != tipos.INT:
+            continue
+        posicao = operacao = posicoes[0]
+        instrucao = codigo[posicao]
+        if instrucao[0] == "=" and len(instrucao) == 4 and isinstance(instrucao[2], str) and instrucao[2] != nome \
+                and posicao > grafo.blocos[grafo.bloco_da_posicao[posicao]].inicio:
+            operacao = posicao - 1
+        soma = codigo[operacao]
+        if len(soma) != 4 or soma[0] not in ("+", "-") or soma[1] != (nome if operacao == posicao else instrucao[2]):
+            continue
+        if soma[2] == nome and _inteiro(soma[3]):
+            passo = soma[3] if soma[0] == "+" else -soma[3]
+        elif soma[0] == "+" and soma[3] == nome and _inteiro(soma[2]):
+            passo = soma[2]
+        else:
+            continue
+        basicas[nome] = (posicao, operacao, passo)
+    return basicas
+
+def _fator_derivado(instrucao, basicas, corpo, grafo, codigo, tipos_atuais, variaveis):
+    """(variável básica, fator) se a instrução multiplica uma variável de indução básica
+    por uma constante inteira ou por uma variável int que o laço não altera."""
+    if instrucao[0] != "*" or len(instrucao) != 4 or not isinstance(instrucao[1], str) or instrucao[1] in basicas:
+        return None
+    for nome, fator in ((instrucao[2], instrucao[3]), (instrucao[3], instrucao[2])):
+        if not isinstance(nome, str) or nome not in basicas:
+            continue
+        if _inteiro(fator):
+            return nome, fator
+        if isinstance(fator, str) and fator in variaveis and tipos_atuais.get(fator) == tipos.INT \
+                and not any(definicao(codigo[p]) == fator for i in corpo
+                            for p in range(grafo.blocos[i].inicio, grafo.blocos[i].fim)):
+            return nome, fator
+    return None
+
+def _fonte_da_copia(fonte, tipos_atuais, variaveis):
+    """Indica se ler a variável copiada de `fonte` dá o mesmo valor que ler a fonte.
+
+    A cópia guarda o valor lido, que o interpretador converte ao ler de volta: None (uma
+    variável ainda sem valor) vira 0 e um texto numérico vira número."""
+    if fonte is None:
+        return False
+    tipo = tipos.tipo_lido(fonte, tipos_atuais, variaveis)
+    return tipo is not None and tipo == tipos.tipo_guardado(fonte, tipos_atuais, variaveis)
+
+def propagar_copias(codigo):
+    """Propagação de cópias global: as leituras de x depois de ('=', x, f) passam a ler f.
+
+    Uma cópia vale em um ponto quando está em todos os caminhos até ele sem que x ou f
+    recebam outro valor no meio (análise para a frente sobre o grafo, como a dos tipos),
+    e só é propagada se ler f der o mesmo valor que ler x. As cópias que deixam de ser
+    lidas ficam para a eliminação de código morto. Uma cópia do temporário calculado pela
+    instrução anterior, e lido só por ela, não é propagada: a otimização por janela junta
+    as duas em uma instrução."""
+    grafo = Grafo(codigo)
+    estatisticas = {"copias": 0, "substituicoes": 0}
+    if not grafo.blocos:
+        return list(codigo), estatisticas
+    variaveis = destinos(codigo)
+    vivas, _ = grafo.vivas()
+    entradas_tipos = tipos.inferir(grafo, variaveis, vivas)
+    leituras = {}
+    for instrucao in codigo:
+        for nome in set(usos(instrucao)):
+            leituras[nome] = leituras.get(nome, 0) + 1
+
+    def percorrer(bloco, copias, tipos_atuais, novo=None):
+        # Aplica o bloco às cópias válidas (destino -> fonte); com `novo`, reescreve as leituras
+        anterior = None
+        for posicao in range(bloco.inicio, bloco.fim):
+            instrucao = codigo[posicao]
+            if not bem_formada(instrucao):
+                anterior = None
+                continue
+            # Uma instrução que encerra a execução exibe os operandos; essas ficam como estão
+            if len(instrucao) == 4 and copias:
+                operador = instrucao[0]
+                if operador == "IF":
+                    indices = (1,) if instrucao[2] is not None and instrucao[3] is not None else ()
+                elif operador == "CALL":
+                    # O PRINT de um texto pode falhar ao interpretar os escapes
+                    indices = tuple(i for i in (2, 3) if instrucao[1] == "PRINT" and instrucao[i] in copias
+                                    and tipos.tipo_lido(copias[instrucao[i]], tipos_atuais, variaveis)
+                                    != tipos.STRING)
+                elif operador in ("JUMP", "LABEL") or not isinstance(instrucao[1], str):
+                    indices = ()
+                else:
+                    indices = (2,) if operador == "=" else (2, 3)
+                trocas = {i: copias[instrucao[i]] for i in indices
+                          if isinstance(instrucao[i], str) and instrucao[i] in copias}
+                if trocas:
+                    instrucao = tuple(trocas.get(i, o) for i, o in enumerate(instrucao))
+                    if novo is not None:
+                        novo[posicao] = instrucao
+                        estatisticas["substituicoes"] += len(trocas)
+            destino = definicao(instrucao)
+            if destino is not None:
+                copias.pop(destino, None)
+                for nome in [nome for nome, fonte in copias.items() if fonte == destino]:
+                    del copias[nome]
+            if instrucao[0] == "=" and len(instrucao) == 4 and isinstance(destino, str) \
+                    and instrucao[2] != destino and _fonte_da_copia(instrucao[2], tipos_atuais, variaveis):
+                original = codigo[posicao][2]
+                juntavel = anterior is not None and anterior[0] in ARITMETICOS + LOGICOS \
+                    and anterior[1] == original and _temporario(original) and leituras.get(original) == 1
+                if not juntavel:
+                    copias[destino] = instrucao[2]
+                    if novo is not None:
+                        estatisticas["copias"] += 1
+            tipos.transferir(instrucao, tipos_atuais, variaveis)
+            anterior = instrucao
+        return copias
+
+    entradas = [None] * len(grafo.blocos)
+    entradas[0] = {}  # Na entrada nenhuma cópia foi feita
+    pendentes = [0]
+    while pendentes:
+        bloco = grafo.blocos[pendentes.pop()]
+        copias = percorrer(bloco, dict(entradas[bloco.indice]), dict(entradas_tipos[bloco.indice]))
+        for sucessor in bloco.sucessores:
+            entrada = entradas[sucessor]
+            if entrada is None:
+                entradas[sucessor] = {nome: fonte for nome, fonte in copias.items() if nome in vivas[sucessor]}
+            else:
+                diferentes = [nome for nome, fonte in entrada.items() if copias.get(nome) != fonte]
+                if not diferentes:
+                    continue
+                for nome in diferentes:
+                    del entrada[nome]
+            if sucessor not in pendentes:
+                pendentes.append(sucessor)
+
+    novo = list(codigo)
+    for bloco in grafo.blocos:
+        if entradas[bloco.indice] is not None:
+            percorrer(bloco, dict(entradas[bloco.indice]), dict(entradas_tipos[bloco.indice]), novo)
+    return novo, estatisticas
+
+def eliminar_codigo_morto(codigo):
+    """Remove as atribuições mortas, as instruções inalcançáveis e os labels órfãos.
+
+    Uma atribuição '=' é morta quando a variável não é lida antes de ser atribuída de
+    novo (ex: a inicialização da declaração seguida de outra atribuição). As operações
+    ficam, porque podem exibir um erro na execução. Uma variável que pode ser lida antes
+    de qualquer atribuição mantém uma atribuição '=': o interpretador só a cria com None
+    por causa dela. Repete até não haver o que remover; estatisticas["removidas"] é o
+    total."""
+    estatisticas = {"removidas": 0, "mortas": 0, "inalcancaveis": 0, "labels": 0}
+    while True:
+        grafo = Grafo(codigo)
+        alcancaveis = grafo.alcancaveis()
+        entrada, saida = grafo.vivas()
+        remover = {}  # Posição -> motivo (chave de estatisticas)
+        for bloco in grafo.blocos:
+            if not alcancaveis[bloco.indice]:
+                remover.update(dict.fromkeys(range(bloco.inicio, bloco.fim), "inalcancaveis"))
+                continue
+            vivas = set(saida[bloco.indice])
+            for posicao in range(bloco.fim - 1, bloco.inicio - 1, -1):
+                instrucao = codigo[posicao]
+                nome = definicao(instrucao)
+                if instrucao[0] == "=" and nome not in vivas:
+                    remover[posicao] = "mortas"
+                    continue
+                vivas.discard(nome)
+                vivas.update(usos(instrucao))
+
+        lidas_antes = entrada[0] if grafo.blocos else set()
+        atribuicoes = {}
+        for posicao, instrucao in enumerate(codigo):
+            if bem_formada(instrucao) and instrucao[0] == "=" and instrucao[1] in lidas_antes:
+                atribuicoes.setdefault(instrucao[1], []).append(posicao)
+        for posicoes in atribuicoes.values():
+            if all(posicao in remover for posicao in posicoes):
+                del remover[posicoes[0]]
+
+        # Labels que nenhum desvio restante usa (ou repetidos, dos quais só vale o último)
+        usados = set()
+        for posicao, instrucao in enumerate(codigo):
+            if posicao not in remover and bem_formada(instrucao):
+                if instrucao[0] == "JUMP":
+                    usados.add(instrucao[1])
+                elif instrucao[0] == "IF":
+                    usados.update((instrucao[2], instrucao[3]))
+        labels = posicoes_labels(codigo)
+        for posicao, instrucao in enumerate(codigo):
+            if posicao not in remover and bem_formada(instrucao) and instrucao[0] == "LABEL" \
+                    and (instrucao[1] not in usados or labels[instrucao[1]] != posicao):
+                remover[posicao] = "labels"
+
+        if not remover:
+            return codigo, estatisticas
+        for motivo in remover.values():
+            estatisticas[motivo] += 1
+        estatisticas["removidas"] += len(remover)
+        codigo = [instrucao for posicao, instrucao in enumerate(codigo) if posicao not in remover]
+
+def _e_label(instrucao):
+    return bem_formada(instrucao) and instrucao[0] == "LABEL"
+
+def encadear_saltos(codigo):
+    """Une labels seguidos, leva cada desvio ao seu destino final e remove os JUMPs inúteis.
+
+    Labels em sequência passam a ser um só (o primeiro). Um JUMP ou IF para um label
+    seguido de outro JUMP vai direto ao destino deste, e um JUMP para o label logo à frente
+    (pulando só labels) é removido. Os labels que deixam de ser usados saem junto. Cada
+    salto evitado é uma iteração a menos no interpretador. Desvios para labels
+    inexistentes ficam como estão (o IF avisa e segue, o JUMP encerra a execução)."""
+    estatisticas = {"labels_unidos": 0, "redirecionados": 0, "saltos_removidos": 0, "labels_removidos": 0}
+    while True:
+        labels = posicoes_labels(codigo)
+
+        # Labels seguidos valem pelo primeiro do grupo (um label repetido só vale na
+        # última posição; as demais são instruções sem efeito)
+        unido = {}
+        primeiro = None
+        for posicao, instrucao in enumerate(codigo):
+            if not _e_label(instrucao):
+                primeiro = None
+            elif labels[instrucao[1]] == posicao:
+                if primeiro is None:
+                    primeiro = instrucao[1]
+                elif instrucao[1] != primeiro:
+                    unido[instrucao[1]] = primeiro
+
+        def destino_final(label):
+            vistos = set()
+            while label in labels and label not in vistos:
+                vistos.add(label)
+                posicao = labels[label] + 1
+                while posicao < len(codigo) and _e_label(codigo[posicao]):
+                    posicao += 1
+                seguinte = codigo[posicao] if posicao < len(codigo) else None
+                if not (bem_formada(seguinte) and seguinte[0] == "JUMP" and seguinte[1] in labels):
+                    break
+                label = seguinte[1]
+            return unido.get(label, label)
+
+        def redirecionar(label):
+            if label not in labels:
+                return label
+            final = destino_final(label)
+            if final != label:
+                estatisticas["redirecionados"] += 1
+            return final
+
+        novo = []
+        for posicao, instrucao in enumerate(codigo):
+            if bem_formada(instrucao) and instrucao[0] == "JUMP":
+                instrucao = ("JUMP", redirecionar(instrucao[1])) + tuple(instrucao[2:])
+                # JUMP para o label à frente: a execução chega lá de qualquer jeito
+                seguinte = posicao + 1
+                while seguinte < len(codigo) and _e_label(codigo[seguinte]) and labels.get(instrucao[1]) != seguinte:
+                    seguinte += 1
+                if seguinte < len(codigo) and labels.get(instrucao[1]) == seguinte:
+                    estatisticas["saltos_removidos"] += 1
+                    continue
+            elif bem_formada(instrucao) and instrucao[0] == "IF" and instrucao[2] is not None and instrucao[3] is not None:
+                instrucao = (instrucao[0], instrucao[1], redirecionar(instrucao[2]), redirecionar(instrucao[3])) + tuple(instrucao[4:])
+            elif _e_label(instrucao) and instrucao[1] in unido and labels[instrucao[1]] == posicao:
+                estatisticas["labels_unidos"] += 1
+                continue
+            novo.append(instrucao)
+
+        # Labels que nenhum desvio usa mais
+        usados = set()
+        for instrucao in novo:
+            if bem_formada(instrucao) and instrucao[0] == "JUMP":
+                usados.add(instrucao[1])
+            elif bem_formada(instrucao) and instrucao[0] == "IF":
+                usados.update((instrucao[2], instrucao[3]))
+        tamanho = len(novo)
+        novo = [instrucao for instrucao in novo if not _e_label(instrucao) or instrucao[1] in usados]
+        estatisticas["labels_removidos"] += tamanho - len(novo)
+        if novo == codigo:
+            return codigo, estatisticas
+        codigo = novo
+
+# Otimização por janela (peephole): regras locais sobre instruções vizinhas. Cada regra
+# é (nome, tamanho da janela, função); a função recebe a janela (lista de instruções
+# seguidas) e o _ContextoJanela, e retorna a lista de instruções que a substitui, ou None
+# se não se aplica. Quando nenhum elemento da janela além do primeiro é LABEL, cada
+# instrução dela só executa logo depois da anterior.
+
+class _ContextoJanela:
+    """Contagens globais usadas pelas regras, atualizadas a cada substituição."""
+
+    def __init__(self, codigo):
+        self.leituras = {}  # Nome -> instruções que o leem
+        self.copias = {}  # Nome -> atribuições '=' a ele
+        self.labels = {}  # Label -> instruções LABEL com ele
+        self.lidos_por_scan = set()
+        for instrucao in codigo:
+            self.contar(instrucao, 1)
+
+    def contar(self, instrucao, sinal):
+        for nome in set(usos(instrucao)):
+            self.leituras[nome] = self.leituras.get(nome, 0) + sinal
+        if bem_formada(instrucao):
+            if instrucao[0] == "=":
+                self.copias[instrucao[1]] = self.copias.get(instrucao[1], 0) + sinal
+            elif instrucao[0] == "LABEL":
+                self.labels[instrucao[1]] = self.labels.get(instrucao[1], 0) + sinal
+            elif instrucao[0] == "CALL" and instrucao[1] == "SCAN":
+                self.lidos_por_scan.add(instrucao[3])
+
+    def lido_uma_vez(self, nome):
+        """Indica se `nome` é um temporário lido por uma só instrução no código todo."""
+        return _temporario(nome) and self.leituras.get(nome, 0) == 1 and nome not in self.lidos_por_scan
+
+    def copia_dispensavel(self, nome):
+        """Indica se uma atribuição '=' a `nome` pode sumir sem mudar a criação das
+        variáveis (o interpretador cria com None as que recebem algum '=')."""
+        return _temporario(nome) or self.copias.get(nome, 0) > 1
+
+def _e_copia(instrucao):
+    return bem_formada(instrucao) and instrucao[0] == "=" and len(instrucao) == 4 and isinstance(instrucao[1], str)
+
+def _regra_operacao_copia(janela, contexto):
+    # (op, t, a, b), ('=', x, t) -> (op, x, a, b): o resultado vai direto para x
+    operacao, copia = janela
+    if not (bem_formada(operacao) and operacao[0] in ARITMETICOS + LOGICOS and len(operacao) == 4
+            and _e_copia(copia) and copia[2] == operacao[1] and copia[1] != operacao[1]
+            and contexto.lido_uma_vez(operacao[1]) and contexto.copia_dispensavel(copia[1])):
+        return None
+    return [(operacao[0], copia[1], operacao[2], operacao[3])]
+
+def _regra_copia_copia(janela, contexto):
+    # ('=', t, a), ('=', x, t) -> ('=', x, a): ler de volta um valor já lido não o muda
+    primeira, segunda = janela
+    if not (_e_copia(primeira) and _e_copia(segunda) and segunda[2] == primeira[1]
+            and segunda[1] != primeira[1] and contexto.lido_uma_vez(primeira[1])):
+        return None
+    return [("=", segunda[1], primeira[2], None)]
+
+def _regra_copia_condicao(janela, contexto):
+    # ('=', c, v), ('IF', c, ...) -> ('IF', v, ...), se v não pode valer None (o IF
+    # encerraria a execução) nem um texto numérico (a cópia o converteria em número)
+    copia, desvio = janela
+    if not (_e_copia(copia) and bem_formada(desvio) and desvio[0] == "IF" and desvio[1] == copia[1]
+            and contexto.lido_uma_vez(copia[1])):
+        return None
+    fonte = copia[2]
+    if isinstance(fonte, (int, float)) or (_temporario(fonte) and fonte not in contexto.lidos_por_scan):
+        return [("IF", fonte) + tuple(desvio[2:])]
+    return None
+
+def _regra_copia_propria(janela, contexto):
+    # ('=', t, t) de um temporário: guarda de novo o valor que já tinha
+    copia, = janela
+    if _e_copia(copia) and copia[2] == copia[1] and _temporario(copia[1]) \
+            and copia[1] not in contexto.lidos_por_scan:
+        return []
+    return None
+
+def _regra_salto_seguinte(janela, contexto):
+    # ('JUMP', L), ('LABEL', L) -> ('LABEL', L)
+    salto, label = janela
+    if bem_formada(salto) and salto[0] == "JUMP" and _e_label(label) and label[1] == salto[1] \
+            and contexto.labels.get(label[1]) == 1:
+        return [label]
+    return None
+
+def _regra_depois_do_salto(janela, contexto):
+    # ('JUMP', L), X -> ('JUMP', L): X não é LABEL, então nenhuma execução chega a ele
+    salto, instrucao = janela
+    if not (bem_formada(salto) and salto[0] == "JUMP") or _e_label(instrucao):
+        return None
+    if _e_copia(instrucao) and not contexto.copia_dispensavel(instrucao[1]):
+        return None
+    return [salto]
+
+REGRAS_JANELA = (
+    ("operacao_copia", 2, _regra_operacao_copia),
+    ("copia_copia", 2, _regra_copia_copia),
+    ("copia_condicao", 2, _regra_copia_condicao),
+    ("copia_propria", 1, _regra_copia_propria),
+    ("salto_seguinte", 2, _regra_salto_seguinte),
+    ("depois_do_salto", 2, _regra_depois_do_salto),
+)
+
+def otimizar_janela(codigo, regras=REGRAS_JANELA):
+    """Aplica as regras de janela (peephole) até nenhuma se aplicar.
+
+    A janela desliza pelo código: cada instrução entra no fim do código já processado e as
+    regras são tentadas sobre as últimas instruções dele. Uma substituição volta para a
+    entrada junto com as instruções anteriores que caberiam numa janela com ela, para ser
+    examinada de novo. As passadas se repetem enquanto alguma regra se aplicar, porque uma
+    substituição pode habilitar outra mais atrás (ex: um temporário deixa de ser lido em
+    outro lugar). Retorna a contagem de aplicações de cada regra."""
+    estatisticas = {nome: 0 for nome, _, _ in regras}
+    contexto = _ContextoJanela(codigo)
+    recuo = max((tamanho for _, tamanho, _ in regras), default=1) - 1
+    while True:
+        aplicadas = 0
+        entrada = list(reversed(codigo))
+        saida = []
+        while entrada:
+            saida.append(entrada.pop())
+            for nome, tamanho, regra in regras:
+                janela = saida[-tamanho:]
+                if len(janela) < tamanho:
+                    continue
+                substituta = regra(janela, contexto)
+                if substituta is None:
+                    continue
+                for instrucao in janela:
+                    contexto.contar(instrucao, -1)
+                for instrucao in substituta:
+                    contexto.contar(instrucao, 1)
+                del saida[-tamanho:]
+                voltar = saida[len(saida) - min(recuo, len(saida)):] + list(substituta)
+                del saida[len(saida) - min(recuo, len(saida)):]
+                entrada.extend(reversed(voltar))
+                estatisticas[nome] += 1
+                aplicadas += 1
+                break
+        codigo = saida
+        if not aplicadas:
+            return codigo, estatisticas
+
+def _temporario(nome):
+    return isinstance(nome, str) and nome.startswith("__temp")
+
+def reutilizar_temporarios(codigo):
+    """Renomeia os temporários para o menor conjunto de nomes reutilizáveis.
+
+    Dois temporários interferem quando um é atribuído enquanto o outro ainda será lido
+    (está vivo); os que não interferem podem ter o mesmo nome. Cada temporário recebe,
+    na ordem em que aparece, o primeiro nome que nenhum vizinho já usa, então o
+    temp_vars do interpretador fica limitado ao número de valores vivos ao mesmo tempo,
+    e não ao tamanho do programa."""
+    grafo = Grafo(codigo)
+    entrada, saida = grafo.vivas(_temporario)
+    vizinhos = {}  # Temporário -> temporários com que interfere, na ordem em que aparecem
+    for instrucao in codigo:
+        for nome in usos(instrucao) + (definicao(instrucao),):
+            if _temporario(nome):
+                vizinhos.setdefault(nome, set())
+    for bloco in grafo.blocos:
+        vivas = set(saida[bloco.indice])
+        for instrucao in reversed(grafo.instrucoes(bloco)):
+            nome = definicao(instrucao)
+            if _temporario(nome):
+                for outro in vivas:
+                    if outro != nome:
+                        vizinhos[nome].add(outro)
+                        vizinhos[outro].add(nome)
+                vivas.discard(nome)
+            vivas.update(n for n in usos(instrucao) if _temporario(n))
+
+    # Um temporário lido antes de ser atribuído (ou nunca atribuído) dá o próprio nome na
+    # leitura; ele fica com o nome, e nenhum outro o recebe
+    fixos = set(entrada[0]) if grafo.blocos else set()
+    fixos.update(set(vizinhos) - {definicao(instrucao) for instrucao in codigo})
+    novos_nomes = {nome: nome for nome in fixos}
+    for nome in vizinhos:
+        if nome in fixos:
+            continue
+        ocupados = {novos_nomes[v] for v in vizinhos[nome] if v in novos_nomes}
+        posicao = 0
+        while f"__temp{posicao}" in ocupados or f"__temp{posicao}" in fixos:
+            posicao += 1
+        novos_nomes[nome] = f"__temp{posicao}"
+
+    novo = []
+    for instrucao in codigo:
+        if bem_formada(instrucao) and any(o in novos_nomes for o in instrucao[1:4] if isinstance(o, str)):
+            instrucao = (instrucao[0],) + tuple(novos_nomes.get(o, o) if isinstance(o, str) else o
+                                                for o in instrucao[1:4]) + tuple(instrucao[4:])
+        novo.append(instrucao)
+    return novo, {"temporarios": len(vizinhos), "nomes": len(set(novos_nomes.values()))}
+
+def tipar_operacoes(codigo):
+    """Troca as operações de tipos conhecidos pelas operações tipadas (tipos.tipar).
+
+    Fica por último: os outros passos não conhecem as operações tipadas."""
+    novo, anotacoes, erros = tipos.tipar(codigo)
+    tipadas = sum(1 for antiga, instrucao in zip(codigo, novo)
+                  if instrucao is not antiga and instrucao[0] != antiga[0])
+    return novo, {"tipadas": tipadas, "anotadas": sum(tipo is not None for tipo in anotacoes.values()),
+                  "erros": len(erros)}
+
+# Passos aplicados por otimizar(), em ordem (a reutilização dos temporários fica depois
+# dos passos que mudam os usos)
+PASSOS = (
+    ("constantes", propagar_constantes),
+    ("subexpressoes", numerar_valores),
+    ("invariantes", mover_invariantes),
+    ("inducao", reduzir_inducao),
+    ("copias", propagar_copias),
+    ("codigo_morto", eliminar_codigo_morto),
+    ("saltos", encadear_saltos),
+    ("janela", otimizar_janela),
+    ("temporarios", reutilizar_temporarios),
+    ("tipagem", tipar_operacoes),
+)
+
+def otimizar(codigo, passos=PASSOS):
+    """Aplica os passos em ordem e retorna (código otimizado, {passo: estatísticas})."""
+    rastro = rastreio.rastreador("otim", "info")
+    relatorio = {}
+    for nome, passo in passos:
+        codigo, estatisticas = passo(codigo)
+        relatorio[nome] = estatisticas
+        if rastro:
+            rastro(f"Passo '{nome}' concluído", instrucoes=len(codigo), **estatisticas)
+    return codigo, relatorio
+
+if __name__ == "__main__":
+    import lexico
+    import sintatico
+    argumentos = rastreio.configurar_de_argumentos(sys.argv[1:])
+    if not argumentos:
+        print("Uso: python otimizador.py <arquivo.java> [--ll1]")
+        sys.exit(1)
+    analisador = "ll1" if "--ll1" in argumentos[1:] else "descendente"
+    codigo, relatorio = otimizar(sintatico.main(lexico.main(argumentos[0]), analisador=analisador))
+    for instrucao in codigo:
+        print(instrucao)
+    for nome, estatisticas in relatorio.items():
+        print(f"# {nome}: " + ", ".join(f"{chave}={valor}" for chave, valor in estatisticas.items()))
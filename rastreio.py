@@ -0,0 +1,67 @@
+import sys
+
+# Camada única de diagnóstico e rastreamento das fases do compilador. Cada registro é
+# uma linha JSON com a categoria (fase), o nível e a mensagem, mais campos opcionais.
+#
+# Custo zero quando desligado: quem rastreia pede um emissor na construção
+# (ex: self.rastro = rastreio.rastreador("parse")) e cada ponto de rastreamento fica
+# protegido por `if self.rastro:`. Com a categoria desligada o emissor é None, então a
+# mensagem nem chega a ser formatada. A configuração vale para os objetos criados
+# depois dela.
+
+NIVEIS = {"debug": 10, "info": 20, "aviso": 30, "erro": 40}
+CATEGORIAS = ("lex", "parse", "codegen", "otim", "exec")
+
+_minimos = {}  # Categoria ligada -> nível mínimo registrado
+_saida = sys.stderr
+
+def configurar(nivel="debug", categorias=CATEGORIAS, saida=None):
+    """Liga o rastreamento das categorias informadas a partir do nível dado (saída padrão: stderr)."""
+    global _saida
+    if nivel not in NIVEIS:
+        raise ValueError(f"Nível de rastreamento desconhecido: '{nivel}'. Opções: {', '.join(NIVEIS)}")
+    for categoria in categorias:
+        if categoria not in CATEGORIAS:
+            raise ValueError(f"Categoria de rastreamento desconhecida: '{categoria}'. Opções: {', '.join(CATEGORIAS)}")
+        _minimos[categoria] = NIVEIS[nivel]
+    _saida = saida if saida is not None else sys.stderr
+
+def desligar():
+    """Desliga o rastreamento de todas as categorias."""
+    _minimos.clear()
+
+def ativo(categoria, nivel="debug"):
+    minimo = _minimos.get(categoria)
+    return minimo is not None and NIVEIS[nivel] >= minimo
+
+def rastreador(categoria, nivel="debug"):
+    """Retorna emitir(mensagem, **campos) para a categoria e o nível, ou None se estiverem desligados."""
+    if not ativo(categoria, nivel):
+        return None
+    import json  # Só é carregado quando algum rastreamento está ligado
+    saida = _saida
+
+    def emitir(mensagem, **campos):
+        registro = {"categoria": categoria, "nivel": nivel, "mensagem": mensagem}
+        registro.update(campos)
+        # default=str: tokens, nós e instruções aparecem pela sua representação em texto
+        saida.write(json.dumps(registro, ensure_ascii=False, default=str) + "\n")
+    return emitir
+
+def configurar_de_argumentos(argumentos):
+    """Interpreta as opções --rastreio[=cat1,cat2] e --nivel=<nível> e retorna os demais argumentos."""
+    restantes = []
+    categorias = None
+    nivel = "debug"
+    for argumento in argumentos:
+        if argumento == "--rastreio":
+            categorias = CATEGORIAS
+        elif argumento.startswith("--rastreio="):
+            categorias = tuple(c for c in argumento.split("=", 1)[1].split(",") if c)
+        elif argumento.startswith("--nivel="):
+            nivel = argumento.split("=", 1)[1]
+        else:
+            restantes.append(argumento)
+    if categorias is not None:
+        configurar(nivel, categorias)
+    return restantes
@@ -1,96 +1,100 @@
+import arvore  # Árvore sintática compacta (arena de nós)
+import gramatica  # Gerador da tabela LL(1) a partir de javaMM.gmr
+import rastreio  # Rastreamento das fases (desligado por padrão, sem custo)
+import lexico
+from arvore import Arvore, Node
+from geracao import VALORES_INICIAIS, GeradorCodigo  # Geração do código intermediário a partir da árvore
 from lexico import Token  # Importa a classe Token do módulo lexico
 
-class Node:
-    def __init__(self, node_type, children=None, value=None):
-        self.node_type = node_type  # Define o tipo do nó (ex: 'binary_op', 'unary_op', 'literal')
-        self.children = children if children else []  # Lista de filhos
-        self.value = value  # Valor associado ao nó (ex: operadores, identificadores, números)
-
-    def __str__(self):
-        if self.node_type == "binary_op":
-            return f"({self.children[0]} {self.value} {self.children[1]})"
-        elif self.node_type == "unary_op":
-            return f"({self.value} {self.children[0]})"
-        return str(self.value)
-
-
-    def _str_recursive(self, level):
-        # Cria uma string com a indentação apropriada e o tipo e valor do nó
-        ret = "\t" * level + f"{self.node_type}: {self.value if self.value else ''}\n"
-        # Itera sobre os filhos do nó
-        for child in self.children:
-            if isinstance(child, Node):
-                # Se o filho for um Node, chama recursivamente _str_recursive
-                ret += child._str_recursive(level + 1)
-            elif isinstance(child, Token):
-                # Se o filho for um Token, exibe o token diretamente
-                ret += "\t" * (level + 1) + f"Token({child.type}, {child.lexeme})\n"
-            else:
-                # Se o filho for um objeto inesperado, exibe uma mensagem de erro
-                ret += "\t" * (level + 1) + f"Erro: Objeto inesperado {child}\n"
-        return ret
-
-
-
-
 # Classe do Parser (analisador sintático)
 class Parser:
-    def __init__(self, tokens):
-        self.tokens = tokens  # Lista de tokens a serem analisados
+    def __init__(self, tokens, ao_emitir=None, erros=None, gerar=True):
+        self.tokens = tokens  # Lista (ou gerador, no modo em fluxo) de tokens a serem analisados
+        self.fonte = iter(tokens)  # Os tokens são puxados sob demanda
         self.current_index = 0  # Índice atual na lista de tokens
         self.current_token = None  # Token atual sendo analisado
+        # Emissor de rastreamento da análise sintática (None quando desligado)
+        self.rastro = rastreio.rastreador("parse")
+        self.rastro_codigo = rastreio.rastreador("codegen", "info")
         self.next_token()  # Inicializa o primeiro token
-        self.code = []  # Lista para armazenar o código intermediário
-        self.temp_counter = 0  # Contador para variáveis temporárias
-        self.label_counter = 0  # Contador para labels
         self.variaveis = {}  # 🔴 Adicionado: Dicionário para armazenar variáveis
+        # Se informado, recebe cada instrução assim que o comando que a gerou termina;
+        # as instruções entregues não ficam acumuladas em self.code
+        self.ao_emitir = ao_emitir
+        # Se informada, a lista recebe (SyntaxError, token) de cada comando inválido e a
+        # análise continua no próximo comando; sem ela, o primeiro erro interrompe a análise
+        self.erros = erros
+        # Tabela de precedência das expressões (parse_precedencia)
+        self.binarios, self.prefixos = tabela_operadores()
+        # A análise monta a árvore (arena de nós); o código intermediário é gerado a partir
+        # dela, comando a comando do corpo da função, pelo GeradorCodigo. Com gerar=False
+        # só a árvore é montada (geracao.gerar(parser.arvore, raiz) gera o código depois)
+        self.arvore = Arvore()
+        self.gerador = GeradorCodigo(self.arvore)
+        self.code = self.gerador.code  # Lista para armazenar o código intermediário
+        self.gerar = gerar
 
     def gerar_operacao(self, op, destino, fonte1, fonte2=None):
         """Gera operações básicas: '+', '-', '*', '/', '%', '='"""
-        if op not in ('+', '-', '*', '/', '%', '=', '<', '>', '==', '!=', '<=', '>='):
-            raise ValueError(f"Operador '{op}' não suportado")
-        self.code.append((op, destino, fonte1, fonte2))
+        self.gerador.gerar_operacao(op, destino, fonte1, fonte2)
 
    
 
     def next_token(self):
         """Avança para o próximo token na lista."""
-        if self.current_index < len(self.tokens):
-            self.current_token = self.tokens[self.current_index]  # Atualiza o token atual
+        token = next(self.fonte, None)
+        if token is not None:
+            self.current_token = token  # Atualiza o token atual
             self.current_index += 1
-            print(f"➡️ DEBUG: Avançando para próximo token -> {self.current_token}")
+            if self.rastro:
+                self.rastro(f"Avançando para próximo token -> {self.current_token}")
         else:
             self.current_token = None  # Não há mais tokens
-            print("✅ DEBUG: Final da análise alcançado")
+            if self.rastro:
+                self.rastro("Final da análise alcançado")
+
+    def emitir_codigo(self):
+        """Entrega ao consumidor (ao_emitir) as instruções geradas desde a última entrega."""
+        if self.ao_emitir is not None and self.code:
+            self.rastrear_codigo(self.code)
+            for instrucao in self.code:
+                self.ao_emitir(instrucao)
+            self.code.clear()
+            self.gerador.posicoes.clear()
+
+    def rastrear_codigo(self, instrucoes):
+        """Registra as instruções geradas no rastreamento da categoria codegen."""
+        if self.rastro_codigo:
+            for instrucao in instrucoes:
+                self.rastro_codigo("Instrução gerada", instrucao=instrucao)
 
     def match(self, expected_types):
         """Consome o token esperado e avança para o próximo"""
-        print(f"🔍 DEBUG: Tentando consumir {expected_types}, token atual: {self.current_token}")
+        if self.rastro:
+            self.rastro(f"Tentando consumir {expected_types}, token atual: {self.current_token}")
 
         if isinstance(expected_types, list):  # Para casos como ['ASSIGN', 'ADD_ASSIGN'...]
             if self.current_token and self.current_token.type in expected_types:
                 token_atual = self.current_token
                 self.next_token()  # Avança para o próximo token
-                print(f"✅ DEBUG: Consumido corretamente -> {token_atual}")
+                if self.rastro:
+                    self.rastro(f"Consumido corretamente -> {token_atual}")
                 return token_atual
         elif self.current_token and self.current_token.type == expected_types:
             token_atual = self.current_token
             self.next_token()  # Avança para o próximo token
-            print(f"✅ DEBUG: Consumido corretamente -> {token_atual}")
+            if self.rastro:
+                self.rastro(f"Consumido corretamente -> {token_atual}")
             return token_atual
 
         raise SyntaxError(f"Erro de sintaxe: esperado {expected_types}, encontrado {self.current_token}")
 
         
     def generate_temp(self):
-        temp_var = f"__temp{self.temp_counter}"
-        self.temp_counter += 1
-        return temp_var
+        return self.gerador.generate_temp()
 
     def generate_label(self):
-        label = f"__label{self.label_counter}"
-        self.label_counter += 1  # Incrementa ANTES da próxima geração
-        return label
+        return self.gerador.generate_label()
 
     
     def parse_function(self):
@@ -112,8 +116,10 @@ class Parser:
         #print("🔍 Chamando parse_block()...")
         block_node = self.parse_block()  # Analisa o bloco da função
         #print("✅ Bloco da função analisado com sucesso.")
+        if self.ao_emitir is None:
+            self.rastrear_codigo(self.code)
 
-        return Node("function", [type_node, ident_node, block_node])  # Retorna o nó da função
+        return self.arvore.novo(arvore.FUNCAO, ident_node.lexeme, (block_node,))  # Retorna o nó da função
 
 
     def parse_type(self):
@@ -121,7 +127,7 @@ class Parser:
         if self.current_token.type == 'IDENTIFIER' and self.current_token.lexeme in ['int', 'float', 'string']:
             tipo = self.current_token.lexeme
             self.next_token()
-            return Node("type", value=tipo)
+            return tipo
         else:
             raise SyntaxError(f"Tipo esperado: int, float ou string, mas encontrado {self.current_token}")
 
@@ -132,30 +138,72 @@ class Parser:
         self.match('OPEN_BRACE')  # Consome '{'
         #print("✅ Encontrado '{', iniciando stmt_list...")
 
-        stmt_list_node = self.parse_stmt_list()  # Analisa lista de instruções
+        stmt_list = self.parse_stmt_list(principal=True)  # Analisa lista de instruções
         #print("✅ Lista de instruções analisada com sucesso.")
 
         self.match('CLOSE_BRACE')  # Consome '}'
         #print("✅ Encontrado '}', bloco de código finalizado.")
 
-        return Node("block", [stmt_list_node])  # Retorna nó do bloco
+        return self.arvore.novo(arvore.BLOCO, None, stmt_list)  # Retorna nó do bloco
+
 
+    def parse_stmt_list(self, principal=False):
+        """<stmt_list> -> <stmt> <stmt_list> | ε
 
-    def parse_stmt_list(self):
-        """<stmt_list> -> <stmt> <stmt_list> | ε"""
+        Na lista principal (corpo da função), o código de cada comando é gerado assim que
+        ele termina."""
         stmt_list = []
         while self.current_token and self.current_token.type not in ('CLOSE_BRACE', 'EOF'):
             #print(f"🔎 DEBUG: Chamando parse_stmt() para {self.current_token}")  # DEBUG
-            stmt = self.parse_stmt()
+            inicio = len(self.arvore)
+            if self.erros is None:
+                stmt = self.parse_stmt()
+            else:
+                try:
+                    stmt = self.parse_stmt()
+                except SyntaxError as erro:
+                    self.erros.append((erro, self.current_token))
+                    self.arvore.truncar(inicio)  # Descarta os nós do comando inválido
+                    self.sincronizar()
+                    continue
             #print(f"✅ DEBUG: parse_stmt() retornou {stmt}")  # DEBUG
-            if stmt:
+            if not principal:
+                stmt_list.append(stmt)
+                continue
+            if self.gerar:
+                self.gerador.comando(stmt)
+            if self.ao_emitir is None:
                 stmt_list.append(stmt)
+            else:
+                # No modo em fluxo, o código sai comando a comando e a árvore não é acumulada
+                self.emitir_codigo()
+                self.arvore.truncar(inicio)
         return stmt_list
 
    
 
 
 
+    def sincronizar(self):
+        """Recuperação de erro: descarta tokens até depois do ';' ou do bloco '{...}' que
+        encerra o comando inválido, ou até o '}' que fecha o bloco atual."""
+        profundidade = 0
+        while self.current_token is not None:
+            tipo = self.current_token.type
+            if tipo == 'CLOSE_BRACE':
+                if profundidade == 0:
+                    return
+                profundidade -= 1
+                if profundidade == 0:
+                    self.next_token()
+                    return
+            elif tipo == 'OPEN_BRACE':
+                profundidade += 1
+            elif tipo == 'SEMICOLON' and profundidade == 0:
+                self.next_token()
+                return
+            self.next_token()
+
     def parse_stmt(self):
         """<stmt> -> <forStmt> | <ioStmt> | <whileStmt> | <atrib> ';' | <ifStmt> | <bloco> | 'break' | 'continue' | <declaration> | ';'"""
 
@@ -164,49 +212,45 @@ class Parser:
         if self.current_token is None:
             raise SyntaxError("❌ Erro de sintaxe: Token inesperado (EOF encontrado).")
 
-        if self.current_token.type == 'IDENTIFIER' and self.current_token.lexeme in ['int', 'float', 'string']:  # Declaração
-            self.parse_declaration()
-            return "DECLARATION"  # 🔹 Retorna algo válido
+        if self.current_token.type == 'IDENTIFIER':
+            # Palavra reservada: uma única busca no dicionário escolhe o comando
+            # (int, float, string, if, while, for, system, break ou continue)
+            comando = self.COMANDOS.get(self.current_token.lexeme)
+            if comando is not None:
+                return comando(self)
 
         elif self.current_token.type == 'VARIABLE':  # Atribuição
             #print("Chamando parse atrib")
             atrib_node = self.parse_atrib()
             return atrib_node
 
-        elif self.current_token.type == 'IDENTIFIER' and self.current_token.lexeme == 'if':  # Condicional if
-            return self.parse_if_stmt()
-
-        elif self.current_token.type == 'IDENTIFIER' and self.current_token.lexeme == 'while':
-             return self.parse_while_stmt()  # ✅ Agora reconhece 'while'
-
-        elif self.current_token.type == 'IDENTIFIER' and self.current_token.lexeme == 'for':  # Laço for
-            return self.parse_for_stmt()
-
-        elif self.current_token.type == 'IDENTIFIER' and self.current_token.lexeme == 'system':  # Entrada/Saída
-            return self.parse_io_stmt()
-
         elif self.current_token.type == 'OPEN_BRACE':  # Bloco de código '{...}'
             self.match('OPEN_BRACE')
-            stmt_list_node = self.parse_stmt_list()
+            stmt_list = self.parse_stmt_list()
             self.match('CLOSE_BRACE')
-            return stmt_list_node
+            return self.arvore.novo(arvore.BLOCO, None, stmt_list)
 
-        elif self.current_token.type == 'IDENTIFIER' and self.current_token.lexeme == 'break':  # Break
-            self.match('IDENTIFIER')
+        elif self.current_token.type == 'SEMICOLON':  # Apenas um ';' (vazio)
             self.match('SEMICOLON')
-            return Node("break")
+            return self.arvore.novo(arvore.VAZIO)
 
-        elif self.current_token.type == 'IDENTIFIER' and self.current_token.lexeme == 'continue':  # Continue
-            self.match('IDENTIFIER')
-            self.match('SEMICOLON')
-            return Node("continue")
+        raise SyntaxError(f"❌ Erro de sintaxe: Token inesperado '{self.current_token.lexeme}' na linha {self.current_token.line}")
 
-        elif self.current_token.type == 'SEMICOLON':  # Apenas um ';' (vazio)
-            self.match('SEMICOLON')
-            return Node("empty")
+    def parse_declaration_stmt(self):
+        """<stmt> -> <declaration>"""
+        return self.parse_declaration()
 
-        else:
-            raise SyntaxError(f"❌ Erro de sintaxe: Token inesperado '{self.current_token.lexeme}' na linha {self.current_token.line}")
+    def parse_break_stmt(self):
+        """<stmt> -> 'break' ';'"""
+        self.match('IDENTIFIER')
+        self.match('SEMICOLON')
+        return self.arvore.novo(arvore.PARE)
+
+    def parse_continue_stmt(self):
+        """<stmt> -> 'continue' ';'"""
+        self.match('IDENTIFIER')
+        self.match('SEMICOLON')
+        return self.arvore.novo(arvore.CONTINUE)
 
 
 
@@ -222,16 +266,8 @@ class Parser:
         if not vars_declaradas:  # Verifica se a lista está vazia
             raise SyntaxError("❌ Erro: Nenhuma variável foi declarada.")
 
-        for var in vars_declaradas:
-            if tipo == 'int':
-                self.code.append(("=", var, "0", None))
-            elif tipo == 'float':
-                self.code.append(("=", var, "0.0", None))
-            elif tipo == 'string':
-                self.code.append(("=", var, '""', None))  # Usar aspas duplas
-
         #print(f"✅ DEBUG: Declaração processada -> {tipo} {vars_declaradas}")
-        return vars_declaradas
+        return self.arvore.novo(arvore.DECLARACAO, tipo, vars_declaradas)
 
 
 
@@ -241,68 +277,38 @@ class Parser:
         ident_list = []  # Inicializa uma lista vazia para armazenar os identificadores
         
         ident = self.match('VARIABLE').lexeme  # Obtém o primeiro identificador
-        ident_list.append(ident)
+        ident_list.append(self.arvore.novo(arvore.NOME, ident))
 
         while self.current_token.type == 'COMMA':  # Se houver mais variáveis separadas por vírgula
             self.match('COMMA')
             ident = self.match('VARIABLE').lexeme
-            ident_list.append(ident)
+            ident_list.append(self.arvore.novo(arvore.NOME, ident))
 
         #print(f"✅ DEBUG: Lista de identificadores reconhecidos -> {ident_list}")
-        return ident_list  # Retorna uma lista de variáveis, não um Node
+        return ident_list  # Retorna a lista dos nós NOME
 
 
         
 
-    def parse_resto_ident_list(self):
-        """<restoIdentList> -> ',' 'IDENT' <restoIdentList> | &"""
-        if self.current_token.type == 'COMMA':
-            self.next_token()  # Consome ','
-            if self.current_token.type == 'VARIABLE':
-                ident_node = Node("identifier", value=self.current_token.lexeme)
-                self.next_token()  # Consome o identificador
-                resto_node = self.parse_resto_ident_list()  # Analisa o resto da lista
-                return Node("resto_ident_list", [ident_node, resto_node])
-            else:
-                raise SyntaxError(f"Erro de sintaxe: IDENT esperado após ',' mas encontrado {self.current_token}")
-        else:
-            return Node("empty")  # Produção vazia
-
-
     def parse_for_stmt(self):
-        label_start = self.generate_label()  # Label para início do loop
-        label_body = self.generate_label()   # Label para o corpo do loop
-        label_end = self.generate_label()    # Label para sair do loop
-
+        """<forStmt> -> 'for' '(' <optAtrib> ';' <expr> ';' <optAtrib> ')' <stmt>"""
         # 1. Inicialização
         self.match('IDENTIFIER')  # 'for'
         self.match('OPEN_PAREN')
-        self.parse_opt_atrib()  # Ex: i = 0
+        inicializacao = self.parse_opt_atrib()  # Ex: i = 0
         self.match('SEMICOLON')
 
         # 2. Condição
-        self.code.append(("LABEL", label_start, None, None))
-        temp_cond = self.generate_temp()
         cond_node = self.parse_expr()  # Processa a condição
-        self.gerar_operacao('=', temp_cond, cond_node, None)
         self.match('SEMICOLON')
 
-        # 3. Se condição falsa, pula para o fim
-        self.code.append(("IF", temp_cond, label_end, label_body))  # Corrigir labels
-
-        # 4. Incremento (armazenar em uma label separada)
-        incremento_label = self.generate_label()
-        self.code.append(("LABEL", incremento_label, None, None))
+        # 3. Incremento
         incremento = self.parse_opt_atrib()  # Ex: i += 1
         self.match('CLOSE_PAREN')
 
-        # 5. Corpo do loop
-        self.code.append(("LABEL", label_body, None, None))
-        self.parse_stmt()
-
-        # 6. Voltar para o incremento e depois verificar a condição
-        self.code.append(("JUMP", incremento_label, None, None))
-        self.code.append(("LABEL", label_end, None, None))
+        # 4. Corpo do loop
+        corpo = self.parse_stmt()
+        return self.arvore.novo(arvore.PARA, None, (inicializacao, cond_node, incremento, corpo))
 
 
 
@@ -310,19 +316,22 @@ class Parser:
 
     def parse_opt_atrib(self):
         """Processa atribuições opcionais dentro do `for`."""
-        print(f"🔍 DEBUG: Entrando em parse_opt_atrib(), token atual: {self.current_token}")
+        if self.rastro:
+            self.rastro(f"Entrando em parse_opt_atrib(), token atual: {self.current_token}")
 
         if self.current_token and self.current_token.type == 'VARIABLE':
             atrib = self.parse_atrib()
-            print(f"✅ DEBUG: Atribuição reconhecida -> {atrib}")
+            if self.rastro:
+                self.rastro(f"Atribuição reconhecida -> {atrib}")
 
             # ⚠️ **REMOVA O CONSUMO DE `;` AQUI!**
             return atrib
 
         elif self.current_token and self.current_token.type == 'SEMICOLON':
-            # ⚠️ **RETORNE `None`, mas não consuma `;` aqui!**
-            print("✅ DEBUG: Nenhuma atribuição encontrada, retornando `None`.")
-            return None
+            # ⚠️ **RETORNE um nó vazio, mas não consuma `;` aqui!**
+            if self.rastro:
+                self.rastro("Nenhuma atribuição encontrada, retornando nó vazio.")
+            return self.arvore.novo(arvore.VAZIO)
 
         else:
             raise SyntaxError(f"Erro de sintaxe: esperado atribuição ou `;`, encontrado {self.current_token}")
@@ -332,16 +341,19 @@ class Parser:
 
     def parse_opt_expr(self):
         """<optExpr> -> <expr> & ;"""
-        print(f"🔍 DEBUG: Entrando em parse_opt_expr(), token atual: {self.current_token}")
+        if self.rastro:
+            self.rastro(f"Entrando em parse_opt_expr(), token atual: {self.current_token}")
 
         # Se houver uma expressão (variável ou número inicial), processamos
         if self.current_token and self.current_token.type in ['VARIABLE', 'DECIMAL_INT', 'FLOAT', 'STRING']:
             expr = self.parse_expr()  # Essa chamada precisa processar toda a expressão, não só um token
-            print(f"✅ DEBUG: Expressão reconhecida -> {expr}")
+            if self.rastro:
+                self.rastro(f"Expressão reconhecida -> {expr}")
 
             # Agora, verificamos se o próximo token é um `;`
             if self.current_token and self.current_token.type == 'SEMICOLON':
-                print(f"✅ DEBUG: `;` encontrado após expressão -> {self.current_token}")
+                if self.rastro:
+                    self.rastro(f"`;` encontrado após expressão -> {self.current_token}")
                 self.match('SEMICOLON')
             else:
                 raise SyntaxError(f"❌ ERRO: `;` esperado após expressão, encontrado {self.current_token}")
@@ -350,12 +362,14 @@ class Parser:
 
         # Se não houver expressão, apenas consumir `;`
         elif self.current_token and self.current_token.type == 'SEMICOLON':
-            print("✅ DEBUG: Nenhuma expressão encontrada, apenas `;` consumido.")
+            if self.rastro:
+                self.rastro("Nenhuma expressão encontrada, apenas `;` consumido.")
             self.match('SEMICOLON')
             return None
 
         else:
-            print(f"❌ ERRO: Expressão inválida encontrada -> {self.current_token}")
+            if self.rastro:
+                self.rastro(f"Expressão inválida encontrada -> {self.current_token}")
             raise SyntaxError(f"Erro de sintaxe: esperado expressão ou `;`, encontrado {self.current_token}")
 
 
@@ -380,33 +394,34 @@ class Parser:
             var_name = self.match('VARIABLE').lexeme  # Nome da variável
             self.match('CLOSE_PAREN')
             self.match('SEMICOLON')
-            self.code.append(("CALL", "SCAN", tipo, var_name))  # ✅ Mantém a estrutura antiga de I/O
+            return self.arvore.novo(arvore.LEITURA, tipo, (self.arvore.novo(arvore.NOME, var_name),))
 
         elif io_type == 'out' and io_action == 'print':
             output_list = self.parse_out_list()
             self.match('CLOSE_PAREN')
             self.match('SEMICOLON')
-
-            for item in output_list:
-                self.code.append(("CALL", "PRINT", item, None))  # ✅ Mantém a estrutura antiga de I/O
+            return self.arvore.novo(arvore.ESCRITA, None, output_list)
 
         else:
             raise SyntaxError(f"❌ Erro de sintaxe: I/O inválido '{io_type}.{io_action}'")
 
     def parse_out_list(self):
         """<outList> -> <out> <restoOutList>"""
-        print("🔍 DEBUG: Entrando em parse_out_list()")  # ✅ Confirma a entrada
+        if self.rastro:
+            self.rastro("Entrando em parse_out_list()")
 
         output_list = []
 
         # 📌 CHAMADA OBRIGATÓRIA de parse_out()
         out_value = self.parse_out()
-        print(f"✅ DEBUG: parse_out() retornou -> {out_value}")  # 🔍 Confirma retorno
+        if self.rastro:
+            self.rastro(f"parse_out() retornou -> {out_value}")
         output_list.append(out_value)
 
         # 📌 CHAMADA OBRIGATÓRIA de parse_resto_out_list()
         resto_out_values = self.parse_resto_out_list()
-        print(f"✅ DEBUG: parse_resto_out_list() retornou -> {resto_out_values}")  # 🔍 Confirma retorno
+        if self.rastro:
+            self.rastro(f"parse_resto_out_list() retornou -> {resto_out_values}")
 
         output_list.extend(resto_out_values)
         
@@ -419,14 +434,16 @@ class Parser:
 
     def parse_out(self):
         """<out> -> 'STR' | 'IDENT' | 'NUMdec' | 'NUMfloat' | 'NUMoct' | 'NUMhex'"""
-        print("🔍 DEBUG: Entrando em parse_out()")  # Confirma entrada
+        if self.rastro:
+            self.rastro("Entrando em parse_out()")
 
         token_tipo = self.current_token.type
 
         if token_tipo in ('STRING', 'VARIABLE', 'DECIMAL_INT', 'FLOAT', 'OCTAL_INT', 'HEXADECIMAL_INT'):
             valor = self.match(token_tipo).lexeme
-            print(f"✅ DEBUG: parse_out() reconheceu -> {valor}")  # Confirma saída
-            return valor.replace("'", '"')
+            if self.rastro:
+                self.rastro(f"parse_out() reconheceu -> {valor}")
+            return self.arvore.novo(arvore.LITERAL, valor.replace("'", '"'))
         elif token_tipo == 'STRING':
             return f'"{valor}"'
         else:
@@ -448,29 +465,14 @@ class Parser:
         """<whileStmt> -> 'while' '(' <expr> ')' <stmt>"""
         self.match('IDENTIFIER')  # Consome 'while'
         self.match('OPEN_PAREN')
-        label_start = self.generate_label()  # Label de INÍCIO do loop
-        label_end = self.generate_label()    # Label de SAÍDA do loop
-
-        self.code.append(("LABEL", label_start, None, None))  # Marca o início do while
 
-        # Avalia a condição do while
+        # Condição do while
         condition_node = self.parse_expr()
-        temp_cond = self.generate_temp()
-        self.gerar_operacao('=', temp_cond, condition_node, None)
-
         self.match('CLOSE_PAREN')
-        
-        # ✅ Se a condição for FALSA, pula para o FIM
-        self.code.append(("IF", temp_cond, label_end, label_start))  # Alterado
 
         # Corpo do loop
-        self.parse_stmt()
-
-        # Volta para a avaliação da condição
-        self.code.append(("JUMP", label_start, None, None))
-
-        # Define o rótulo de saída do while
-        self.code.append(("LABEL", label_end, None, None))
+        corpo = self.parse_stmt()
+        return self.arvore.novo(arvore.ENQUANTO, None, (condition_node, corpo))
 
 
     def parse_if_stmt(self):
@@ -480,271 +482,84 @@ class Parser:
 
         # Processa a condição
         condition_node = self.parse_expr()
-        temp_cond = self.generate_temp()
-        self.gerar_operacao('=', temp_cond, condition_node, None)
-
         self.match('CLOSE_PAREN')
 
-        # ✅ Gera e define labels ANTES do IF
-        label_else = self.generate_label()
-        label_end = self.generate_label()
-    
-
-        # ✅ Ajuste na ordem: IF usa labels já definidas
-        self.code.append(("IF", temp_cond, label_else, label_end)) 
-
         # Processa bloco do IF
-        self.parse_stmt()
-
-        # Pula para o fim
-        self.code.append(("JUMP", label_end, None, None))
+        partes = [condition_node, self.parse_stmt()]
 
         # Processa else se existir
         if self.current_token and self.current_token.lexeme == 'else':
             self.match('IDENTIFIER')
-            self.parse_stmt()
-
-        # Define label do fim
-        self.code.append(("LABEL", label_end, None, None))
-
-    def parse_else_part(self, label_else):
-        """<elsePart> -> 'else' <stmt> | & ;"""
-        
-        if self.current_token and self.current_token.lexeme == 'else':
-            print(f"✅ DEBUG: 'else' encontrado, processando bloco ELSE...")
-            self.match('IDENTIFIER')  # Consome 'else'
-            self.code.append(("LABEL", label_else, None, None))  # Define a label do else
-            self.parse_stmt()  # Processa o bloco do else
-        else:
-            # Se não houver 'else', a label_else ainda precisa ser registrada para evitar erros
-            self.code.append(("LABEL", label_else, None, None))
+            partes.append(self.parse_stmt())
 
-
-
-
-
-
-    def extract_expression(self, node):
-        """Converte um nó da AST para uma string de expressão"""
-        if node is None:
-            return ""
-
-        if isinstance(node, Node):
-            if node.node_type == "binary_op":
-                left = self.extract_expression(node.children[0])
-                right = self.extract_expression(node.children[1])
-                return f"{left} {node.value} {right}"
-            elif node.node_type == "unary_op":
-                operand = self.extract_expression(node.children[0])
-                return f"{node.value} {operand}"
-            elif node.node_type in ["variable", "literal", "temp_var"]:
-                return str(node.value)
-            else:
-                return f"<Erro: Tipo de nó desconhecido {node.node_type}>"
-
-        return str(node)  # Caso já seja um valor simples
+        return self.arvore.novo(arvore.SE, None, partes)
 
     def parse_atrib(self):
         """<atrib> -> 'IDENT' '=' <expr> | 'IDENT' ('+=' | '-=' | '*=' | '/=' | '%=') <expr>"""
-        print(f"🔍 DEBUG: Entrando em parse_atrib(), token atual: {self.current_token}")
+        if self.rastro:
+            self.rastro(f"Entrando em parse_atrib(), token atual: {self.current_token}")
 
         ident = self.match('VARIABLE').lexeme
-        print(f"🔍 DEBUG: Identificador reconhecido -> {ident}")
+        if self.rastro:
+            self.rastro(f"Identificador reconhecido -> {ident}")
 
-        operador = self.match(['ASSIGN', 'ADD_ASSIGN', 'SUB_ASSIGN', 'MUL_ASSIGN', 'DIV_ASSIGN', 'MOD_ASSIGN']).lexeme
-        print(f"🔍 DEBUG: Operador de atribuição reconhecido -> {operador}")
+        token_operador = self.match(['ASSIGN', 'ADD_ASSIGN', 'SUB_ASSIGN', 'MUL_ASSIGN', 'DIV_ASSIGN', 'MOD_ASSIGN'])
+        operador = token_operador.lexeme
+        if self.rastro:
+            self.rastro(f"Operador de atribuição reconhecido -> {operador}")
 
         # Processa a expressão à direita do operador
         expr_node = self.parse_expr()
 
-        # Gera código intermediário para operadores compostos (ex: +=, -=)
-        if operador != '=':
-            temp_var = self.generate_temp()
-            self.gerar_operacao(operador[0], temp_var, ident, expr_node)  # operador[0] é '+', '-', etc.
-            self.gerar_operacao('=', ident, temp_var, None)
-        else:
-                if isinstance(expr_node, (int, float, str)):
-                    temp_var = self.generate_temp()
-                    self.gerar_operacao("=", temp_var, expr_node, None)
-                    expr_node = temp_var
-                self.gerar_operacao(operador, ident, expr_node, None)
-
-
-        return Node("atrib", [ident, expr_node])
-
-
-    def parse_term(self):
-        """<term> -> <factor> ('*' | '/' | '%') <factor>*"""
-        left_node = self.parse_factor()
-
-        while self.current_token and self.current_token.type in ['MUL', 'DIV', 'MOD']:
-            operator = self.current_token.lexeme
-            self.next_token()
-            right_node = self.parse_factor()
-            temp_var = self.generate_temp()
-
-            #print(f"✅ DEBUG: Operação detectada: {left_node} {operator} {right_node} -> armazenado em {temp_var}")  # Debug print
-            self.code.append((operator, temp_var, left_node.value, right_node.value))
-            left_node = Node("binary_op", [left_node, right_node], temp_var)
+        return self.arvore.novo(arvore.ATRIBUICAO, operador, (self.arvore.novo(arvore.NOME, ident), expr_node),
+                                token_operador)
 
-        return left_node
 
     def parse_expr(self):
         """<expr> -> <or>"""
-        print(f"🔍 DEBUG: Entrando em parse_expr(), token atual: {self.current_token}")
-        resultado = self.parse_or()
-        print(f"✅ DEBUG: parse_expr() retornou -> {resultado}")
+        if self.rastro:
+            self.rastro(f"Entrando em parse_expr(), token atual: {self.current_token}")
+        resultado = self.parse_precedencia(1)[0]
+        if self.rastro:
+            self.rastro(f"parse_expr() retornou -> {self.arvore.formatar(resultado)}")
         return resultado
-    
-
-    def parse_or(self):
-        """<or> -> <and> <restoOr>"""
-        print("🔍 DEBUG: Entrando em parse_or()")
-        left = self.parse_and()
-        return self.parse_resto_or(left)
-
-    def parse_resto_or(self, left):
-        """<restoOr> -> '||' <and> <restoOr> | &"""
-        while self.current_token.type == 'OR':
-            operador = self.match('OR').lexeme
-            right = self.parse_and()
-            temp_var = self.gerar_temp()
-            self.code.append((operador, temp_var, left, right))
-            left = temp_var
-        return left
-
-
-
-
-    def parse_and(self):
-        """<and> -> <not> <restoAnd>"""
-        print("🔍 DEBUG: Entrando em parse_and()")
-        left = self.parse_not()
-        return self.parse_resto_and(left)
-
-    def parse_resto_and(self, left):
-        """<restoAnd> -> '&&' <not> <restoAnd> | &"""
-        while self.current_token.type == 'AND':
-            operador = self.match('AND').lexeme
-            right = self.parse_not()
-            temp_var = self.gerar_temp()
-            self.code.append((operador, temp_var, left, right))
-            left = temp_var
-        return left
-
-
-
-
-    def parse_not(self):
-        """<not> -> '!' <not> | <rel>"""
-        print(f"Processando NOT, token atual: {self.current_token}")
-        if self.current_token and self.current_token.type == 'LOGICAL_NOT':
-            operator_token = self.current_token
-            self.next_token()  
-            not_node = self.parse_not()  
-            return Node("unary_op", [not_node], operator_token.lexeme)  
-
-        return self.parse_rel()  # Passa para o próximo nível
-
-
-    def parse_rel(self):
-        left = self.parse_add()
-        if self.current_token.type in ['EQUAL', 'NOT_EQUAL', 'GREATER', 'LESS', 'GREATER_EQUAL', 'LESS_EQUAL']:
-            operador = self.match(self.current_token.type).lexeme
-            right = self.parse_add()
-            
-            # ✅ Remova a verificação de tipo estática
-            temp_var = self.generate_temp()
-            self.code.append((operador, temp_var, left, right))
-            return temp_var
-        return left
-
-    def parse_resto_rel(self, left):
-        """<restoRel> -> ('==' | '!=' | '<' | '<=' | '>' | '>=') <add> | &"""
-        operadores_relacionais = {'EQUAL', 'NOT_EQUAL', 'GREATER', 'GREATER_EQUAL', 'LESS', 'LESS_EQUAL'}
-        print(f"🔍 DEBUG: Token atual em parse_resto_rel: {self.current_token}")  # DEBUG ADICIONADO
-        
-        if self.current_token and self.current_token.type in operadores_relacionais:
-            operador = self.match(self.current_token.type).lexeme
-            print(f"✅ DEBUG: Operador relacional reconhecido -> {operador}")  # DEBUG ADICIONADO
-            right = self.parse_add()
-            temp_var = self.generate_temp()
-            self.code.append((operador, temp_var, left, right))
-            return temp_var
-        
-        print(f"✅ DEBUG: Nenhum operador relacional encontrado. Token atual: {self.current_token}")  # DEBUG ADICIONADO
-        return left
-
-
 
-    def parse_add(self):
-        """<add> -> <mult> <restoAdd>"""
-        print(f"🔍 DEBUG: Entrando em parse_add(), token atual: {self.current_token}")
-        left = self.parse_mult()
-        print(f"✅ DEBUG: parse_add() reconheceu primeiro termo -> {left}")
-        return self.parse_resto_add(left)
-
-    def parse_resto_add(self, left):
-        """<restoAdd> -> '+' <mult> <restoAdd> | '-' <mult> <restoAdd> | &"""
-        print(f"🔍 DEBUG: Entrando em parse_resto_add(), token atual: {self.current_token}")
-
-        while self.current_token and self.current_token.type in ('ADD', 'SUB'):
-            print(f"🔎 DEBUG: Esperado operador '+' ou '-', encontrado -> {self.current_token}")
-
-            operador = self.match(self.current_token.type).lexeme  # Consome '+' ou '-'
-            print(f"✅ DEBUG: parse_resto_add() reconheceu operador -> {operador}")
-
-            right = self.parse_mult()  # Obtém o próximo termo da multiplicação
-            print(f"✅ DEBUG: parse_resto_add() reconheceu segundo termo -> {right}")
-
-            temp_var = self.generate_temp()
-            self.code.append((operador, temp_var, left, right))
-            left = temp_var
-
-        print(f"✅ DEBUG: parse_resto_add() retornando -> {left}")
-        return left
-
-
-
-
-
-    def parse_mult(self):
-        """<mult> -> <uno> <restoMult>"""
-        print("🔍 DEBUG: Entrando em parse_mult()")
-        left = self.parse_uno()
-        return self.parse_resto_mult(left)
-
-    def parse_resto_mult(self, left):
-        """<restoMult> -> '*' <uno> <restoMult> | '/' <uno> <restoMult> | '%' <uno> <restoMult> | &"""
-        while self.current_token.type in ('DIV', 'MOD', 'MUL'):
-            operador = self.match(self.current_token.type).lexeme
-            right = self.parse_uno()
-            temp_var = self.generate_temp()
-            self.code.append((operador, temp_var, left, right))
-            left = temp_var
-        return left
-
-
-    
-
-            
-        
-    def parse_uno(self):
-        """<uno> -> '+' <uno> | '-' <uno> | <factor>"""
-        print(f"Processando UNO, token atual: {self.current_token}")
-        if self.current_token and self.current_token.type in ['ADD', 'SUB']:
-            operator_token = self.current_token
+    def parse_precedencia(self, minimo):
+        """Analisa uma expressão de nível >= minimo por precedência (substitui <or> ... <uno>).
+
+        Retorna (valor, nível): um operador binário de nível p só aceita à esquerda um
+        operando de nível >= p (> p se não for associativo), o que reproduz a cascata
+        <or> -> <and> -> <not> -> <rel> -> <add> -> <mult> -> <uno> da gramática.
+        """
+        binarios = self.binarios
+        token = self.current_token
+        prefixo = self.prefixos.get(token.type) if token is not None else None
+        if prefixo is not None and prefixo >= minimo:
+            # '!' <not> | '+' <uno> | '-' <uno>: o operando fica no mesmo nível do operador
             self.next_token()
-            uno_node = self.parse_uno()
-            return Node("unary_op", [uno_node], operator_token.lexeme)
-
-        return self.parse_factor()  
-
+            operando = self.parse_precedencia(prefixo)[0]
+            esquerda, nivel = self.arvore.novo(arvore.UNARIA, token.lexeme, (operando,)), prefixo
+        else:
+            esquerda, nivel = self.parse_factor(), NIVEL_FATOR
+
+        while self.current_token is not None:
+            linha = binarios.get(self.current_token.type)
+            if linha is None:
+                break
+            precedencia, associativo = linha
+            if precedencia < minimo or precedencia > nivel or (precedencia == nivel and not associativo):
+                break
+            token_operador = self.current_token
+            self.next_token()
+            direita = self.parse_precedencia(precedencia + 1)[0]
+            esquerda = self.arvore.novo(arvore.BINARIA, token_operador.lexeme, (esquerda, direita), token_operador)
+            nivel = precedencia
+        return esquerda, nivel
 
-            
     def parse_factor(self):
         """<fator> -> 'NUMint' | 'NUMfloat' | 'NUMoct' | 'NUMhex' | 'IDENT' | '(' <expr> ')' | 'STR'"""
-        print(f"🔍 DEBUG: Entrando em parse_factor(), token atual: {self.current_token}")  
+        if self.rastro:
+            self.rastro(f"Entrando em parse_factor(), token atual: {self.current_token}")
 
         token_atual = self.current_token  # Obtém o token atual
 
@@ -752,34 +567,40 @@ class Parser:
             # Converte para float
             valor = float(token_atual.lexeme)
             self.next_token()
-            print(f"✅ DEBUG: Número float reconhecido -> {valor}")
-            return valor
+            if self.rastro:
+                self.rastro(f"Número float reconhecido -> {valor}")
+            return self.arvore.novo(arvore.LITERAL, valor)
         elif token_atual.type == 'DECIMAL_INT':
             # Converte para int (base 10)
             valor = int(token_atual.lexeme)
             self.next_token()
-            print(f"✅ DEBUG: Número inteiro reconhecido -> {valor}")
-            return valor
+            if self.rastro:
+                self.rastro(f"Número inteiro reconhecido -> {valor}")
+            return self.arvore.novo(arvore.LITERAL, valor)
         elif token_atual.type == 'OCTAL_INT':
             # Converte octal (ex: '0755' → 493)
             valor = int(token_atual.lexeme, 8)
             self.next_token()
-            print(f"✅ DEBUG: Octal reconhecido → {valor}")
-            return valor
+            if self.rastro:
+                self.rastro(f"Octal reconhecido → {valor}")
+            return self.arvore.novo(arvore.LITERAL, valor)
         elif token_atual.type == 'HEXADECIMAL_INT':
             # Converte hexadecimal (ex: '0xFF' → 255)
             valor = int(token_atual.lexeme, 16)
             self.next_token()
-            print(f"✅ DEBUG: Hexadecimal reconhecido → {valor}")
-            return valor
+            if self.rastro:
+                self.rastro(f"Hexadecimal reconhecido → {valor}")
+            return self.arvore.novo(arvore.LITERAL, valor)
         elif token_atual.type == 'VARIABLE':
             valor = self.match('VARIABLE').lexeme
-            print(f"✅ DEBUG: Variável reconhecida -> {valor}")
-            return valor
+            if self.rastro:
+                self.rastro(f"Variável reconhecida -> {valor}")
+            return self.arvore.novo(arvore.NOME, valor)
         elif token_atual.type == 'STRING':
             valor = self.match('STRING').lexeme
-            print(f"✅ DEBUG: String reconhecida -> {valor}")
-            return valor
+            if self.rastro:
+                self.rastro(f"String reconhecida -> {valor}")
+            return self.arvore.novo(arvore.LITERAL, valor)
         elif token_atual.type == 'OPEN_PAREN':
             self.match('OPEN_PAREN')
             expr_val = self.parse_expr()
@@ -796,6 +617,320 @@ class Parser:
 
 
 
+# Comandos iniciados por palavra reservada, indexados pelo lexema
+Parser.COMANDOS = {
+    'int': Parser.parse_declaration_stmt,
+    'float': Parser.parse_declaration_stmt,
+    'string': Parser.parse_declaration_stmt,
+    'if': Parser.parse_if_stmt,
+    'while': Parser.parse_while_stmt,
+    'for': Parser.parse_for_stmt,
+    'system': Parser.parse_io_stmt,
+    'break': Parser.parse_break_stmt,
+    'continue': Parser.parse_continue_stmt,
+}
+
+# Tabela de precedência das expressões, indexada pelo tipo do token (seção OPERATORS de
+# tokens.txt). Binários: tipo -> (nível, associativo à esquerda); prefixos: tipo -> nível.
+# Níveis, do menor para o maior: || , && , ! , relacionais (não associativos), + - ,
+# * / % e os unários + -. Um operador novo é uma linha a mais aqui
+OPERADORES_BINARIOS = {
+    'LOGICAL_OR': (1, True),
+    'LOGICAL_AND': (2, True),
+    'EQUAL': (4, False),
+    'NOT_EQUAL': (4, False),
+    'GREATER': (4, False),
+    'GREATER_EQUAL': (4, False),
+    'LESS': (4, False),
+    'LESS_EQUAL': (4, False),
+    'ADD': (5, True),
+    'SUB': (5, True),
+    'MUL': (6, True),
+    'DIV': (6, True),
+    'MOD': (6, True),
+}
+OPERADORES_PREFIXOS = {
+    'LOGICAL_NOT': 3,
+    'ADD': 7,
+    'SUB': 7,
+}
+NIVEL_FATOR = 8  # Números, variáveis, strings e '(' <expr> ')'
+
+_tabela_operadores = None
+
+def tabela_operadores():
+    """(binarios, prefixos) com as linhas dos operadores declarados em tokens.txt."""
+    global _tabela_operadores
+    if _tabela_operadores is None:
+        tipos = set(lexico.carregar_tabelas()[0].values())
+        _tabela_operadores = ({tipo: linha for tipo, linha in OPERADORES_BINARIOS.items() if tipo in tipos},
+                              {tipo: nivel for tipo, nivel in OPERADORES_PREFIXOS.items() if tipo in tipos})
+    return _tabela_operadores
+
+# Esquema de tradução da análise dirigida por tabela: as alternativas de javaMM.gmr que
+# geram código, com as ações semânticas ('@nome' -> ParserLL1.acao_nome) nos pontos em
+# que o Parser recursivo gera temporários, labels e instruções. Alternativas ausentes
+# daqui não têm ações
+ESQUEMA_LL1 = {
+    "<function*>": ["<type> @descartar 'IDENT' '(' ')' <bloco>"],
+    "<type>": ["'int' @lexema", "'float' @lexema", "'string' @lexema"],
+    "<stmtList>": ["<stmt> @comando <stmtList>"],
+    "<declaration>": ["<type> <identList> ';' @declaracao"],
+    "<identList>": ["'IDENT' @lexema @lista <restoIdentList>"],
+    "<restoIdentList>": ["',' 'IDENT' @lexema @adicionar <restoIdentList>"],
+    "<forStmt>": ["@for_inicio 'for' '(' <optAtrib> ';' @for_condicao <optExpr> @for_teste ';' @for_incremento"
+                  " <optAtrib> ')' @for_corpo <stmt> @for_fim"],
+    "<optExpr>": ["@exigir_expressao"],  # O for do Parser exige a condição
+    "<ioStmt>": ["'system' '.' 'in' '.' 'scan' '(' <type> ',' 'IDENT' @lexema ')' ';' @scan",
+                 "'system' '.' 'out' '.' 'print' '(' <outList> ')' ';' @print"],
+    "<outList>": ["<out> @lista <restoOutList>"],
+    "<out>": ["'STR' @saida", "'IDENT' @saida", "'NUMdec' @saida", "'NUMfloat' @saida", "'NUMoct' @saida",
+              "'NUMhex' @saida"],
+    "<restoOutList>": ["',' <out> @adicionar <restoOutList>"],
+    "<whileStmt>": ["'while' '(' @while_inicio <expr> @while_teste ')' <stmt> @while_fim"],
+    "<ifStmt>": ["'if' '(' <expr> @if_teste ')' <stmt> @if_senao <elsePart> @if_fim"],
+    "<atrib>": [f"'IDENT' @lexema '{operador}' @operador <expr> @atrib" for operador in ('=', '+=', '-=', '*=', '/=', '%=')],
+    "<restoOr>": ["'||' @operador <and> @binaria <restoOr>"],
+    "<restoAnd>": ["'&&' @operador <not> @binaria <restoAnd>"],
+    "<not>": ["'!' @lexema <not> @unaria"],
+    "<restoRel>": [f"'{operador}' @operador <add> @binaria" for operador in ('==', '!=', '<', '<=', '>', '>=')],
+    "<restoAdd>": [f"'{operador}' @operador <mult> @binaria <restoAdd>" for operador in ('+', '-')],
+    "<restoMult>": [f"'{operador}' @operador <uno> @binaria <restoMult>" for operador in ('*', '/', '%')],
+    "<uno>": ["'+' @lexema <uno> @unaria", "'-' @lexema <uno> @unaria"],
+    "<fator>": ["'NUMint' @inteiro", "'NUMfloat' @real", "'NUMoct' @octal", "'NUMhex' @hexadecimal",
+                "'IDENT' @lexema", "'STR' @lexema"],
+}
+# A gramática chama o inteiro decimal de 'NUMint' em <fator> e de 'NUMdec' em <out>
+SINONIMOS_LL1 = {'NUMdec': 'NUMint'}
+
+# Analisador sintático dirigido pela tabela LL(1) gerada de javaMM.gmr. Usa uma pilha
+# explícita em vez de recursão, então blocos e expressões aninhados em qualquer
+# profundidade não esbarram no limite de recursão do Python. As ações semânticas geram o
+# código durante a análise, sem montar a árvore (cuja geração de código é recursiva), e
+# produzem o mesmo código do Parser (mesmos temporários, labels e ordem das instruções)
+class ParserLL1(Parser):
+    # Tipo do token -> terminal da gramática (operadores e símbolos usam o próprio lexema)
+    TERMINAIS = {
+        'VARIABLE': 'IDENT',
+        'DECIMAL_INT': 'NUMint',
+        'FLOAT': 'NUMfloat',
+        'SCIENTIFIC_FLOAT': 'NUMfloat',
+        'OCTAL_INT': 'NUMoct',
+        'HEXADECIMAL_INT': 'NUMhex',
+        'STRING': 'STR',
+    }
+
+    def __init__(self, tokens, ao_emitir=None, tabela_ll1=None):
+        super().__init__(tokens, ao_emitir)
+        self.ll1 = tabela_ll1 if tabela_ll1 is not None else carregar_tabela_ll1()
+        self.valores = []  # Pilha de atributos das ações semânticas
+        self.ultimo = None  # Último token consumido
+        self.acoes = {nome: getattr(self, "acao_" + nome[1:])
+                      for _, corpo in self.ll1.producoes for nome in corpo if nome.startswith("@")}
+
+    def terminal(self, token):
+        """Terminal da gramática correspondente ao token (FIM quando acabaram os tokens)."""
+        if token is None:
+            return gramatica.FIM
+        terminal = self.TERMINAIS.get(token.type)
+        if terminal is not None:
+            return terminal
+        if token.type == 'IDENTIFIER':
+            # Palavras reservadas fora da gramática (ex: main) são nomes
+            return token.lexeme if token.lexeme in self.ll1.terminais else 'IDENT'
+        return token.lexeme
+
+    def erro(self):
+        if self.current_token is None:
+            return SyntaxError("❌ Erro de sintaxe: Token inesperado (EOF encontrado).")
+        return SyntaxError(f"❌ Erro de sintaxe: Token inesperado {self.current_token}")
+
+    def parse_function(self):
+        """Analisa a função inteira com a pilha da tabela LL(1)."""
+        tabela = self.ll1.tabela
+        corpos = self.ll1.corpos_invertidos
+        acoes = self.acoes
+        pilha = [self.ll1.inicial]
+        terminal = self.terminal(self.current_token)
+        while pilha:
+            simbolo = pilha.pop()
+            acao = acoes.get(simbolo)
+            if acao is not None:
+                acao()
+                continue
+            linha = tabela.get(simbolo)
+            if linha is None:  # Terminal
+                if simbolo != terminal:
+                    raise SyntaxError(f"Erro de sintaxe: esperado '{simbolo}', encontrado {self.current_token}")
+                self.ultimo = self.current_token
+                self.next_token()
+                terminal = self.terminal(self.current_token)
+                continue
+            producao = linha.get(terminal)
+            if producao is None:
+                raise self.erro()
+            if self.rastro:
+                self.rastro(f"{simbolo} -> {' '.join(self.ll1.producoes[producao][1]) or gramatica.VAZIO}")
+            pilha.extend(corpos[producao])
+
+        if self.ao_emitir is None:
+            self.rastrear_codigo(self.code)
+        return Node("function")
+
+    # Ações semânticas. Valores (lexemas, listas, temporários, frames dos comandos) passam
+    # entre elas pela pilha self.valores
+
+    def acao_lexema(self):
+        self.valores.append(self.ultimo.lexeme)
+
+    def acao_operador(self):
+        # O token inteiro, para a posição do operador nos diagnósticos de tipo
+        self.valores.append(self.ultimo)
+
+    def acao_descartar(self):
+        self.valores.pop()
+
+    def acao_lista(self):
+        self.valores.append([self.valores.pop()])
+
+    def acao_adicionar(self):
+        valor = self.valores.pop()
+        self.valores[-1].append(valor)
+
+    def acao_comando(self):
+        self.emitir_codigo()
+
+    def acao_declaracao(self):
+        vars_declaradas = self.valores.pop()
+        valor_inicial = VALORES_INICIAIS.get(self.valores.pop())
+        if valor_inicial is not None:
+            for var in vars_declaradas:
+                self.code.append(("=", var, valor_inicial, None))
+
+    def acao_for_inicio(self):
+        # [início, corpo, fim, temporário da condição, incremento]
+        self.valores.append([self.generate_label(), self.generate_label(), self.generate_label(), None, None])
+
+    def acao_for_condicao(self):
+        frame = self.valores[-1]
+        self.code.append(("LABEL", frame[0], None, None))
+        frame[3] = self.generate_temp()
+
+    def acao_exigir_expressao(self):
+        raise self.erro()
+
+    def acao_for_teste(self):
+        condicao = self.valores.pop()
+        self.gerar_operacao('=', self.valores[-1][3], condicao, None)
+
+    def acao_for_incremento(self):
+        frame = self.valores[-1]
+        self.code.append(("IF", frame[3], frame[2], frame[1]))
+        frame[4] = self.generate_label()
+        self.code.append(("LABEL", frame[4], None, None))
+
+    def acao_for_corpo(self):
+        self.code.append(("LABEL", self.valores[-1][1], None, None))
+
+    def acao_for_fim(self):
+        frame = self.valores.pop()
+        self.code.append(("JUMP", frame[4], None, None))
+        self.code.append(("LABEL", frame[2], None, None))
+
+    def acao_scan(self):
+        var_name = self.valores.pop()
+        tipo = self.valores.pop()
+        self.code.append(("CALL", "SCAN", tipo, var_name))
+
+    def acao_print(self):
+        for item in self.valores.pop():
+            self.code.append(("CALL", "PRINT", item, None))
+
+    def acao_saida(self):
+        self.valores.append(self.ultimo.lexeme.replace("'", '"'))
+
+    def acao_while_inicio(self):
+        label_start = self.generate_label()
+        label_end = self.generate_label()
+        self.code.append(("LABEL", label_start, None, None))
+        self.valores.append((label_start, label_end))
+
+    def acao_while_teste(self):
+        condicao = self.valores.pop()
+        temp_cond = self.generate_temp()
+        self.gerar_operacao('=', temp_cond, condicao, None)
+        label_start, label_end = self.valores[-1]
+        self.code.append(("IF", temp_cond, label_end, label_start))
+
+    def acao_while_fim(self):
+        label_start, label_end = self.valores.pop()
+        self.code.append(("JUMP", label_start, None, None))
+        self.code.append(("LABEL", label_end, None, None))
+
+    def acao_if_teste(self):
+        condicao = self.valores.pop()
+        temp_cond = self.generate_temp()
+        self.gerar_operacao('=', temp_cond, condicao, None)
+        label_else = self.generate_label()
+        label_end = self.generate_label()
+        self.code.append(("IF", temp_cond, label_else, label_end))
+        self.valores.append(label_end)
+
+    def acao_if_senao(self):
+        self.code.append(("JUMP", self.valores[-1], None, None))
+
+    def acao_if_fim(self):
+        self.code.append(("LABEL", self.valores.pop(), None, None))
+
+    def acao_atrib(self):
+        expr_node = self.valores.pop()
+        token_operador = self.valores.pop()
+        operador = token_operador.lexeme
+        ident = self.valores.pop()
+        if operador != '=':
+            temp_var = self.generate_temp()
+            self.gerar_operacao(operador[0], temp_var, ident, expr_node)
+            self.gerador.marcar_token(token_operador)
+            self.gerar_operacao('=', ident, temp_var, None)
+        else:
+            if isinstance(expr_node, (int, float, str)):
+                temp_var = self.generate_temp()
+                self.gerar_operacao("=", temp_var, expr_node, None)
+                expr_node = temp_var
+            self.gerar_operacao(operador, ident, expr_node, None)
+
+    def acao_binaria(self):
+        right = self.valores.pop()
+        token_operador = self.valores.pop()
+        left = self.valores.pop()
+        temp_var = self.generate_temp()
+        self.code.append((token_operador.lexeme, temp_var, left, right))
+        self.gerador.marcar_token(token_operador)
+        self.valores.append(temp_var)
+
+    def acao_unaria(self):
+        operando = self.valores.pop()
+        self.valores.append(Node("unary_op", [operando], self.valores.pop()))
+
+    def acao_inteiro(self):
+        self.valores.append(int(self.ultimo.lexeme))
+
+    def acao_real(self):
+        self.valores.append(float(self.ultimo.lexeme))
+
+    def acao_octal(self):
+        self.valores.append(int(self.ultimo.lexeme, 8))
+
+    def acao_hexadecimal(self):
+        self.valores.append(int(self.ultimo.lexeme, 16))
+
+def carregar_tabela_ll1():
+    """Tabela LL(1) de javaMM.gmr com o esquema de tradução do ParserLL1 (em cache)."""
+    return gramatica.carregar_tabela(ESQUEMA_LL1, SINONIMOS_LL1)
+
+# Analisadores disponíveis: o descendente recursivo e o dirigido pela tabela LL(1)
+ANALISADORES = {"descendente": Parser, "ll1": ParserLL1}
+
 # Código principal para executar o parser
 """if __name__ == "__main__":
    
@@ -834,24 +969,51 @@ class Parser:
         print("Erro: Nenhum arquivo foi especificado. Por favor, forneça o nome do arquivo.")
         sys.exit(1)
     """
-def main(tokens):
+def main(tokens, analisador="descendente"):
+    parser = analisar(tokens, analisador)
+    return parser.code if parser is not None else []
+
+# Como main(), mas retorna o próprio analisador (ou None após um erro de sintaxe), de
+# onde saem também as posições das operações (parser.gerador.posicao)
+def analisar(tokens, analisador="descendente"):
+    try:
+        parser = ANALISADORES[analisador](tokens)
+        parser.parse_function()
+        return parser
+    except SyntaxError as e:
+        print(f"Erro de sintaxe: {e}")
+        return None
+
+# Modo em fluxo: tokens é normalmente um gerador (ex: lexico.main_em_fluxo) e cada
+# instrução é entregue a ao_emitir assim que gerada, sem acumular tokens nem código
+def main_em_fluxo(tokens, ao_emitir, analisador="descendente"):
     try:
-        parser = Parser(tokens)
-        root_node = parser.parse_function()
-        return parser.code
+        parser = ANALISADORES[analisador](tokens, ao_emitir)
+        parser.parse_function()
+        parser.emitir_codigo()
+        return True
     except SyntaxError as e:
         print(f"Erro de sintaxe: {e}")
-        return []    
+        return False
     
 if __name__ == "__main__":
     import sys
-    if len(sys.argv) > 1:
+    argumentos = rastreio.configurar_de_argumentos(sys.argv[1:])
+    if argumentos:
         try:
             import lexico
-            tokens = lexico.main(sys.argv[1])
-            codigo = main(tokens)
-            for instrucao in codigo:
-                print(instrucao)
+            analisador = "ll1" if "--ll1" in argumentos[1:] else "descendente"
+            if "--fluxo" in argumentos[1:]:
+                main_em_fluxo(lexico.main_em_fluxo(argumentos[0]), print, analisador=analisador)
+            elif "--arvore" in argumentos[1:]:
+                # Só a árvore sintática, sem gerar código
+                parser = Parser(lexico.main(argumentos[0]), gerar=False)
+                print(parser.arvore.formatar(parser.parse_function()))
+            else:
+                tokens = lexico.main(argumentos[0])
+                codigo = main(tokens, analisador=analisador)
+                for instrucao in codigo:
+                    print(instrucao)
         except Exception as e:
             print(f"Erro: {e}")
     else:
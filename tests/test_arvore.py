@@ -0,0 +1,77 @@
+import io
+import os
+
+import arvore
+import geracao
+import lexico
+import sintatico
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FONTE = "int main() { int a; if (a < 2) { a = -a * 3; } else a += 1; }"
+
+def _tokens(fonte):
+    return lexico.lexer(fonte, *lexico.carregar_tabelas())
+
+def test_formatar():
+    parser = sintatico.Parser(_tokens(FONTE), gerar=False)
+    raiz = parser.parse_function()
+    assert parser.code == []  # Só a árvore
+    assert parser.arvore.formatar(raiz).split("\n") == [
+        "function: main",
+        "\tblock:",
+        "\t\tdeclaration: int",
+        "\t\t\tvariable: a",
+        "\t\tif_stmt:",
+        "\t\t\tbinary_op: <",
+        "\t\t\t\tvariable: a",
+        "\t\t\t\tliteral: 2",
+        "\t\t\tblock:",
+        "\t\t\t\tassign_stmt: =",
+        "\t\t\t\t\tvariable: a",
+        "\t\t\t\t\tbinary_op: *",
+        "\t\t\t\t\t\tunary_op: -",
+        "\t\t\t\t\t\t\tvariable: a",
+        "\t\t\t\t\t\tliteral: 3",
+        "\t\t\t\tempty:",
+        "\t\t\tassign_stmt: +=",
+        "\t\t\t\tvariable: a",
+        "\t\t\t\tliteral: 1",
+        "\t\tempty:",
+    ]
+
+def test_geracao_separada_igual_a_geracao_na_analise():
+    for nome in ("exemplo1.java", "teste1.java"):
+        with open(os.path.join(RAIZ, nome)) as arquivo:
+            tokens = _tokens(arquivo.read())
+        parser = sintatico.Parser(tokens, gerar=False)
+        raiz = parser.parse_function()
+        assert list(map(str, geracao.gerar(parser.arvore, raiz))) == list(map(str, sintatico.main(tokens)))
+
+def test_arena_em_colunas():
+    a = arvore.Arvore()
+    x = a.novo(arvore.NOME, "x")
+    um = a.novo(arvore.LITERAL, 1)
+    soma = a.novo(arvore.BINARIA, "+", (x, um))
+    assert len(a) == 3
+    assert list(a.filhos_de(soma)) == [x, um] and list(a.filhos_de(x)) == []
+    assert (a.tipo(soma), a.valor(soma)) == (arvore.BINARIA, "+")
+    assert a.posicao(soma) is None  # Sem token, sem posição
+
+def test_truncar_descarta_nos_e_posicoes():
+    tokens = _tokens("a + b")
+    a = arvore.Arvore()
+    x = a.novo(arvore.NOME, "a")
+    a.novo(arvore.BINARIA, "+", (x, a.novo(arvore.NOME, "b")), tokens[1])
+    assert a.posicao(2) == (1, 2)
+    a.truncar(1)
+    assert len(a) == 1 and len(a.filhos) == 0 and not a.fontes
+    y = a.novo(arvore.NOME, "c")
+    assert list(a.filhos_de(y)) == [] and a.posicao(y) is None
+
+def test_modo_em_fluxo_nao_acumula_a_arvore():
+    fonte = "int main() { int a; " + "a = a + 1; " * 200 + "}"
+    tokens = lexico.lexer_em_fluxo(io.StringIO(fonte), *lexico.carregar_tabelas(), tamanho_bloco=64)
+    parser = sintatico.Parser(tokens, lambda instrucao: None)
+    parser.parse_function()
+    assert len(parser.arvore) < 5  # Cada comando é descartado depois de gerar o código
+    assert len(parser.arvore.fontes) <= 1
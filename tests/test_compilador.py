@@ -0,0 +1,49 @@
+import compilador
+
+def _lexicos(resultado):
+    return [d for d in resultado.diagnosticos if d.fase == "lexico"]
+
+def test_coleta_todos_os_erros_lexicos():
+    fonte = "int main(){ int a; a = 0x; a = 1e; a = 1ex; a = 1e+; a = 99999999999; a = 2; }"
+    erros = _lexicos(compilador.compile(fonte))
+    assert len(erros) == 5
+    assert all(d.line == 1 and d.column is not None for d in erros)
+    assert not any("inesperado" in d.mensagem for d in erros)
+
+def test_expoente_vazio_tem_posicao():
+    erros = _lexicos(compilador.compile("int main(){\n int a;\n a = 1e;\n}"))
+    assert [(d.line, d.column) for d in erros] == [(3, 6)]
+    assert "Expoente inválido" in erros[0].mensagem
+
+def test_programa_valido_sem_diagnosticos():
+    resultado = compilador.compile("int main(){ int a; a = 1e3; system.out.print(a); }")
+    assert resultado.ok, resultado.diagnosticos
+
+def test_erros_de_tipo_com_posicao_no_fonte():
+    fonte = "int main(){\n int a; float f; string s;\n if (a < f) { a = 1; }\n s += 1;\n}"
+    resultado = compilador.compile(fonte)
+    erros = [(d.fase, d.line, d.column) for d in resultado.diagnosticos]
+    assert erros == [("tipos", 3, 8), ("tipos", 4, 4)]
+    assert resultado.codigo_tipado is not None  # Erros de tipo não impedem a tipagem
+
+def test_codigo_tipado():
+    resultado = compilador.compile("int main(){ int a; a = a + 1; }")
+    assert resultado.ok
+    assert ("IADD", "__temp0", "a", 1) in resultado.codigo_tipado
+    assert ("+", "__temp0", "a", 1) in resultado.codigo
+
+def test_posicao_dos_operadores_pelo_offset():
+    import io
+    import lexico
+    import sintatico
+    fonte = "int main(){\n int a; float f; string s;\n if (a < f) { a = 1; }\n s += 1;\n}"
+    tabelas = lexico.carregar_tabelas()
+    for tokens in (lexico.lexer(fonte, *tabelas), lexico.lexer(fonte, *tabelas, motor="classico"),
+                   lexico.lexer_compacto(fonte, *tabelas),
+                   list(lexico.lexer_em_fluxo(io.StringIO(fonte), *tabelas, tamanho_bloco=7))):
+        parser = sintatico.Parser(tokens)
+        parser.parse_function()
+        # A arena guarda o offset do operador; linha e coluna só saem do índice de posições
+        assert not hasattr(parser.arvore, "linhas")
+        posicoes = sorted(parser.gerador.posicao(p) for p in parser.gerador.posicoes)
+        assert posicoes == [(3, 8), (4, 4)]
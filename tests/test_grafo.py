@@ -0,0 +1,110 @@
+import contextlib
+import io
+import os
+import re
+import sys
+
+import pytest
+
+import compilador
+import grafo
+from interpretador import Interpretador
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LIMITE = 3000
+ENTRADA = "".join(f"{n}\n" for n in (5, 3, -2, 7, 0, 1) * 30)
+FIM = "Número máximo de iterações atingido.\n"
+
+LACO = "int main() { int i, s; s = 0; for (i = 0; i < 3; i += 1) { s += i; } system.out.print(s); }"
+
+PROGRAMAS = {
+    "exemplo1": open(os.path.join(RAIZ, "exemplo1.java")).read(),
+    "teste1": open(os.path.join(RAIZ, "teste1.java")).read(),
+    "laco": LACO,
+    "aninhado": "int main() { int i, j, x; x = 0; for (i = 0; i < 4; i += 1) {"
+                " for (j = i; j < 5; j += 1) { if (j > 2) { x += j; } else { x -= i; }"
+                " system.out.print(x); } } }",
+    # Sem laços: a saída depois da ida e volta tem que ser exatamente a mesma
+    "ramos": "int main() { int a, b, c; float f; system.in.scan(int, a); system.in.scan(int, b);"
+             " c = a * 2 + b; if (a > b) { c = c - 1; f = 1.5; } else { c = c + 3; f = 0.5; }"
+             " system.out.print(c, f, a); }",
+}
+
+def executar(codigo, monkeypatch):
+    monkeypatch.setattr(sys, "stdin", io.StringIO(ENTRADA))
+    saida = io.StringIO()
+    with contextlib.redirect_stdout(saida):
+        Interpretador(list(codigo), LIMITE).rodar()
+    # Os labels novos de de_ssa aparecem no aviso de label inexistente
+    return re.sub(r"Labels disponíveis: \{.*\}", "", saida.getvalue())
+
+def codigo(programa):
+    return compilador.compile(PROGRAMAS[programa], levantar=True).codigo
+
+def test_dominadores_do_laco():
+    g = grafo.Grafo(compilador.compile(LACO, levantar=True).codigo)
+    # B0 entrada, B1 condição, B2 incremento, B3 corpo, B4 depois do laço
+    assert [b.sucessores for b in g.blocos] == [[1], [4, 3], [3], [2], []]
+    idom = g.dominadores()
+    assert idom == [None, 0, 3, 1, 1]
+    assert grafo.Grafo.domina(idom, 1, 2) and not grafo.Grafo.domina(idom, 2, 3)
+
+@pytest.mark.parametrize("programa", PROGRAMAS)
+def test_cada_versao_e_atribuida_uma_vez(programa):
+    ssa = grafo.para_ssa(codigo(programa))
+    atribuidas = []
+    for indice in ssa.blocos:
+        atribuidas += [phi.destino for phi in ssa.phis[indice]]
+        atribuidas += [grafo.definicao(i) for i in ssa.instrucoes[indice] if grafo.definicao(i) is not None]
+    versoes = [nome for nome in atribuidas if grafo.SEPARADOR_VERSAO in nome]
+    assert len(versoes) == len(set(versoes))
+    assert set(versoes) == set(ssa.originais)
+
+@pytest.mark.parametrize("programa", PROGRAMAS)
+def test_phi_tem_um_operando_por_predecessor(programa):
+    ssa = grafo.para_ssa(codigo(programa))
+    alcancaveis = {i for i in ssa.blocos if i == 0 or ssa.idom[i] is not None}
+    for indice in ssa.blocos:
+        for phi in ssa.phis[indice]:
+            assert set(phi.operandos) == set(ssa.grafo.blocos[indice].predecessores) & alcancaveis
+            assert all(ssa.originais.get(o, o) == phi.variavel for o in phi.operandos.values())
+
+def test_phi_no_cabecalho_do_laco():
+    ssa = grafo.para_ssa(compilador.compile(LACO, levantar=True).codigo)
+    assert [str(phi) for phi in ssa.phis[3]] == ["i#3 = φ(B1: i#2, B2: i#4)", "s#3 = φ(B1: s#2, B2: s#4)"]
+    assert all(not ssa.phis[indice] for indice in (0, 1, 2, 4))
+
+def test_lidas_antes_de_atribuidas_e_lidas_do_teclado_ficam_fora():
+    codigo = [("+", "t", "x", 1), ("=", "x", "t", None), ("CALL", "SCAN", "int", "n"),
+              ("=", "n", "t", None), ("CALL", "PRINT", "x", None), ("CALL", "PRINT", "n", None)]
+    ssa = grafo.para_ssa(codigo)
+    assert ssa.instrucoes[0] == [("+", "t#1", "x", 1), ("=", "x", "t#1", None), ("CALL", "SCAN", "int", "n"),
+                                 ("=", "n", "t#1", None), ("CALL", "PRINT", "x", None), ("CALL", "PRINT", "n", None)]
+
+@pytest.mark.parametrize("programa", PROGRAMAS)
+def test_ida_e_volta_mantem_a_saida(programa, monkeypatch):
+    original = codigo(programa)
+    volta = grafo.de_ssa(grafo.para_ssa(original))
+    assert all(grafo.bem_formada(i) for i in volta)
+    esperado, obtido = executar(original, monkeypatch), executar(volta, monkeypatch)
+    if FIM not in esperado:
+        assert obtido == esperado
+    else:
+        # As cópias dos φ custam iterações: a saída com o limite é prefixo da original
+        assert esperado.replace(FIM, "").startswith(obtido.replace(FIM, ""))
+
+def test_copias_simultaneas_com_ciclo():
+    copias = [("a", "b"), ("b", "a"), ("c", "a"), ("d", "d")]
+    temporarios = iter(["t1", "t2"])
+    instrucoes = grafo._sequenciar(copias, lambda: next(temporarios))
+    valores = {"a": 1, "b": 2, "c": 3, "d": 4}
+    for _, destino, origem, _ in instrucoes:
+        valores[destino] = valores[origem]
+    assert (valores["a"], valores["b"], valores["c"], valores["d"]) == (2, 1, 1, 4)
+    assert len(instrucoes) == 4  # c = a, uma cópia para o temporário e as duas da troca
+
+def test_para_dot_mostra_os_phi():
+    dot = grafo.para_ssa(compilador.compile(LACO, levantar=True).codigo).para_dot()
+    assert dot.startswith("digraph cfg {")
+    assert "i#3 = φ(B1: i#2, B2: i#4)" in dot
+    assert "B1 -> B3" in dot and "B2 -> B3" in dot
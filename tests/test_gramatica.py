@@ -0,0 +1,48 @@
+import pytest
+
+import gramatica
+
+def _gramatica():
+    with open(gramatica.ARQUIVO_GRAMATICA) as arquivo:
+        return gramatica.ler_gramatica(arquivo.read())
+
+def test_first_e_follow():
+    inicial, producoes = gramatica.ler_gramatica("<s> -> <a> 'x' ; <a> -> 'y' <a> | & ;")
+    first = gramatica.calcular_first(producoes)
+    follow = gramatica.calcular_follow(producoes, inicial, first)
+    assert first["<a>"] == {"y", gramatica.VAZIO}
+    assert first["<s>"] == {"x", "y"}
+    assert follow["<a>"] == {"x"}
+    assert follow["<s>"] == {gramatica.FIM}
+
+def test_conflitos_da_gramatica_e_fatoracao():
+    inicial, producoes = _gramatica()
+    # Os comandos de entrada e saída começam por 'system' e o if tem o else pendente
+    assert {(cabeca, terminal) for cabeca, terminal, _ in gramatica.conflitos(producoes, inicial)} >= {
+        ("<ioStmt>", "system"), ("<elsePart>", "else")}
+    fatoradas = gramatica.fatorar(producoes)
+    assert [(c, t) for c, t, _ in gramatica.conflitos(fatoradas, inicial)] == [("<elsePart>", "else")]
+    _, resolvidos = gramatica.construir_tabela(fatoradas, inicial)
+    assert len(resolvidos) == 1 and "escolhida 'else <stmt>'" in resolvidos[0]
+
+def test_conflito_sem_resolucao():
+    inicial, producoes = gramatica.ler_gramatica("<s> -> <a> | <b> ; <a> -> 'x' ; <b> -> 'x' 'y' ;")
+    with pytest.raises(ValueError, match="Conflito LL\\(1\\) em <s> com 'x'"):
+        gramatica.construir_tabela(gramatica.fatorar(producoes), inicial)
+
+@pytest.mark.parametrize("texto", ["<s> -> 'a'", "<s> -> <t> ;", "", "<s> 'a' ;"])
+def test_gramatica_invalida(texto):
+    with pytest.raises(ValueError):
+        gramatica.ler_gramatica(texto)
+
+def test_cache_da_tabela(tmp_path, monkeypatch):
+    arquivo = tmp_path / "g.gmr"
+    arquivo.write_text("<s> -> 'a' <s> | 'b' ;")
+    tabela = gramatica.carregar_tabela(nome_arquivo=str(arquivo))
+    assert tabela.tabela == {"<s>": {"a": 0, "b": 1}}
+    assert len(list((tmp_path / "__pycache__").iterdir())) == 1
+
+    def nao_gerar(*args):
+        raise AssertionError("tabela gerada de novo com o cache válido")
+    monkeypatch.setattr(gramatica, "gerar_tabela", nao_gerar)
+    assert gramatica.carregar_tabela(nome_arquivo=str(arquivo)).tabela == tabela.tabela
@@ -0,0 +1,300 @@
+import contextlib
+import io
+import os
+import random
+
+import pytest
+
+import lexico
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FONTE = ("int main(){\n  float f = 1.;  // comentario\n  int a = 0x1F + 017;\n"
+         "  /* bloco\n  */ a /= 2; f = 2.5e3;\n  string s = \"x\";\n}\n")
+
+# Pedaços para montar fontes aleatórias: quebras de linha, comentários, floats como "1."
+# (cuja coluna anda um além do texto), a '/' descartada e caracteres não ASCII
+PEDACOS = ["a", "b1", " ", "  ", "\n", "\t", "9", "1.", "2.5", "1e5", "0x1F", "017", "=", "<=", ";",
+           "(", ")", "+", "/", "/=", "// c\n", "/* x\ny */", "\"s t\"", "int ", "é", "ção", "x_y"]
+
+def _tabelas():
+    return lexico.carregar_tabelas()
+
+def _posicoes(tokens):
+    return [(t.type, t.lexeme, t.line, t.column) for t in tokens]
+
+def _classico(fonte):
+    """Tokens do motor clássico, ou None se ele encerra com erro léxico."""
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return _posicoes(lexico.lexer(fonte, *_tabelas(), motor="classico"))
+    except SystemExit:
+        return None
+
+def _fontes(quantidade, semente=0):
+    aleatorio = random.Random(semente)
+    for _ in range(quantidade):
+        fonte = "".join(aleatorio.choice(PEDACOS) for _ in range(aleatorio.randint(0, 30)))
+        if _classico(fonte) is not None:
+            yield aleatorio, fonte
+
+def test_posicoes_pelo_indice_iguais_ao_motor_classico():
+    tabelas = _tabelas()
+    esperado = _classico(FONTE)
+    tokens = lexico.lexer(FONTE, *tabelas)
+    assert all(isinstance(t, lexico.TokenPosicional) for t in tokens)
+    assert _posicoes(tokens) == esperado
+    assert _posicoes(lexico.lexer_em_fluxo(io.StringIO(FONTE), *tabelas, tamanho_bloco=5)) == esperado
+    assert _posicoes(lexico.lexer_compacto(FONTE, *tabelas)) == esperado
+
+def test_erro_lexico_com_posicao_pelo_indice():
+    erros = []
+    list(lexico.obter_motor(*_tabelas()).varrer("a = 1;\n  b = 3 @ c;\n", erros=erros))
+    assert [(e.line, e.column) for e in erros] == [(2, 9)]
+
+def test_float_terminado_em_ponto_no_buffer_compacto():
+    fonte = "int main(){ float f;\nf = 1.; f = 2; }"
+    buffer = lexico.lexer_compacto(fonte, *_tabelas())
+    assert _posicoes(buffer) == _classico(fonte)
+    assert ("FLOAT", "1.0", 2, 5) in _posicoes(buffer)
+
+def test_buffer_compacto_nao_guarda_linha_e_coluna():
+    buffer = lexico.lexer_compacto(FONTE, *_tabelas())
+    assert not hasattr(buffer.linha, "typecode")  # Calculadas pelo índice, não um array
+    assert len(buffer.posicoes) < len(buffer)
+
+def test_compacto_igual_ao_motor_classico():
+    for _, fonte in _fontes(300):
+        assert _posicoes(lexico.lexer_compacto(fonte, *_tabelas())) == _classico(fonte), fonte
+
+@pytest.mark.parametrize("tamanho_bloco", [4, 9, 1 << 20])
+def test_mapeado_igual_ao_motor_classico(tmp_path, tamanho_bloco):
+    arquivo = tmp_path / "fonte.java"
+    for aleatorio, fonte in _fontes(150, 1):
+        # No arquivo, parte das quebras de linha vira '\r\n' (bytes e offsets se afastam)
+        arquivo.write_bytes(fonte.replace("\n", "\r\n" if aleatorio.random() < 0.5 else "\n").encode())
+        buffer = lexico.lexer_mapeado(str(arquivo), *_tabelas(), tamanho_bloco)
+        assert _posicoes(buffer) == _classico(fonte), fonte
+
+def test_relexar_igual_ao_motor_classico():
+    tabelas = _tabelas()
+    for aleatorio, fonte in _fontes(400, 2):
+        offset = aleatorio.randint(0, len(fonte))
+        removidos = aleatorio.randint(0, len(fonte) - offset)
+        inseridos = "".join(aleatorio.choice(PEDACOS) for _ in range(aleatorio.randint(0, 4)))
+        novo = fonte[:offset] + inseridos + fonte[offset + removidos:]
+        esperado = _classico(novo)
+        if esperado is None:
+            continue
+        buffer = lexico.lexer_compacto(fonte, *tabelas)
+        lexico.relexar(buffer, offset, removidos, inseridos, *tabelas)
+        assert _posicoes(buffer) == esperado, (fonte, offset, removidos, inseridos)
+
+# Fontes com erros léxicos: os dois motores exibem a mesma mensagem e encerram
+ERROS = ["a = 0x;", "a = 1e;", "a = 99999999999;", "s = \"abc", "x;\n/* sem fim", "a @ b", "a = 1ex;",
+         "x = 1e+;", "a = 1.5.3;", "a = 2..;", "a = 0xG;", "a = 08;"]
+
+def _saida(fonte, motor):
+    """(tokens ou código de saída, mensagens exibidas) do motor informado."""
+    saida = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(saida):
+            resultado = _posicoes(lexico.lexer(fonte, *_tabelas(), motor=motor))
+    except SystemExit as e:
+        resultado = ("exit", e.code)
+    return resultado, saida.getvalue()
+
+@pytest.mark.parametrize("nome", ["exemplo1.java", "teste1.java"])
+def test_motor_regex_igual_ao_classico_nos_exemplos(nome):
+    with open(os.path.join(RAIZ, nome)) as arquivo:
+        fonte = arquivo.read()
+    assert _saida(fonte, "regex") == _saida(fonte, "classico")
+
+@pytest.mark.parametrize("fonte", ERROS)
+def test_motor_regex_mesmos_erros_do_classico(fonte):
+    assert _saida(fonte, "regex") == _saida(fonte, "classico")
+
+def test_motor_regex_igual_ao_classico_em_fontes_aleatorias():
+    aleatorio = random.Random(3)
+    pedacos = PEDACOS + ["@", "0x", "1e", "1.5.3", "\"", "/*", "99999999999"]
+    for _ in range(400):
+        fonte = "".join(aleatorio.choice(pedacos) for _ in range(aleatorio.randint(0, 25)))
+        assert _saida(fonte, "regex") == _saida(fonte, "classico"), fonte
+
+def test_motor_desconhecido():
+    with pytest.raises(ValueError):
+        lexico.lexer("a", *_tabelas(), motor="outro")
+
+@pytest.mark.parametrize("tamanho_bloco", [1, 2, 3, 7, 64])
+def test_em_fluxo_igual_ao_lexer_inteiro(tamanho_bloco):
+    # Blocos pequenos cortam strings, comentários, números e operadores no meio
+    for _, fonte in _fontes(150, 4):
+        em_fluxo = lexico.lexer_em_fluxo(io.StringIO(fonte), *_tabelas(), tamanho_bloco=tamanho_bloco)
+        assert _posicoes(em_fluxo) == _classico(fonte), fonte
+
+def test_em_fluxo_gera_tokens_antes_do_fim_do_arquivo():
+    arquivo = io.StringIO(FONTE * 50)
+    tokens = lexico.lexer_em_fluxo(arquivo, *_tabelas(), tamanho_bloco=16)
+    next(tokens)
+    assert arquivo.tell() < len(FONTE * 50)
+
+def test_buffer_compacto_recorta_lexemas_do_fonte():
+    buffer = lexico.lexer_compacto(FONTE, *_tabelas())
+    # Só os lexemas que não são um trecho literal do fonte ficam guardados
+    assert {buffer.lexema(i) for i in buffer.lexemas_especiais} == {"1.0"}
+    assert [t.lexeme for t in buffer] == [lexema for _, lexema, _, _ in _classico(FONTE)]
+    assert len(buffer.tipos) == len(set(buffer.tipos)) < len(buffer)  # Um id por tipo
+    assert buffer[-1].lexeme == "}" and buffer[len(buffer) - 1].lexeme == "}"
+    with pytest.raises(IndexError):
+        buffer[len(buffer)]
+
+def test_buffer_compacto_remover_ultimo():
+    buffer = lexico.lexer_compacto("f = 1.;", *_tabelas())
+    buffer.remover_ultimo()
+    buffer.remover_ultimo()
+    assert [t.lexeme for t in buffer] == ["f", "="]
+    assert not buffer.lexemas_especiais
+
+def test_parser_aceita_o_buffer_compacto():
+    import sintatico
+    with open(os.path.join(RAIZ, "exemplo1.java")) as arquivo:
+        fonte = arquivo.read()
+    tabelas = _tabelas()
+    assert sintatico.main(lexico.lexer_compacto(fonte, *tabelas)) == sintatico.main(lexico.lexer(fonte, *tabelas))
+
+def _copiar_tokens(tmp_path, extra=""):
+    with open(lexico.ARQUIVO_TOKENS) as arquivo:
+        texto = arquivo.read()
+    destino = tmp_path / "tokens.txt"
+    destino.write_text(texto + extra)
+    return str(destino)
+
+def _caches(tmp_path):
+    pasta = tmp_path / "__pycache__"
+    return sorted(p.name for p in pasta.iterdir()) if pasta.exists() else []
+
+def test_cache_de_tabelas_gravado_e_reutilizado(tmp_path, monkeypatch):
+    arquivo = _copiar_tokens(tmp_path)
+    tabelas = lexico.carregar_tabelas(arquivo)
+    assert tabelas == lexico.ler_tokens(arquivo)
+    assert len(_caches(tmp_path)) == 1
+
+    def nao_interpretar(linhas):
+        raise AssertionError("tabelas interpretadas de novo com o cache válido")
+    monkeypatch.setattr(lexico, "interpretar_tokens", nao_interpretar)
+    assert lexico.carregar_tabelas(arquivo) == tabelas
+
+def test_cache_de_tabelas_invalidado_pelo_conteudo(tmp_path):
+    arquivo = _copiar_tokens(tmp_path)
+    lexico.carregar_tabelas(arquivo)
+    antigo = _caches(tmp_path)
+    _copiar_tokens(tmp_path, "\n")
+    assert lexico.carregar_tabelas(arquivo) == lexico.ler_tokens(arquivo)
+    novo = _caches(tmp_path)
+    assert len(novo) == 1 and novo != antigo  # O cache anterior é removido
+
+def test_cache_de_tabelas_corrompido_e_refeito(tmp_path):
+    arquivo = _copiar_tokens(tmp_path)
+    lexico.carregar_tabelas(arquivo)
+    cache = tmp_path / "__pycache__" / _caches(tmp_path)[0]
+    cache.write_bytes(b"lixo")
+    assert lexico.carregar_tabelas(arquivo) == lexico.ler_tokens(arquivo)
+    assert cache.read_bytes() != b"lixo"
+
+def test_relexar_so_reanalisa_o_trecho_editado():
+    tabelas = _tabelas()
+    fonte = "int main(){\n" + "".join(f"  a{i} = a{i} + {i};\n" for i in range(200)) + "}\n"
+    buffer = lexico.lexer_compacto(fonte, *tabelas)
+    offset = fonte.index("a100 =")
+    primeiro, fim_antigo, fim_novo = lexico.relexar(buffer, offset, 4, "total", *tabelas)
+    # As colunas do resto da linha mudam: a re-análise vai até o primeiro token da linha seguinte
+    assert fim_novo - primeiro <= 8 and fim_antigo == fim_novo
+    assert buffer[primeiro + 1].lexeme == "total"
+    novo = fonte[:offset] + "total" + fonte[offset + 4:]
+    assert _posicoes(buffer) == _classico(novo)
+
+def test_relexar_comentario_de_linha_engole_o_resto_da_linha():
+    tabelas = _tabelas()
+    fonte = "a = 1; b = 2;\nc = 3;\n"
+    buffer = lexico.lexer_compacto(fonte, *tabelas)
+    lexico.relexar(buffer, fonte.index("b"), 0, "// ", *tabelas)
+    assert [t.lexeme for t in buffer] == [lexema for _, lexema, _, _ in _classico("a = 1; // b = 2;\nc = 3;\n")]
+
+def test_relexar_edicoes_seguidas():
+    tabelas = _tabelas()
+    for aleatorio, fonte in _fontes(60, 5):
+        buffer = lexico.lexer_compacto(fonte, *tabelas)
+        for _ in range(10):
+            offset = aleatorio.randint(0, len(fonte))
+            removidos = aleatorio.randint(0, min(3, len(fonte) - offset))
+            inseridos = "".join(aleatorio.choice(PEDACOS) for _ in range(aleatorio.randint(0, 2)))
+            novo = fonte[:offset] + inseridos + fonte[offset + removidos:]
+            if _classico(novo) is None:
+                continue
+            lexico.relexar(buffer, offset, removidos, inseridos, *tabelas)
+            fonte = novo
+            assert _posicoes(buffer) == _classico(fonte), fonte
+
+def test_relexar_edicao_fora_do_codigo():
+    tabelas = _tabelas()
+    buffer = lexico.lexer_compacto("a = 1;", *tabelas)
+    with pytest.raises(ValueError):
+        lexico.relexar(buffer, 4, 5, "", *tabelas)
+
+def test_mapeado_guarda_posicoes_em_bytes(tmp_path):
+    arquivo = tmp_path / "fonte.java"
+    fonte = "int main(){\r\n  string ç = \"ação\";\r\n  é = ç;\n}"
+    arquivo.write_bytes(fonte.encode())
+    buffer = lexico.lexer_mapeado(str(arquivo), *_tabelas(), 5)
+    for i, token in enumerate(buffer):
+        bruto = bytes(buffer.source_code[buffer.inicio[i]:buffer.inicio[i] + buffer.tamanho[i]])
+        assert bruto.decode() == token.lexeme
+    assert _posicoes(buffer) == _classico(fonte.replace("\r\n", "\n"))
+
+def test_mapeado_comentario_maior_que_o_bloco(tmp_path):
+    arquivo = tmp_path / "fonte.java"
+    fonte = "a = 1;\n/* " + "comentário longo " * 20 + "*/ b = 2;"
+    arquivo.write_text(fonte)
+    assert _posicoes(lexico.lexer_mapeado(str(arquivo), *_tabelas(), 8)) == _classico(fonte)
+
+def test_mapeado_arquivo_vazio(tmp_path):
+    arquivo = tmp_path / "vazio.java"
+    arquivo.write_bytes(b"")
+    assert len(lexico.lexer_mapeado(str(arquivo), *_tabelas())) == 0
+
+def test_main_mapeado_igual_ao_main(capsys):
+    import sintatico
+    nome = os.path.join(RAIZ, "exemplo1.java")
+    mapeado = lexico.main(nome, mapeado=True)
+    assert isinstance(mapeado, lexico.BufferTokensMapeado)
+    assert _posicoes(mapeado) == _posicoes(lexico.main(nome))
+    assert sintatico.main(mapeado) == sintatico.main(lexico.main(nome))
+    with pytest.raises(SystemExit):
+        lexico.main(os.path.join(RAIZ, "nao_existe.java"), mapeado=True)
+    assert "não encontrado" in capsys.readouterr().out
+
+def _paralelo(fonte, processos=3):
+    saida = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(saida):
+            resultado = _posicoes(lexico.lexer_paralelo(fonte, *_tabelas(), processos))
+    except SystemExit as e:
+        resultado = ("exit", e.code)
+    return resultado, saida.getvalue()
+
+@pytest.mark.parametrize("fonte", [
+    FONTE * 20,
+    # Comentário e string atravessando os pontos de divisão
+    "a = 1;\n/*\n" + "x = 2;\n" * 60 + "*/ b = 3;\n" + "s = \"" + "y\nz " * 60 + "\";\nc = 4;\n",
+    # Erro léxico no meio e no fim: mesma mensagem da análise sequencial
+    FONTE * 10 + "a = 0x;\n" + FONTE * 10,
+    FONTE * 20 + "s = \"sem fim\n",
+])
+def test_paralelo_igual_ao_sequencial(monkeypatch, fonte):
+    monkeypatch.setattr(lexico, "TAMANHO_MINIMO_TRECHO", 64)
+    assert _paralelo(fonte) == _saida(fonte, "regex")
+
+def test_paralelo_codigo_pequeno_nao_e_dividido(monkeypatch):
+    def sem_pool(*args, **kwargs):
+        raise AssertionError("código pequeno dividido entre processos")
+    monkeypatch.setattr(lexico, "ProcessPoolExecutor", sem_pool)
+    assert _paralelo(FONTE) == _saida(FONTE, "regex")
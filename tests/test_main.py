@@ -0,0 +1,23 @@
+import pytest
+
+import main
+
+ERRO_DE_TIPO = "int main(){\n int a; float f; string s;\n if (a < f) { a = 1; }\n s += 1;\n system.out.print(a);\n}"
+
+@pytest.mark.parametrize("analisador", ["descendente", "ll1"])
+@pytest.mark.parametrize("otimizar", [False, True])
+def test_erros_de_tipo_encerram_antes_da_execucao(tmp_path, capsys, analisador, otimizar):
+    arquivo = tmp_path / "erro.java"
+    arquivo.write_text(ERRO_DE_TIPO)
+    with pytest.raises(SystemExit) as saida:
+        main.main(str(arquivo), analisador, otimizar)
+    assert saida.value.code == 1
+    linhas = capsys.readouterr().out.splitlines()
+    assert [linha.split(":")[0] for linha in linhas] == ["[tipos] linha 3, coluna 8", "[tipos] linha 4, coluna 4"]
+
+@pytest.mark.parametrize("otimizar", [False, True])
+def test_programa_sem_erros_de_tipo_executa(tmp_path, capsys, otimizar):
+    arquivo = tmp_path / "ok.java"
+    arquivo.write_text("int main(){ int a; a = 2; a *= 3; system.out.print(a); }")
+    main.main(str(arquivo), otimizar=otimizar)
+    assert "6" in capsys.readouterr().out
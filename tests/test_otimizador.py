@@ -0,0 +1,271 @@
+import contextlib
+import io
+import os
+import re
+import sys
+
+import pytest
+
+import compilador
+import otimizador
+from interpretador import Interpretador
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LIMITE = 3000  # Os laços gerados não terminam: a comparação vai até o limite de iterações
+ENTRADA = "".join(f"{n}\n" for n in (5, 3, -2, 7, 0, 1) * 30)
+FIM = "Número máximo de iterações atingido.\n"
+
+PROGRAMAS = {
+    "exemplo1": open(os.path.join(RAIZ, "exemplo1.java")).read(),
+    "teste1": open(os.path.join(RAIZ, "teste1.java")).read(),
+    "invariante": "int main() { int i, n, s, k, t; system.in.scan(int, n); s = 0; k = 3;"
+                  " for (i = 0; i < n; i += 1) { t = k * 4 + 1; s += i * t; system.out.print(s, t); } }",
+    "leitura": "int main() { int i, a, soma, c; soma = 0; c = 0;"
+               " for (i = 0; i < 5; i += 1) { system.in.scan(int, a);"
+               " if (a > 2) { soma += a * 2; } else { soma -= 1; } c += a % 3; system.out.print(soma, c); } }",
+    "aninhado": "int main() { int i, j, x, y; float f; string s; x = 0; f = 0.5; s = \"r\";"
+                " for (i = 0; i < 4; i += 1) { for (j = i; j < 5; j += 1) { y = i * 2; x += y * j - 2;"
+                " f = f + 1.5; system.out.print(s, x, f); } } }",
+    # Sem laços: terminam antes do limite, então a saída tem que ser exatamente a mesma
+    "ramos": "int main() { int a, b, c, d, e; float f; system.in.scan(int, a); system.in.scan(int, b);"
+             " c = a * 2 + b; d = a * 2 + b - 1;"
+             " if (a > b) { c = c - d; f = 1.5; } else { c = c + d * 3; f = 2.0 * 0.25; }"
+             " if (c % 2 == 0) { system.out.print(\"par\", c); } else { system.out.print(\"impar\", c); }"
+             " e = a * 2 + b; system.out.print(c, d, f, e); }",
+    "constantes": "int main() { int x, y, z, n, w; string s; x = 4; y = x * 3 - 2; s = \"v\";"
+                  " system.in.scan(int, n); if (y > 5) { z = y + n; } else { z = 0; }"
+                  " if (x == 4) { if (n >= 0) { w = y % 4; system.out.print(s, z, w); }"
+                  " else { w = n * (x + y); system.out.print(s, w); } }"
+                  " z = z * 1; y = y + 0; w = x - 4 + n; system.out.print(z, y, w); }",
+}
+TERMINAM = {"ramos", "constantes"}
+
+def executar(codigo, monkeypatch):
+    """Saída do interpretador, sem o que muda legitimamente entre as versões do código."""
+    monkeypatch.setattr(sys, "stdin", io.StringIO(ENTRADA))
+    saida = io.StringIO()
+    with contextlib.redirect_stdout(saida):
+        Interpretador(list(codigo), LIMITE).rodar()
+    texto = re.sub(r"Labels disponíveis: \{.*\}", "", saida.getvalue())
+    return re.sub(r"Erro na instrução \d+", "Erro na instrução", texto)
+
+def mesma_saida(original, otimizada):
+    # Com o limite, o código otimizado (mais curto) vai mais longe: uma saída é prefixo da outra
+    original, otimizada = original.replace(FIM, ""), otimizada.replace(FIM, "")
+    return original.startswith(otimizada) or otimizada.startswith(original)
+
+@pytest.mark.parametrize("passos", range(1, len(otimizador.PASSOS) + 1),
+                         ids=[nome for nome, _ in otimizador.PASSOS])
+@pytest.mark.parametrize("programa", PROGRAMAS)
+def test_prefixo_dos_passos_mantem_a_saida(programa, passos, monkeypatch):
+    codigo = compilador.compile(PROGRAMAS[programa], levantar=True).codigo
+    original = executar(codigo, monkeypatch)
+    otimizado, _ = otimizador.otimizar(codigo, otimizador.PASSOS[:passos])
+    if programa in TERMINAM:
+        assert FIM not in original
+        assert executar(otimizado, monkeypatch) == original
+    else:
+        assert mesma_saida(original, executar(otimizado, monkeypatch))
+
+def test_constantes_dobram_as_operacoes_e_resolvem_o_if():
+    codigo = [("=", "x", "4", None), ("*", "__temp0", "x", 3), ("=", "y", "__temp0", None),
+              (">", "__temp1", "y", 5), ("IF", "__temp1", "__label0", "__label1"),
+              ("LABEL", "__label1", None, None), ("CALL", "PRINT", "y", None), ("LABEL", "__label0", None, None)]
+    otimizado, estatisticas = otimizador.propagar_constantes(codigo)
+    assert otimizado == [("=", "x", "4", None), ("=", "__temp0", 12, None), ("=", "y", 12, None),
+                         ("=", "__temp1", True, None), ("JUMP", "__label1", None, None),
+                         ("LABEL", "__label1", None, None), ("CALL", "PRINT", 12, None),
+                         ("LABEL", "__label0", None, None)]
+    assert estatisticas == {"substituicoes": 2, "dobradas": 2, "desvios": 1}
+
+def test_constantes_param_no_scan():
+    codigo = [("=", "x", "4", None), ("CALL", "SCAN", "int", "x"), ("+", "__temp0", "x", 1),
+              ("CALL", "PRINT", "__temp0", None)]
+    otimizado, _ = otimizador.propagar_constantes(codigo)
+    assert otimizado == codigo
+
+def test_temporarios_sem_interferencia_dividem_o_nome():
+    codigo = [("CALL", "SCAN", "int", "a"), ("+", "__temp0", "a", 1), ("+", "__temp1", "a", 2),
+              ("*", "__temp2", "__temp0", "__temp1"), ("+", "__temp3", "__temp2", "__temp2"),
+              ("=", "b", "__temp3", None), ("CALL", "PRINT", "b", None)]
+    otimizado, estatisticas = otimizador.reutilizar_temporarios(codigo)
+    # __temp0 e __temp1 estão vivos ao mesmo tempo; os outros reaproveitam __temp0
+    assert otimizado == [("CALL", "SCAN", "int", "a"), ("+", "__temp0", "a", 1), ("+", "__temp1", "a", 2),
+                         ("*", "__temp0", "__temp0", "__temp1"), ("+", "__temp0", "__temp0", "__temp0"),
+                         ("=", "b", "__temp0", None), ("CALL", "PRINT", "b", None)]
+    assert estatisticas == {"temporarios": 4, "nomes": 2}
+
+@pytest.mark.parametrize("programa", PROGRAMAS)
+def test_temporarios_limitados_aos_vivos(programa):
+    codigo = compilador.compile(PROGRAMAS[programa], levantar=True).codigo
+    otimizado, estatisticas = otimizador.reutilizar_temporarios(codigo)
+    nomes = {nome for instrucao in otimizado for nome in instrucao[1:] if otimizador._temporario(nome)}
+    assert len(nomes) == estatisticas["nomes"] < estatisticas["temporarios"]
+
+def test_codigo_morto_remove_atribuicoes_inalcancaveis_e_labels_orfaos():
+    codigo = [("=", "a", "0", None), ("CALL", "SCAN", "int", "a"), ("+", "__temp0", "a", 1),
+              ("JUMP", "__label0", None, None), ("CALL", "PRINT", "a", None), ("LABEL", "__label0", None, None),
+              ("LABEL", "__label7", None, None), ("CALL", "PRINT", "a", None)]
+    otimizado, estatisticas = otimizador.eliminar_codigo_morto(codigo)
+    # A operação fica mesmo sem leitura: ela pode exibir um erro na execução
+    assert otimizado == [("CALL", "SCAN", "int", "a"), ("+", "__temp0", "a", 1), ("JUMP", "__label0", None, None),
+                         ("LABEL", "__label0", None, None), ("CALL", "PRINT", "a", None)]
+    assert estatisticas == {"removidas": 3, "mortas": 1, "inalcancaveis": 1, "labels": 1}
+
+def test_codigo_morto_mantem_uma_atribuicao_da_lida_antes():
+    codigo = [("CALL", "PRINT", "x", None), ("=", "x", "1", None), ("=", "x", "2", None),
+              ("CALL", "PRINT", "x", None)]
+    otimizado, _ = otimizador.eliminar_codigo_morto(codigo)
+    assert otimizado == [("CALL", "PRINT", "x", None), ("=", "x", "2", None), ("CALL", "PRINT", "x", None)]
+
+def test_saltos_encadeados_e_labels_unidos():
+    codigo = [("CALL", "SCAN", "int", "a"), ("IF", "a", "__label0", "__label1"), ("LABEL", "__label1", None, None),
+              ("CALL", "PRINT", "a", None), ("JUMP", "__label9", None, None), ("LABEL", "__label0", None, None),
+              ("JUMP", "__label5", None, None), ("CALL", "PRINT", "a", None), ("LABEL", "__label5", None, None),
+              ("LABEL", "__label9", None, None), ("CALL", "PRINT", "a", None)]
+    otimizado, estatisticas = otimizador.encadear_saltos(codigo)
+    # __label9 vira __label5 e o IF vai direto para onde o JUMP de __label0 levaria
+    assert otimizado == [("CALL", "SCAN", "int", "a"), ("IF", "a", "__label5", "__label1"),
+                         ("LABEL", "__label1", None, None), ("CALL", "PRINT", "a", None),
+                         ("JUMP", "__label5", None, None), ("JUMP", "__label5", None, None),
+                         ("CALL", "PRINT", "a", None), ("LABEL", "__label5", None, None), ("CALL", "PRINT", "a", None)]
+    assert estatisticas == {"labels_unidos": 1, "redirecionados": 2, "saltos_removidos": 0, "labels_removidos": 1}
+
+def test_salto_para_a_instrucao_seguinte_e_removido():
+    codigo = [("=", "a", "0", None), ("JUMP", "__label0", None, None), ("LABEL", "__label0", None, None),
+              ("LABEL", "__label1", None, None), ("JUMP", "__label2", None, None), ("LABEL", "__label2", None, None),
+              ("CALL", "PRINT", "a", None), ("IF", "a", "__label1", "__label2")]
+    otimizado, estatisticas = otimizador.encadear_saltos(codigo)
+    assert otimizado == [("=", "a", "0", None), ("LABEL", "__label2", None, None), ("CALL", "PRINT", "a", None),
+                         ("IF", "a", "__label2", "__label2")]
+    assert estatisticas["saltos_removidos"] == 2
+
+def test_subexpressao_repetida_vira_copia():
+    codigo = [("CALL", "SCAN", "float", "a"), ("=", "b", "a", None), ("+", "__temp0", "a", 1),
+              ("+", "__temp1", "b", 1), ("CALL", "PRINT", "__temp1", None)]
+    otimizado, estatisticas = otimizador.numerar_valores(codigo)
+    # b é cópia de a, então b + 1 tem o mesmo número de valor que a + 1
+    assert otimizado[3] == ("=", "__temp1", "__temp0", None)
+    assert estatisticas == {"reaproveitadas": 1}
+
+@pytest.mark.parametrize("codigo", [
+    # O SCAN dá um número novo a a
+    [("CALL", "SCAN", "int", "a"), ("+", "__temp0", "a", 1), ("=", "b", "__temp0", None),
+     ("CALL", "SCAN", "int", "a"), ("+", "__temp1", "a", 1), ("CALL", "PRINT", "__temp1", None)],
+    # Um texto somado a um número encerra a execução com erro: a operação fica
+    [("CALL", "SCAN", "string", "s"), ("+", "__temp0", "s", 1), ("+", "__temp1", "s", 1),
+     ("CALL", "PRINT", "__temp1", None)],
+], ids=["scan", "pode_falhar"])
+def test_subexpressao_nao_reaproveitada(codigo):
+    otimizado, estatisticas = otimizador.numerar_valores(codigo)
+    assert otimizado == codigo
+    assert estatisticas == {"reaproveitadas": 0}
+
+def _corpo_do_laco(codigo, label):
+    """Instruções entre o LABEL do laço e o JUMP que volta a ele."""
+    inicio = codigo.index(("LABEL", label, None, None))
+    fim = codigo.index(("JUMP", label, None, None))
+    return codigo[inicio:fim + 1]
+
+def test_invariantes_saem_do_laco():
+    codigo = compilador.compile(PROGRAMAS["invariante"], levantar=True).codigo
+    movidas = [("*", "__temp6", "k", 4), ("+", "__temp7", "__temp6", 1), ("=", "__temp8", "__temp7", None),
+               ("=", "t", "__temp8", None)]
+    assert all(i in _corpo_do_laco(codigo, "__label3") for i in movidas)
+    otimizado, estatisticas = otimizador.mover_invariantes(codigo)
+    assert estatisticas == {"lacos": 1, "movidas": 4}
+    corpo = _corpo_do_laco(otimizado, "__label3")
+    assert not any(i in corpo for i in movidas)
+    assert all(otimizado.count(i) == 1 for i in movidas)
+    # s += i * t depende de i, que muda a cada volta
+    assert ("*", "__temp9", "i", "t") in corpo
+
+def test_invariante_lido_antes_de_atribuido_fica_no_laco():
+    fonte = ("int main() { int i, n, t; system.in.scan(int, n); t = 0;"
+             " for (i = 0; i < n; i += 1) { system.out.print(t); t = n * 2; } }")
+    codigo = compilador.compile(fonte, levantar=True).codigo
+    otimizado, estatisticas = otimizador.mover_invariantes(codigo)
+    # n * 2 sai do laço, mas a atribuição a t fica: o PRINT lê o valor da volta anterior
+    assert estatisticas == {"lacos": 1, "movidas": 2}
+    corpo = _corpo_do_laco(otimizado, "__label3")
+    assert ("*", "__temp5", "n", 2) not in corpo
+    assert corpo[-3:] == [("CALL", "PRINT", "t", None), ("=", "t", "__temp6", None), ("JUMP", "__label3", None, None)]
+
+def test_inducao_basica_atribui_direto_a_variavel():
+    codigo = compilador.compile(PROGRAMAS["invariante"], levantar=True).codigo
+    otimizado, estatisticas = otimizador.reduzir_inducao(codigo)
+    assert estatisticas == {"basicas": 1, "copias": 1, "reduzidas": 0, "eliminadas": 0}
+    corpo = _corpo_do_laco(otimizado, "__label3")
+    assert corpo[1] == ("+", "i", "i", 1)
+    assert ("=", "i", "__temp5", None) not in otimizado
+
+def test_inducao_derivada_vira_soma():
+    # Com t fora do laço, i * t é uma variável de indução derivada
+    codigo, _ = otimizador.mover_invariantes(compilador.compile(PROGRAMAS["invariante"], levantar=True).codigo)
+    otimizado, estatisticas = otimizador.reduzir_inducao(codigo)
+    assert estatisticas == {"basicas": 1, "copias": 1, "reduzidas": 1, "eliminadas": 1}
+    corpo = _corpo_do_laco(otimizado, "__label3")
+    assert not any(i[0] == "*" for i in corpo)
+    # O incremento de i, que só ele lia, sai; o produto é somado do passo t * 1
+    assert not any(i[1] == "i" for i in corpo)
+    assert corpo[1] == ("+", "__temp11", "__temp11", "__temp12")
+    assert ("=", "__temp9", "__temp11", None) in corpo
+    assert ("*", "__temp11", "i", "t") in otimizado and ("*", "__temp12", "t", 1) in otimizado
+
+SCAN_A = ("CALL", "SCAN", "int", "a")
+PRINT_A = ("CALL", "PRINT", "a", None)
+
+@pytest.mark.parametrize("regra, codigo, esperado", [
+    ("operacao_copia",
+     [("=", "b", "0", None), SCAN_A, ("+", "__temp0", "a", 1), ("=", "b", "__temp0", None), ("CALL", "PRINT", "b", None)],
+     [("=", "b", "0", None), SCAN_A, ("+", "b", "a", 1), ("CALL", "PRINT", "b", None)]),
+    ("copia_copia",
+     [("=", "b", "0", None), SCAN_A, ("=", "__temp0", "a", None), ("=", "b", "__temp0", None), ("CALL", "PRINT", "b", None)],
+     [("=", "b", "0", None), SCAN_A, ("=", "b", "a", None), ("CALL", "PRINT", "b", None)]),
+    ("copia_condicao",
+     [SCAN_A, ("=", "__temp0", 1, None), ("IF", "__temp0", "__label0", "__label1"), ("LABEL", "__label1", None, None),
+      PRINT_A, ("LABEL", "__label0", None, None)],
+     [SCAN_A, ("IF", 1, "__label0", "__label1"), ("LABEL", "__label1", None, None), PRINT_A,
+      ("LABEL", "__label0", None, None)]),
+    ("copia_propria",
+     [SCAN_A, ("+", "__temp0", "a", 1), ("=", "__temp0", "__temp0", None), ("CALL", "PRINT", "__temp0", None)],
+     [SCAN_A, ("+", "__temp0", "a", 1), ("CALL", "PRINT", "__temp0", None)]),
+    ("salto_seguinte",
+     [SCAN_A, ("JUMP", "__label0", None, None), ("LABEL", "__label0", None, None), PRINT_A],
+     [SCAN_A, ("LABEL", "__label0", None, None), PRINT_A]),
+    ("depois_do_salto",
+     [SCAN_A, ("JUMP", "__label0", None, None), PRINT_A, ("LABEL", "__label0", None, None)],
+     [SCAN_A, ("LABEL", "__label0", None, None)]),
+])
+def test_regras_da_janela(regra, codigo, esperado):
+    otimizado, estatisticas = otimizador.otimizar_janela(codigo)
+    assert otimizado == esperado
+    assert estatisticas[regra] == 1
+
+def test_janela_mantem_a_unica_atribuicao_da_variavel():
+    # Sem outro '=', a cópia é o que faz o interpretador criar b
+    codigo = [SCAN_A, ("+", "__temp0", "a", 1), ("=", "b", "__temp0", None), ("CALL", "PRINT", "b", None)]
+    otimizado, estatisticas = otimizador.otimizar_janela(codigo)
+    assert otimizado == codigo
+    assert not any(estatisticas.values())
+
+def test_copias_propagadas_so_onde_valem_em_todos_os_caminhos():
+    codigo = [SCAN_A, ("=", "b", "0", None), ("IF", "a", "__label0", "__label1"), ("LABEL", "__label1", None, None),
+              ("=", "b", "a", None), ("+", "__temp1", "b", 2), ("CALL", "PRINT", "__temp1", None),
+              ("JUMP", "__label2", None, None), ("LABEL", "__label0", None, None), ("=", "b", 2, None),
+              ("LABEL", "__label2", None, None), ("+", "__temp0", "b", 1), ("CALL", "PRINT", "__temp0", None)]
+    otimizado, estatisticas = otimizador.propagar_copias(codigo)
+    # Depois da junção b pode ser a ou 2: a leitura de b fica
+    esperado = list(codigo)
+    esperado[5] = ("+", "__temp1", "a", 2)
+    assert otimizado == esperado
+    assert estatisticas == {"copias": 3, "substituicoes": 1}
+
+def test_copias_entre_blocos_e_do_temporario_da_instrucao_anterior():
+    codigo = compilador.compile(PROGRAMAS["invariante"], levantar=True).codigo
+    otimizado, _ = otimizador.propagar_copias(codigo)
+    # k = 3 chega ao corpo do laço, e t passa a ser lido do temporário que o calculou
+    assert ("*", "__temp6", 3, 4) in otimizado
+    assert ("*", "__temp9", "i", "__temp8") in otimizado and ("CALL", "PRINT", "__temp8", None) in otimizado
+    # A cópia do temporário calculado logo antes e lido só por ela fica para a janela
+    assert ("=", "__temp8", "__temp7", None) in otimizado
@@ -0,0 +1,59 @@
+import io
+import json
+
+import pytest
+
+import lexico
+import otimizador
+import rastreio
+import sintatico
+
+FONTE = "int main(){ int a; a = 2; a *= 3; system.out.print(a); }"
+
+@pytest.fixture(autouse=True)
+def desligar_depois():
+    yield
+    rastreio.desligar()
+
+def _registros(saida):
+    return [json.loads(linha) for linha in saida.getvalue().splitlines()]
+
+def _tokens():
+    return lexico.lexer(FONTE, *lexico.carregar_tabelas())
+
+def test_desligado_por_padrao():
+    assert all(rastreio.rastreador(categoria) is None for categoria in rastreio.CATEGORIAS)
+    parser = sintatico.Parser(_tokens())
+    assert parser.rastro is None and parser.rastro_codigo is None
+
+def test_nivel_minimo_por_categoria():
+    saida = io.StringIO()
+    rastreio.configurar("info", ["codegen"], saida)
+    assert rastreio.rastreador("codegen") is None  # debug < info
+    assert rastreio.rastreador("parse", "erro") is None  # Categoria desligada
+    rastreio.rastreador("codegen", "aviso")("mensagem", instrucao=("=", "a", 1, None))
+    assert _registros(saida) == [{"categoria": "codegen", "nivel": "aviso", "mensagem": "mensagem",
+                                  "instrucao": ["=", "a", 1, None]}]
+
+def test_configuracao_invalida():
+    with pytest.raises(ValueError):
+        rastreio.configurar("tudo")
+    with pytest.raises(ValueError):
+        rastreio.configurar("info", ["lexer"])
+
+def test_configurar_de_argumentos():
+    restantes = rastreio.configurar_de_argumentos(["a.java", "--rastreio=parse,otim", "--nivel=aviso", "--ll1"])
+    assert restantes == ["a.java", "--ll1"]
+    assert rastreio.ativo("otim", "aviso") and not rastreio.ativo("otim", "info")
+    assert not rastreio.ativo("lex", "erro")
+
+def test_registros_das_fases():
+    saida = io.StringIO()
+    rastreio.configurar("debug", ["parse", "codegen", "otim"], saida)
+    codigo = sintatico.main(_tokens())
+    otimizador.otimizar(codigo)
+    registros = _registros(saida)
+    assert {r["categoria"] for r in registros} == {"parse", "codegen", "otim"}
+    # Uma linha por instrução gerada, na categoria codegen
+    gerados = [r["instrucao"] for r in registros if r["categoria"] == "codegen"]
+    assert gerados == [list(instrucao) for instrucao in codigo]
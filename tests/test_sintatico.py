@@ -0,0 +1,168 @@
+import io
+import os
+import random
+
+import pytest
+
+import lexico
+import sintatico
+from arvore import Node
+
+FONTE = ("int main(){ int i, n; float f; system.in.scan(int, n); f = 0.5;"
+         " for (i = 0; i < n; i += 1) { f = f * 2.0 + i; if (f > 10.0) { system.out.print(f); } else { i -= 1; } }"
+         " while (n > 0) { n = n - 1; } system.out.print(\"fim\", n); }")
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _tokens(fonte):
+    return lexico.lexer(fonte, *lexico.carregar_tabelas())
+
+def test_parser_em_fluxo_emite_antes_de_ler_todos_os_tokens():
+    tokens = _tokens(FONTE)
+    consumidos = []
+
+    def fonte():
+        for token in tokens:
+            consumidos.append(token)
+            yield token
+
+    emitidas = []
+    assert sintatico.main_em_fluxo(fonte(), lambda instrucao: emitidas.append((instrucao, len(consumidos))))
+    assert [instrucao for instrucao, _ in emitidas] == sintatico.main(tokens)
+    assert emitidas[0][1] < len(tokens)  # A primeira instrução sai com parte dos tokens lida
+
+@pytest.mark.parametrize("analisador", ["descendente", "ll1"])
+def test_pipeline_em_fluxo_igual_ao_pipeline_inteiro(analisador):
+    tokens = lexico.lexer_em_fluxo(io.StringIO(FONTE), *lexico.carregar_tabelas(), tamanho_bloco=8)
+    emitidas = []
+    assert sintatico.main_em_fluxo(tokens, emitidas.append, analisador)
+    assert emitidas == sintatico.main(_tokens(FONTE))
+
+NOMES = ["a", "b", "i", "x1"]
+ATOMOS = NOMES + ["0", "7", "2.5", "1.", "017", "0x1F", "\"s\""]
+SAIDAS = ["a", "\"t\"", "3", "1.5", "017", "0x2"]
+ARITMETICOS = ["+", "-", "*", "%", "&&", "||"]
+RELACIONAIS = ["<", "<=", ">", ">=", "==", "!="]
+
+def _expressao(aleatorio, profundidade):
+    escolha = aleatorio.random()
+    if profundidade == 0 or escolha < 0.3:
+        return aleatorio.choice(ATOMOS)
+    a, b = _expressao(aleatorio, profundidade - 1), _expressao(aleatorio, profundidade - 1)
+    if escolha < 0.45:
+        return f"{a} {aleatorio.choice(ARITMETICOS)} {b}"
+    if escolha < 0.6:
+        # '!' só aparece nos operandos de && e || (<not> na gramática)
+        return f"{a} {aleatorio.choice(['&&', '||'])} !({b})"
+    if escolha < 0.75:
+        # A gramática não encadeia comparações: a comparação fica entre parênteses
+        return f"({a} {aleatorio.choice(RELACIONAIS)} {b})"
+    if escolha < 0.9:
+        return f"{aleatorio.choice(['-', '+'])}{a}"
+    return f"({a})"
+
+def _comando(aleatorio, profundidade):
+    escolha = aleatorio.randrange(10 if profundidade else 6)
+    nome = aleatorio.choice(NOMES)
+    expressao = _expressao(aleatorio, 3)
+    if escolha == 0:
+        return f"{aleatorio.choice(['int', 'float', 'string'])} {', '.join(aleatorio.sample(NOMES, 2))};"
+    if escolha == 1:
+        return f"system.out.print({', '.join(aleatorio.sample(SAIDAS, 3))});"
+    if escolha == 2:
+        return f"system.in.scan(int, {nome});"
+    if escolha == 3:
+        return ";"
+    if escolha in (4, 5):
+        return f"{nome} {aleatorio.choice(['=', '+=', '-=', '*=', '%='])} {expressao};"
+    corpo = _comando(aleatorio, profundidade - 1)
+    if escolha == 6:
+        if aleatorio.random() < 0.5:
+            return f"if ({expressao}) {corpo}"
+        # O Parser só aceita o else depois de um bloco
+        return f"if ({expressao}) {{ {corpo} }} else {_comando(aleatorio, profundidade - 1)}"
+    if escolha == 7:
+        return f"while ({expressao}) {corpo}"
+    if escolha == 8:
+        return f"for ({nome} = 0; {expressao}; {nome} += 1) {corpo}"
+    return "{ " + " ".join(_comando(aleatorio, profundidade - 1) for _ in range(aleatorio.randint(0, 3))) + " }"
+
+def _programas(quantidade, semente):
+    aleatorio = random.Random(semente)
+    for _ in range(quantidade):
+        yield "int main() { " + " ".join(_comando(aleatorio, 3) for _ in range(aleatorio.randint(1, 6))) + " }"
+
+def _valor(valor):
+    # Os operadores unários viram Node nas instruções: compara pela estrutura
+    if isinstance(valor, Node):
+        return (valor.node_type, valor.value, tuple(_valor(filho) for filho in valor.children))
+    return valor
+
+def _codigo(fonte, analisador="descendente"):
+    return [tuple(_valor(v) for v in instrucao) for instrucao in sintatico.main(_tokens(fonte), analisador)]
+
+@pytest.mark.parametrize("nome", ["exemplo1.java", "teste1.java"])
+def test_ll1_igual_ao_descendente_nos_exemplos(nome):
+    with open(os.path.join(RAIZ, nome)) as arquivo:
+        fonte = arquivo.read()
+    assert _codigo(fonte, "ll1") == _codigo(fonte)
+
+def test_ll1_igual_ao_descendente_em_programas_aleatorios():
+    for fonte in _programas(300, 1):
+        assert _codigo(fonte, "ll1") == _codigo(fonte), fonte
+
+def test_ll1_aninhamento_profundo():
+    profundidade = 5000  # Muito além do limite de recursão do Python
+    blocos = "int main() { int a; " + "{ " * profundidade + "a = 1;" + " }" * profundidade + " }"
+    assert _codigo(blocos, "ll1") == _codigo("int main() { int a; a = 1; }")
+    parenteses = "int main() { int a; a = " + "(" * profundidade + "a + 1" + ")" * profundidade + "; }"
+    assert _codigo(parenteses, "ll1") == _codigo("int main() { int a; a = a + 1; }")
+
+@pytest.mark.parametrize("fonte", [
+    "int main() { a = ; }",
+    "int main() { if (a) { } else }",
+    "int main() { for (i = 0; ; i += 1) { } }",
+    "int main() { system.out.print(); }",
+    "int main() { a = (1 + 2; }",
+    "int main() { int a }",
+    "int main() { a = 1;",
+])
+def test_ll1_rejeita_os_mesmos_erros(capsys, fonte):
+    assert _codigo(fonte) == [] and _codigo(fonte, "ll1") == []
+    saida = capsys.readouterr().out.splitlines()
+    assert len(saida) == 2 and all(linha.startswith("Erro de sintaxe") for linha in saida)
+
+def test_geracao_de_expressao_longa_sem_recursao():
+    # A soma é uma cadeia de nós tão funda quanto o número de termos
+    termos = 5000
+    codigo = _codigo("int main() { a = " + " + ".join(["b"] * termos) + "; }")
+    assert len(codigo) == termos + 1  # Um temporário por soma, mais a atribuição
+
+def _atribuicao(expressao, analisador="descendente"):
+    return _codigo(f"int main() {{ a = {expressao}; }}", analisador)
+
+@pytest.mark.parametrize("expressao, agrupada", [
+    ("b - c - d", "(b - c) - d"),
+    ("b + c * d", "b + (c * d)"),
+    ("b * c % d - e", "((b * c) % d) - e"),
+    ("-b * c", "(-b) * c"),
+    ("- -b + c", "(-(-b)) + c"),
+    ("b || c && d", "b || (c && d)"),
+    ("b && c || d && e", "(b && c) || (d && e)"),
+    ("b + c < d && e", "((b + c) < d) && e"),
+    ("!b < c", "!(b < c)"),  # <not> -> '!' <not> | <rel>
+    ("!b && !c", "(!b) && (!c)"),
+])
+def test_precedencia_e_associatividade(expressao, agrupada):
+    assert _atribuicao(expressao) == _atribuicao(agrupada)
+    assert _atribuicao(expressao, "ll1") == _atribuicao(expressao)
+
+def test_comparacoes_nao_se_encadeiam(capsys):
+    assert _atribuicao("b < c < d") == [] and _atribuicao("b == c != d") == []
+    assert len(capsys.readouterr().out.splitlines()) == 2
+
+def test_tabela_de_operadores_vem_de_tokens_txt():
+    binarios, prefixos = sintatico.tabela_operadores()
+    operadores = set(lexico.carregar_tabelas()[0].values())
+    assert set(binarios) <= operadores and set(prefixos) <= operadores
+    assert binarios["MUL"][0] > binarios["ADD"][0] > binarios["LESS"][0] > binarios["LOGICAL_AND"][0]
@@ -0,0 +1,295 @@
+import sys
+from grafo import ARITMETICOS, LOGICOS, TIPADOS, Grafo, bem_formada, definicao
+
+# Tipos dos valores do código intermediário, como o interpretador os lê: o tipo de uma
+# variável é o tipo do valor que obt_valor retorna para ela. None no lugar de um tipo
+# quer dizer "desconhecido" (variável talvez não atribuída, leitura de string digitada
+# pelo usuário, nó do operador unário...).
+#
+# STRING só é usado para textos que continuam texto ao serem guardados e lidos de novo:
+# o interpretador converte para número um texto numérico guardado em variável (ex:
+# a = "12" faz a valer 12).
+#
+# Operações entre inteiros são consideradas sem erro. A exceção seria um inteiro acima
+# de ~1e308, para o qual o interpretador falha ao calcular a divisão (calcular_aritmetica
+# calcula todas as operações de uma vez), e esse caso não é considerado.
+
+INT = "int"
+FLOAT = "float"
+BOOL = "bool"
+STRING = "string"
+
+# Comparações que o interpretador sabe calcular ('||', '&&', '!' e '<>' dão erro)
+COMPARACOES = ("==", "!=", ">", ">=", "<", "<=")
+
+# Nome da operação tipada (interpretador.OPERACOES_TIPADAS) sem o prefixo do tipo
+_TIPADAS = {"+": "ADD", "-": "SUB", "*": "MUL", "/": "DIV", "%": "MOD", "//": "DIVINT",
+            "==": "CMP_EQ", "!=": "CMP_NE", "<": "CMP_LT", "<=": "CMP_LE", ">": "CMP_GT", ">=": "CMP_GE"}
+
+def tipo_do_valor(valor):
+    if isinstance(valor, bool):
+        return BOOL
+    if isinstance(valor, int):
+        return INT
+    if isinstance(valor, float):
+        return FLOAT
+    if isinstance(valor, str):
+        return STRING
+    return None
+
+def _tipo_do_texto(texto):
+    """Tipo de um texto guardado em variável ao ser lido de volta (sem aspas)."""
+    try:
+        return tipo_do_valor(float(texto) if '.' in texto else int(texto))
+    except ValueError:
+        return STRING
+
+def tipo_lido(operando, tipos, variaveis):
+    """Tipo do valor que obt_valor retorna para o operando."""
+    if operando is None:
+        return INT  # Lido como 0
+    if not isinstance(operando, str):
+        return tipo_do_valor(operando)
+    if operando in variaveis:
+        return tipos.get(operando)
+    if operando.startswith('"') and operando.endswith('"'):
+        return STRING
+    try:
+        int(operando)
+        return INT
+    except ValueError:
+        try:
+            float(operando)
+            return FLOAT
+        except ValueError:
+            return STRING  # Nome nunca atribuído: lido como o próprio texto
+
+def tipo_convertido(operando, tipos, variaveis):
+    """Tipo de um operando aritmético (converter do interpretador)."""
+    if isinstance(operando, str):
+        try:
+            return tipo_do_valor(float(operando) if '.' in operando else int(operando))
+        except ValueError:
+            pass
+    return tipo_lido(operando, tipos, variaveis)
+
+def tipo_guardado(operando, tipos, variaveis):
+    """Tipo da variável depois de ('=', variável, operando, None)."""
+    tipo = tipo_lido(operando, tipos, variaveis)
+    if tipo == STRING and isinstance(operando, str) and operando not in variaveis:
+        return _tipo_do_texto(operando.strip('"'))
+    return tipo
+
+def resultado(instrucao, tipos, variaveis):
+    """(tipo do resultado, pode falhar) de uma operação aritmética ou lógica.
+
+    Uma operação que falha exibe o erro e guarda 0 (aritmética) ou False (lógica)."""
+    operador, destino, op1, op2 = instrucao[:4]
+    if operador in TIPADOS:
+        if "CMP" in operador:
+            return BOOL, False
+        return (FLOAT if operador[0] == "F" or operador == "IDIV" else INT), False
+    valida = len(instrucao) == 4 and isinstance(destino, str) and op2 is not None
+    if operador in ARITMETICOS:
+        tipo1 = tipo_convertido(op1, tipos, variaveis)
+        tipo2 = tipo_convertido(op2, tipos, variaveis)
+        numeros = (INT, FLOAT, BOOL)
+        if not valida or tipo1 not in numeros or tipo2 not in numeros:
+            return (INT if tipo1 is not None and tipo2 is not None else None), True
+        if FLOAT in (tipo1, tipo2):
+            # % e // por zero dão o inteiro 0
+            return (FLOAT if operador in ("+", "-", "*", "/") else None), False
+        return (FLOAT if operador == "/" else INT), False
+    tipo1 = tipo_lido(op1, tipos, variaveis)
+    tipo2 = tipo_lido(op2, tipos, variaveis)
+    comparaveis = (tipo1 == tipo2 and tipo1 in (INT, FLOAT, STRING)) or {tipo1, tipo2} == {INT, BOOL}
+    return BOOL, not (valida and operador in COMPARACOES and comparaveis)
+
+def transferir(instrucao, tipos, variaveis):
+    """Atualiza `tipos` (variável -> tipo) com o efeito da instrução."""
+    operador = instrucao[0]
+    if operador == "=":
+        tipo = tipo_guardado(instrucao[2], tipos, variaveis)
+    elif operador == "CALL":
+        if instrucao[1] != "SCAN":
+            return
+        # O texto digitado para uma leitura de string pode ser numérico
+        tipo = {"int": INT, None: INT, "float": FLOAT}.get(instrucao[2])
+        destino = instrucao[3]
+        if tipo is None:
+            tipos.pop(destino, None)
+        else:
+            tipos[destino] = tipo
+        return
+    elif operador in ("IF", "JUMP", "LABEL"):
+        return
+    else:
+        tipo, _ = resultado(instrucao, tipos, variaveis)
+    if tipo is None:
+        tipos.pop(instrucao[1], None)
+    else:
+        tipos[instrucao[1]] = tipo
+
+def inferir(grafo, variaveis, vivas=None):
+    """Tipos conhecidos na entrada de cada bloco (dict), ou None para os blocos inalcançáveis.
+
+    Análise para a frente sobre o grafo: o tipo de uma variável vale na entrada de um bloco
+    quando é o mesmo em todos os predecessores alcançáveis. Só são guardadas as variáveis
+    vivas na entrada de cada bloco (vivas: primeiro resultado de Grafo.vivas(), calculado
+    aqui se omitido); as demais não são lidas antes de receber outro valor."""
+    entradas = [None] * len(grafo.blocos)
+    if not grafo.blocos:
+        return entradas
+    if vivas is None:
+        vivas, _ = grafo.vivas()
+    entradas[0] = {}  # Na entrada nenhuma variável foi atribuída
+    pendentes = [0]
+    while pendentes:
+        bloco = grafo.blocos[pendentes.pop()]
+        tipos = dict(entradas[bloco.indice])
+        for instrucao in grafo.instrucoes(bloco):
+            if bem_formada(instrucao):
+                transferir(instrucao, tipos, variaveis)
+        for sucessor in bloco.sucessores:
+            entrada = entradas[sucessor]
+            if entrada is None:
+                entradas[sucessor] = {nome: tipo for nome, tipo in tipos.items() if nome in vivas[sucessor]}
+            else:
+                diferentes = [nome for nome, tipo in entrada.items() if tipos.get(nome) != tipo]
+                if not diferentes:
+                    continue
+                for nome in diferentes:
+                    del entrada[nome]
+            if sucessor not in pendentes:
+                pendentes.append(sucessor)
+    return entradas
+
+def _numero_no_texto(operando):
+    """Número escrito no operando aritmético (o converter do interpretador o lê antes de
+    procurar uma variável), ou None."""
+    if isinstance(operando, str):
+        try:
+            return float(operando) if '.' in operando else int(operando)
+        except ValueError:
+            pass
+    return None
+
+def _constante(operando, aritmetica):
+    """Valor com que o interpretador lê um operando que não é variável."""
+    if operando is None:
+        return 0
+    if not isinstance(operando, str):
+        return operando
+    if aritmetica and _numero_no_texto(operando) is not None:
+        return _numero_no_texto(operando)
+    if operando.startswith('"') and operando.endswith('"'):
+        return operando.strip('"')
+    try:
+        return int(operando)
+    except ValueError:
+        try:
+            return float(operando)
+        except ValueError:
+            return operando
+
+def _tipada(instrucao, tipos, variaveis):
+    """Operação tipada equivalente a uma operação que não falha, ou None."""
+    operador, destino, op1, op2 = instrucao
+    aritmetica = operador in ARITMETICOS
+    ler = tipo_convertido if aritmetica else tipo_lido
+    tipo1, tipo2 = ler(op1, tipos, variaveis), ler(op2, tipos, variaveis)
+    operandos = []
+    for operando in (op1, op2):
+        if isinstance(operando, str) and operando in variaveis \
+                and not (aritmetica and _numero_no_texto(operando) is not None):
+            operandos.append(operando)
+            continue
+        valor = _constante(operando, aritmetica)
+        if isinstance(valor, str) and valor in variaveis:
+            return None  # A operação tipada leria a variável com esse nome
+        operandos.append(valor)
+    if aritmetica:
+        prefixo = "F" if FLOAT in (tipo1, tipo2) else "I"
+    else:
+        prefixo = {INT: "I", BOOL: "I", FLOAT: "F", STRING: "S"}[tipo1]
+    return (prefixo + _TIPADAS[operador], destino) + tuple(operandos)
+
+def _erro_de_tipo(instrucao, tipos, variaveis):
+    """Mensagem de erro de uma operação que sempre falha, ou None."""
+    operador, destino, op1, op2 = instrucao[:4]
+    if operador in LOGICOS and operador not in COMPARACOES:
+        return f"operador '{operador}' não é suportado pelo interpretador"
+    if len(instrucao) != 4 or not isinstance(destino, str) or op2 is None:
+        return None
+    if operador in ARITMETICOS:
+        tipo1, tipo2 = tipo_convertido(op1, tipos, variaveis), tipo_convertido(op2, tipos, variaveis)
+        descricao = "operação"
+    else:
+        tipo1, tipo2 = tipo_lido(op1, tipos, variaveis), tipo_lido(op2, tipos, variaveis)
+        descricao = "comparação"
+    if tipo1 is None or tipo2 is None:
+        return None
+    return f"{descricao} '{operador}' entre {tipo1} e {tipo2}"
+
+def tipar(codigo):
+    """Troca as operações de tipos conhecidos pelas operações tipadas e procura erros de tipo.
+
+    Retorna (código, anotações, erros). Uma operação aritmética ou comparação que não pode
+    falhar pelos tipos inferidos vira a operação tipada (ex: ('<', t, 'i', '10') vira
+    ('ICMP_LT', t, 'i', 10)), com as constantes já convertidas; o interpretador a executa
+    sem conferir os tipos. As anotações dão o tipo de cada variável e temporário (None se
+    muda ao longo do programa ou não é conhecido), e os erros são (posição, mensagem) das
+    operações alcançáveis que sempre falham (ex: comparar int com float, '&&').
+
+    A operação tipada lê o valor guardado sem convertê-lo, então toda variável de tipo
+    conhecido precisa guardar um valor desse tipo. A única atribuição que guardaria um
+    texto numérico é a de uma string literal (ex: ('=', a, '"12"')), que passa a atribuir
+    o número, como o interpretador o leria de volta."""
+    grafo = Grafo(codigo)
+    variaveis = {definicao(instrucao) for instrucao in codigo} - {None}
+    entradas = inferir(grafo, variaveis)
+    novo = list(codigo)
+    anotacoes = {}
+    erros = []
+    for bloco in grafo.blocos:
+        if entradas[bloco.indice] is None:
+            continue
+        tipos = dict(entradas[bloco.indice])
+        for posicao in range(bloco.inicio, bloco.fim):
+            instrucao = codigo[posicao]
+            if not bem_formada(instrucao):
+                continue
+            operador, _, fonte = instrucao[:3]
+            if operador == "=":
+                if isinstance(fonte, str) and fonte not in variaveis and fonte.startswith('"') \
+                        and tipo_guardado(fonte, tipos, variaveis) in (INT, FLOAT):
+                    texto = fonte.strip('"')
+                    novo[posicao] = instrucao[:2] + (float(texto) if '.' in texto else int(texto),) \
+                        + tuple(instrucao[3:])
+            elif operador in ARITMETICOS + LOGICOS:
+                tipo, falha = resultado(instrucao, tipos, variaveis)
+                if falha:
+                    mensagem = _erro_de_tipo(instrucao, tipos, variaveis)
+                    if mensagem is not None:
+                        erros.append((posicao, mensagem))
+                elif tipo is not None:
+                    novo[posicao] = _tipada(instrucao, tipos, variaveis) or instrucao
+            transferir(instrucao, tipos, variaveis)
+            destino = definicao(instrucao)
+            if destino is not None:
+                tipo = tipos.get(destino)
+                anotacoes[destino] = tipo if anotacoes.get(destino, tipo) == tipo else None
+    return novo, anotacoes, erros
+
+if __name__ == "__main__":
+    import compilador
+    argumentos = sys.argv[1:]
+    if not argumentos:
+        print("Uso: python tipos.py <arquivo.java>")
+        sys.exit(1)
+    compilado = compilador.compilar_arquivo(argumentos[0])
+    if compilado.codigo_tipado is not None:
+        for nome, tipo in tipar(compilado.codigo)[1].items():
+            print(f"{nome}: {tipo if tipo is not None else '?'}")
+    for diagnostico in compilado.diagnosticos:
+        print(diagnostico)